@@ -0,0 +1,79 @@
+"""
+Benchmark: async save/load latency under many concurrent sessions
+
+Each simulated session loads its character, changes it, saves it, and
+repeats. Blocking calls straight from the event loop are shown for
+comparison, along with how late a 10 ms ticker task runs (event loop lag).
+Run with: python benchmarks/bench_async_saves.py [sessions] [rounds]
+"""
+
+import asyncio
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import character_manager
+
+
+def percentile(values, fraction):
+    values = sorted(values)
+    return values[min(len(values) - 1, int(len(values) * fraction))]
+
+
+async def ticker(lags, stop):
+    while not stop.is_set():
+        start = time.perf_counter()
+        await asyncio.sleep(0.01)
+        lags.append(time.perf_counter() - start - 0.01)
+
+
+async def session(name, directory, rounds, latencies, blocking):
+    for _ in range(rounds):
+        start = time.perf_counter()
+        if blocking:
+            char = character_manager.load_character(name, directory)
+        else:
+            char = await character_manager.async_load_character(name, directory)
+        character_manager.add_gold(char, 1)
+        if blocking:
+            character_manager.save_character(char, directory)
+        else:
+            await character_manager.async_save_character(char, directory)
+        latencies.append(time.perf_counter() - start)
+        await asyncio.sleep(0)
+
+
+async def drive(directory, sessions, rounds, blocking):
+    latencies = []
+    lags = []
+    stop = asyncio.Event()
+    tick = asyncio.ensure_future(ticker(lags, stop))
+    start = time.perf_counter()
+    await asyncio.gather(*(session(f"Hero{n}", directory, rounds, latencies, blocking)
+                           for n in range(sessions)))
+    total = time.perf_counter() - start
+    stop.set()
+    await tick
+    return latencies, lags, total
+
+
+def run(sessions, rounds):
+    print(f"{sessions} sessions x {rounds} load+save rounds, {character_manager.DEFAULT_IO_WORKERS} io threads")
+    for blocking in (True, False):
+        with tempfile.TemporaryDirectory() as tmp:
+            character_manager.save_characters(
+                [character_manager.create_character(f"Hero{n}", "Mage") for n in range(sessions)], tmp)
+            latencies, lags, total = asyncio.run(drive(tmp, sessions, rounds, blocking))
+        label = "blocking calls" if blocking else "async API"
+        print(f"  {label:15} p50 {percentile(latencies, 0.5) * 1000:8.1f} ms"
+              f"  p99 {percentile(latencies, 0.99) * 1000:8.1f} ms"
+              f"  loop lag p99 {percentile(lags or [0], 0.99) * 1000:7.1f} ms"
+              f"  {len(latencies) / total:7.0f} rounds/s")
+
+
+if __name__ == "__main__":
+    args = [int(arg) for arg in sys.argv[1:]]
+    run(*(args + [2000, 3][len(args):]))
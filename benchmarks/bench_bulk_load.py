@@ -0,0 +1,75 @@
+"""
+Benchmark: load_character/save_character loop vs load_characters/save_characters
+
+Files are usually in the page cache after the save pass, so this is the
+best case for the sequential loop; the thread pool gains more on cold or
+network disks where each open() actually waits.
+--latency-ms adds a sleep to every open() in character_manager to stand
+in for a slow disk.
+Run with: python benchmarks/bench_bulk_load.py [characters] [--latency-ms N]
+"""
+
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import character_manager
+
+
+def make_characters(count):
+    characters = []
+    for n in range(count):
+        char = character_manager.create_character(f"Hero{n}", "Rogue")
+        char["inventory"] = [f"item_{i}" for i in range(20)]
+        char["completed_quests"] = [f"quest_{i}" for i in range(200)]
+        characters.append(char)
+    return characters
+
+
+def add_latency(seconds):
+    def slow_open(*args, **kwargs):
+        time.sleep(seconds)
+        return open(*args, **kwargs)
+    # module global shadows the builtin for character_manager only
+    character_manager.open = slow_open
+
+
+def timed(func):
+    start = time.perf_counter()
+    func()
+    return time.perf_counter() - start
+
+
+def run(count):
+    characters = make_characters(count)
+    names = [char["name"] for char in characters]
+    print(f"{count} characters, {os.cpu_count()} cpu(s)")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        seconds = timed(lambda: [character_manager.save_character(char, tmp) for char in characters])
+        print(f"  save loop                {seconds:7.3f}s")
+        for workers in (2, 4, 8, 16):
+            seconds = timed(lambda: character_manager.save_characters(characters, tmp, workers=workers))
+            print(f"  save_characters x{workers:<2}      {seconds:7.3f}s")
+
+        seconds = timed(lambda: [character_manager.load_character(name, tmp) for name in names])
+        print(f"  load loop                {seconds:7.3f}s")
+        for workers in (2, 4, 8, 16):
+            seconds = timed(lambda: character_manager.load_characters(names, tmp, workers=workers))
+            print(f"  load_characters x{workers:<2}      {seconds:7.3f}s")
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser()
+    parser.add_argument("characters", type=int, nargs="?", default=2000)
+    parser.add_argument("--latency-ms", type=float, default=0.0)
+    args = parser.parse_args()
+    if args.latency_ms:
+        add_latency(args.latency_ms / 1000)
+        print(f"simulated open() latency {args.latency_ms} ms")
+    run(args.characters)
@@ -0,0 +1,68 @@
+"""
+Benchmark: load/save around every request vs CharacterCache
+
+Requests pick characters with an 80/20 skew (a few hot players); each
+request loads the character, changes its gold and saves it.
+Run with: python benchmarks/bench_character_cache.py [characters] [requests] [cache_size]
+"""
+
+import os
+import random
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import character_manager
+from character_cache import CharacterCache
+
+
+def make_saves(directory, count):
+    characters = []
+    for n in range(count):
+        char = character_manager.create_character(f"Hero{n}", "Warrior")
+        char["completed_quests"] = [f"quest_{i}" for i in range(100)]
+        characters.append(char)
+    character_manager.save_characters(characters, directory)
+
+
+def request_names(count, requests):
+    rng = random.Random(1)
+    hot = max(1, count // 5)
+    return [f"Hero{rng.randrange(hot)}" if rng.random() < 0.8 else f"Hero{rng.randrange(count)}"
+            for _ in range(requests)]
+
+
+def run(count, requests, cache_size):
+    names = request_names(count, requests)
+    print(f"{count} characters, {requests} requests, cache size {cache_size}")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        make_saves(tmp, count)
+        start = time.perf_counter()
+        for name in names:
+            char = character_manager.load_character(name, tmp)
+            character_manager.add_gold(char, 1)
+            character_manager.save_character(char, tmp)
+        seconds = time.perf_counter() - start
+        print(f"  load + save per request  {seconds / requests * 1e6:8.1f} us/request")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        make_saves(tmp, count)
+        cache = CharacterCache(tmp, max_size=cache_size)
+        start = time.perf_counter()
+        for name in names:
+            char = cache.load(name)
+            character_manager.add_gold(char, 1)
+            cache.save(char)
+        cache.flush()
+        seconds = time.perf_counter() - start
+        cache.close()
+        print(f"  CharacterCache           {seconds / requests * 1e6:8.1f} us/request (incl. final flush)")
+        print(f"  {cache.stats()}")
+
+
+if __name__ == "__main__":
+    args = [int(arg) for arg in sys.argv[1:]]
+    run(*(args + [1000, 20000, 250][len(args):]))
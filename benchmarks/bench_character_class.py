@@ -0,0 +1,77 @@
+"""
+Benchmark: plain character dicts vs the slotted Character
+
+Memory is measured with tracemalloc over a whole population and divided
+per character (the three empty id lists are included for both).
+Run with: python benchmarks/bench_character_class.py [characters]
+"""
+
+import os
+import sys
+import timeit
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import character_manager
+from character import Character
+
+
+def per_instance_bytes(make, count):
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    population = [make(n) for n in range(count)]
+    after = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    # the list holding them isn't part of a character
+    return (after - before - sys.getsizeof(population)) / count
+
+
+def run(count):
+    make_dict = lambda n: character_manager.create_character(f"Hero{n}", "Warrior")
+    make_slotted = lambda n: Character.from_dict(make_dict(n))
+
+    dict_bytes = per_instance_bytes(make_dict, count)
+    slotted_bytes = per_instance_bytes(make_slotted, count)
+    print(f"{count} characters")
+    print(f"  dict       {dict_bytes:7.0f} bytes each")
+    print(f"  Character  {slotted_bytes:7.0f} bytes each ({slotted_bytes / dict_bytes:.0%})")
+
+    as_dict = make_dict(0)
+    slotted = make_slotted(0)
+    number = 1_000_000
+    cases = [
+        ("dict char['health']", lambda: as_dict['health']),
+        ("Character char['health']", lambda: slotted['health']),
+        ("Character char.health", lambda: slotted.health),
+    ]
+    print(f"  reads, ns each")
+    for label, func in cases:
+        seconds = min(timeit.repeat(func, number=number, repeat=3))
+        print(f"    {label:28} {seconds / number * 1e9:6.1f}")
+
+    def dict_write():
+        as_dict['gold'] += 1
+
+    def slotted_write():
+        slotted['gold'] += 1
+
+    def attribute_write():
+        slotted.gold += 1
+
+    print(f"  += writes, ns each")
+    for label, func in [("dict", dict_write), ("Character []", slotted_write),
+                        ("Character attribute", attribute_write)]:
+        seconds = min(timeit.repeat(func, number=number, repeat=3))
+        print(f"    {label:28} {seconds / number * 1e9:6.1f}")
+
+    seconds = min(timeit.repeat(lambda: slotted.copy(), number=100_000, repeat=3))
+    dict_seconds = min(timeit.repeat(lambda: {**as_dict, 'inventory': list(as_dict['inventory']),
+                                              'active_quests': list(as_dict['active_quests']),
+                                              'completed_quests': list(as_dict['completed_quests'])},
+                                     number=100_000, repeat=3))
+    print(f"  copy with fresh id lists: dict {dict_seconds * 10:.2f} us, Character {seconds * 10:.2f} us")
+
+
+if __name__ == "__main__":
+    run(int(sys.argv[1]) if len(sys.argv) > 1 else 100000)
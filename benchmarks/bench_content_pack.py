@@ -0,0 +1,64 @@
+"""
+Benchmark: load_content_pack cold start vs worker count
+
+Run with: python benchmarks/bench_content_pack.py [shards] [records_per_shard]
+"""
+
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import game_data
+from bench_data_cache import write_items
+
+
+def write_quest_shard(path, shard, count):
+    with open(path, "w") as f:
+        for i in range(count):
+            f.write(
+                f"QUEST_ID: quest_{shard}_{i}\n"
+                f"TITLE: Quest {shard}/{i}\n"
+                f"DESCRIPTION: Generated quest {i} of shard {shard}\n"
+                f"REWARD_XP: {50 + i % 500}\n"
+                f"REWARD_GOLD: {25 + i % 300}\n"
+                f"REQUIRED_LEVEL: {1 + i % 50}\n"
+                f"PREREQUISITE: NONE\n\n"
+            )
+
+
+def write_item_shard(path, shard, count):
+    write_items(path, count)
+    with open(path) as f:
+        text = f.read().replace("ITEM_ID: item_", f"ITEM_ID: item_{shard}_")
+    with open(path, "w") as f:
+        f.write(text)
+
+
+def run(shards, per_shard):
+    with tempfile.TemporaryDirectory() as tmp:
+        os.makedirs(os.path.join(tmp, "quests"))
+        os.makedirs(os.path.join(tmp, "items"))
+        for shard in range(shards):
+            write_quest_shard(os.path.join(tmp, "quests", f"{shard:03d}.txt"), shard, per_shard)
+            write_item_shard(os.path.join(tmp, "items", f"{shard:03d}.txt"), shard, per_shard)
+
+        print(f"{shards} quest shards + {shards} item shards, {per_shard} records each, "
+              f"{os.cpu_count()} cpus")
+        baseline = None
+        for workers in (1, 2, 4, 8):
+            start = time.perf_counter()
+            pack = game_data.load_content_pack(tmp, workers=workers, use_cache=False)
+            elapsed = time.perf_counter() - start
+            baseline = baseline or elapsed
+            print(f"workers={workers}  {elapsed * 1000:9.1f} ms  speedup={baseline / elapsed:4.2f}x  "
+                  f"({len(pack['quests'])} quests, {len(pack['items'])} items)")
+
+
+if __name__ == "__main__":
+    shards = int(sys.argv[1]) if len(sys.argv) > 1 else 16
+    per_shard = int(sys.argv[2]) if len(sys.argv) > 2 else 5000
+    run(shards, per_shard)
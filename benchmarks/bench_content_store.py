@@ -0,0 +1,68 @@
+"""
+Benchmark: text loader vs sqlite content backend
+
+For each size this times the one-off import, opening the store plus a
+handful of typical queries, and a single item lookup.
+Run with: python benchmarks/bench_content_store.py [sizes]   e.g. 1000,100000,1000000
+"""
+
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import content_store
+from bench_data_cache import write_quests, write_items
+
+
+def typical_queries(store, count):
+    store.get_item(f"item_{count // 2}")
+    store.items_in_cost_range(100, 120, "weapon")
+    store.items_by_type("armor")
+    store.quests_by_level(10, 11)
+    store.quests_requiring("quest_0")
+
+
+def timed(func):
+    start = time.perf_counter()
+    func()
+    return (time.perf_counter() - start) * 1000
+
+
+def run(sizes):
+    for count in sizes:
+        with tempfile.TemporaryDirectory() as tmp:
+            quest_file = os.path.join(tmp, "quests.txt")
+            item_file = os.path.join(tmp, "items.txt")
+            db_path = os.path.join(tmp, "content.db")
+            write_quests(quest_file, count)
+            write_items(item_file, count)
+
+            imported = timed(lambda: content_store.import_text_content(db_path, quest_file, item_file))
+
+            def text_session():
+                store = content_store.ContentStore("text", quest_file, item_file)
+                typical_queries(store, count)
+
+            def sqlite_session():
+                with content_store.ContentStore("sqlite", db_path=db_path) as store:
+                    typical_queries(store, count)
+
+            # first text session parses, later ones come from the pickle cache
+            text_cold = timed(text_session)
+            text_warm = timed(text_session)
+            sqlite_time = timed(sqlite_session)
+
+            print(f"n={count:<8d} import={imported:9.1f} ms  text cold={text_cold:9.1f} ms  "
+                  f"text cached={text_warm:8.1f} ms  sqlite={sqlite_time:7.1f} ms")
+
+
+if __name__ == "__main__":
+    if len(sys.argv) > 1:
+        sizes = [int(size) for size in sys.argv[1].split(",")]
+    else:
+        sizes = [1000, 100000]
+    run(sizes)
@@ -0,0 +1,77 @@
+"""
+Benchmark: cold parse vs warm cache for game_data.load_quests / load_items
+
+Run with: python benchmarks/bench_data_cache.py [count]
+"""
+
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import game_data
+
+
+def write_quests(path, count):
+    with open(path, "w") as f:
+        for i in range(count):
+            prereq = "NONE" if i == 0 else f"quest_{i - 1}"
+            f.write(
+                f"QUEST_ID: quest_{i}\n"
+                f"TITLE: Quest {i}\n"
+                f"DESCRIPTION: Generated quest number {i}\n"
+                f"REWARD_XP: {50 + i % 500}\n"
+                f"REWARD_GOLD: {25 + i % 300}\n"
+                f"REQUIRED_LEVEL: {1 + i % 50}\n"
+                f"PREREQUISITE: {prereq}\n\n"
+            )
+
+
+def write_items(path, count):
+    types = ["weapon", "armor", "consumable"]
+    stats = ["strength", "magic", "max_health", "health"]
+    with open(path, "w") as f:
+        for i in range(count):
+            f.write(
+                f"ITEM_ID: item_{i}\n"
+                f"NAME: Item {i}\n"
+                f"TYPE: {types[i % 3]}\n"
+                f"EFFECT: {stats[i % 4]}:{1 + i % 20}\n"
+                f"COST: {10 + i % 900}\n"
+                f"DESCRIPTION: Generated item number {i}\n\n"
+            )
+
+
+def best_of(func, repeat=5):
+    best = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        elapsed = time.perf_counter() - start
+        if best is None or elapsed < best:
+            best = elapsed
+    return best
+
+
+def run(count):
+    with tempfile.TemporaryDirectory() as tmp:
+        quest_file = os.path.join(tmp, "quests.txt")
+        item_file = os.path.join(tmp, "items.txt")
+        write_quests(quest_file, count)
+        write_items(item_file, count)
+
+        for label, loader, path in (
+            ("quests", game_data.load_quests, quest_file),
+            ("items", game_data.load_items, item_file),
+        ):
+            cold = best_of(lambda: loader(path, use_cache=False))
+            loader(path)  # prime the cache
+            warm = best_of(lambda: loader(path))
+            print(f"{label:7s} n={count:<7d} cold={cold * 1000:8.2f} ms  "
+                  f"warm={warm * 1000:8.2f} ms  speedup={cold / warm:5.1f}x")
+
+
+if __name__ == "__main__":
+    run(int(sys.argv[1]) if len(sys.argv) > 1 else 20000)
@@ -0,0 +1,53 @@
+"""
+Benchmark: closed-form gain_experience vs the one-level-per-step loop
+
+Each grant starts from a fresh level 1 character.
+Run with: python benchmarks/bench_gain_experience.py
+"""
+
+import os
+import sys
+import timeit
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import character_events
+import character_manager
+
+
+def loop_gain_experience(character, xp_amount):
+    # gain_experience as it was, one level per pass
+    if character['health'] <= 0:
+        raise ValueError("dead")
+    start_level = character['level']
+    character['experience'] += xp_amount
+    character_manager.level_up_loop(character)
+    if character['level'] != start_level:
+        character_events.record_set(character, 'experience', 'level', 'max_health',
+                                    'strength', 'magic', 'health')
+    else:
+        character_events.record_set(character, 'experience')
+
+
+def run():
+    base = character_manager.create_character("Hero", "Warrior")
+    print(f"{'xp granted':>14} {'levels':>7} {'loop us':>10} {'closed us':>10}")
+    for xp_amount in (50, 150, 500, 50_000, 5_000_000, 50_000_000, 500_000_000):
+        char = dict(base)
+        character_manager.gain_experience(char, xp_amount)
+        levels = char['level'] - 1
+
+        def loop():
+            loop_gain_experience(dict(base), xp_amount)
+
+        def closed():
+            character_manager.gain_experience(dict(base), xp_amount)
+
+        number = max(1, 20000 // (levels + 1))
+        loop_us = min(timeit.repeat(loop, number=number, repeat=3)) / number * 1e6
+        closed_us = min(timeit.repeat(closed, number=number, repeat=3)) / number * 1e6
+        print(f"{xp_amount:>14} {levels:>7} {loop_us:>10.2f} {closed_us:>10.2f}")
+
+
+if __name__ == "__main__":
+    run()
@@ -0,0 +1,68 @@
+"""
+Benchmark: per-character memory and membership checks, lists vs IdLists
+
+Run with: python benchmarks/bench_id_interning.py [characters]
+"""
+
+import os
+import sys
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import id_registry
+
+ITEMS = [f"item_{i}" for i in range(500)]
+QUESTS = [f"quest_{i}" for i in range(1000)]
+
+
+def fresh(name):
+    # a new string object, like the ones load_character splits out of a save
+    return name.encode().decode()
+
+
+def make_population(count, interned, history):
+    population = []
+    for n in range(count):
+        character = {
+            "inventory": [fresh(ITEMS[(n + i * 7) % 500]) for i in range(20)],
+            "active_quests": [fresh(QUESTS[(n + i) % 300]) for i in range(3)],
+            "completed_quests": [fresh(QUESTS[(n + i * 3) % 1000]) for i in range(history)],
+        }
+        if interned:
+            id_registry.intern_character(character)
+        population.append(character)
+    return population
+
+
+def measure(count, interned, history):
+    id_registry.register_catalog(QUESTS, ITEMS)
+    tracemalloc.start()
+    population = make_population(count, interned, history)
+    size = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+
+    start = time.perf_counter()
+    hits = 0
+    for character in population:
+        if "quest_999" in character["completed_quests"]:
+            hits += 1
+        if "item_499" in character["inventory"]:
+            hits += 1
+    lookup = time.perf_counter() - start
+    return size / count, lookup, hits
+
+
+def run(count):
+    # a fresh character vs a long-running one with a big quest history
+    for history in (40, 400):
+        print(f"{history} completed quests each")
+        for label, interned in (("list", False), ("IdList", True)):
+            per_char, lookup, hits = measure(count, interned, history)
+            print(f"  {label:7s} {count} chars  {per_char:7.0f} bytes/char (id lists)  "
+                  f"2 lookups each: {lookup * 1000:7.1f} ms  hits={hits}")
+
+
+if __name__ == "__main__":
+    run(int(sys.argv[1]) if len(sys.argv) > 1 else 100000)
@@ -0,0 +1,59 @@
+"""
+Benchmark: list inventories vs the indexed Inventory
+
+A bank-sized inventory (10k slots, a few hundred kinds of item) run
+through the inventory_system calls that used to scan the whole list.
+Inventory is still a list underneath, so removing an item near the end
+still scans up to it.
+Run with: python benchmarks/bench_inventory.py [slots]
+"""
+
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import inventory_system
+from inventory import Inventory
+
+ITEMS = {f"item_{n}": {"name": f"Thing {n}", "type": "consumable"} for n in range(300)}
+
+
+def timed(func, rounds):
+    start = time.perf_counter()
+    for _ in range(rounds):
+        func()
+    return (time.perf_counter() - start) / rounds
+
+
+def run(slots):
+    # plain lists only have the global cap, raise it to bank size
+    inventory_system.MAX_INVENTORY_SIZE = slots
+    rng = random.Random(1)
+    contents = [rng.choice(list(ITEMS)) for _ in range(slots - 1)]
+    # worst case for a list: the item asked about sits at the end
+    contents.append("rare_gem")
+    print(f"{slots} slots, {len(set(contents))} kinds of item")
+    print(f"  {'':16} {'list':>10} {'Inventory':>10}")
+
+    for rounds, label, make_call in (
+        (2000, "has_item", lambda char: lambda: inventory_system.has_item(char, "rare_gem")),
+        (2000, "count_item", lambda char: lambda: inventory_system.count_item(char, "item_7")),
+        (2000, "remove + add", lambda char: lambda: (
+            inventory_system.remove_item_from_inventory(char, "rare_gem"),
+            inventory_system.add_item_to_inventory(char, "rare_gem"))),
+        (2000, "space remaining", lambda char: lambda: inventory_system.get_inventory_space_remaining(char)),
+        (100, "display", lambda char: lambda: inventory_system.display_inventory(char, ITEMS)),
+    ):
+        results = []
+        for inventory in (Inventory(contents, capacity=slots), list(contents)):
+            char = {"inventory": inventory}
+            results.append(timed(make_call(char), rounds))
+        counter_time, list_time = results
+        print(f"  {label:16} {list_time * 1e6:8.1f}us {counter_time * 1e6:8.1f}us")
+
+
+if __name__ == "__main__":
+    run(int(sys.argv[1]) if len(sys.argv) > 1 else 10000)
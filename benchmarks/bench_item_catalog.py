@@ -0,0 +1,60 @@
+"""
+Benchmark: LazyItemCatalog vs load_items startup time and RSS
+
+Every mode runs in a fresh subprocess so peak RSS is not shared.
+Run with: python benchmarks/bench_item_catalog.py [count] [lookups]
+"""
+
+import os
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from bench_data_cache import write_items
+
+
+def measure(mode, path, lookups):
+    import game_data
+    import item_catalog
+
+    start = time.perf_counter()
+    if mode == "load_items":
+        items = game_data.load_items(path, use_cache=False)
+    else:
+        items = item_catalog.LazyItemCatalog(path)
+    startup = time.perf_counter() - start
+
+    start = time.perf_counter()
+    for i in range(lookups):
+        items[f"item_{i}"]["cost"]
+    lookup = time.perf_counter() - start
+
+    # ru_maxrss is KiB on linux
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+    print(f"{mode:12s} startup={startup * 1000:8.2f} ms  "
+          f"{lookups} lookups={lookup * 1000:7.2f} ms  peak_rss={rss:7.1f} MiB")
+
+
+def run(count, lookups):
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "items.txt")
+        write_items(path, count)
+        size = os.path.getsize(path) / (1024 * 1024)
+        print(f"items file: {count} items, {size:.1f} MiB")
+        for mode in ("load_items", "lazy"):
+            subprocess.run([sys.executable, __file__, "--child", mode, path, str(lookups)], check=True)
+
+
+if __name__ == "__main__":
+    if len(sys.argv) > 1 and sys.argv[1] == "--child":
+        measure(sys.argv[2], sys.argv[3], int(sys.argv[4]))
+    else:
+        count = int(sys.argv[1]) if len(sys.argv) > 1 else 200000
+        lookups = int(sys.argv[2]) if len(sys.argv) > 2 else 100
+        run(count, lookups)
@@ -0,0 +1,61 @@
+"""
+Benchmark: equip/unequip cost with string effects vs compiled effects
+
+Run with: python benchmarks/bench_item_effects.py [rounds]
+"""
+
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import character_manager
+import inventory_system
+
+
+def old_equip_cycle(character, item_id, item_data):
+    # what equip_weapon/unequip_weapon did before: split the string each time
+    stat_name, value = inventory_system.parse_item_effect(item_data["effect"])
+    character[stat_name] += value
+    stat_name, value = inventory_system.parse_item_effect(item_data["effect"])
+    character[stat_name] -= value
+
+
+def new_equip_cycle(character, item_id, item_data):
+    for stat_name, value in inventory_system.get_item_effects(item_data):
+        character[stat_name] += value
+    for stat_name, value in inventory_system.get_item_effects(item_data):
+        character[stat_name] -= value
+
+
+def full_cycle(character, item_id, item_data):
+    inventory_system.equip_weapon(character, item_id, item_data)
+    inventory_system.unequip_weapon(character)
+    character["inventory"].append(item_id)
+
+
+def timed(func, rounds, *args):
+    start = time.perf_counter()
+    for _ in range(rounds):
+        func(*args)
+    return (time.perf_counter() - start) / rounds * 1e9
+
+
+def run(rounds):
+    sword = {"type": "weapon", "name": "Iron Sword", "effect": "strength:5",
+             "effects": (("strength", 5),)}
+    character = character_manager.create_character("Bench", "Warrior")
+    character["game_data"] = {"items": {"iron_sword": sword}}
+    character["inventory"].append("iron_sword")
+
+    old = timed(old_equip_cycle, rounds, character, "iron_sword", sword)
+    new = timed(new_equip_cycle, rounds, character, "iron_sword", sword)
+    full = timed(full_cycle, rounds, character, "iron_sword", sword)
+    print(f"effect handling per equip+unequip: string={old:7.1f} ns  compiled={new:7.1f} ns  "
+          f"saved={old - new:6.1f} ns")
+    print(f"full equip_weapon+unequip_weapon cycle: {full:7.1f} ns")
+
+
+if __name__ == "__main__":
+    run(int(sys.argv[1]) if len(sys.argv) > 1 else 500000)
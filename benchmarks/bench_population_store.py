@@ -0,0 +1,65 @@
+"""
+Benchmark: per-character loops over dicts vs PopulationStore batch ops
+
+Run with: python benchmarks/bench_population_store.py [characters]
+"""
+
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import character_manager
+from population_store import PopulationStore
+
+
+def make_characters(count):
+    characters = []
+    for n in range(count):
+        char = character_manager.create_character(f"Hero{n}", "Warrior")
+        char["health"] = n % 120
+        characters.append(char)
+    return characters
+
+
+def timed(func):
+    start = time.perf_counter()
+    func()
+    return time.perf_counter() - start
+
+
+def run(count):
+    characters = make_characters(count)
+    store = PopulationStore(characters)
+    print(f"{count} characters, ms per pass over everyone")
+
+    def dict_xp():
+        for char in characters:
+            if char["health"] > 0:
+                character_manager.gain_experience(char, 250)
+
+    cases = [
+        ("heal 5",
+         lambda: [character_manager.heal_character(char, 5) for char in characters],
+         lambda: store.heal(5)),
+        ("add_gold 10",
+         lambda: [character_manager.add_gold(char, 10) for char in characters],
+         lambda: store.add_gold(10)),
+        ("gain_experience 250", dict_xp, lambda: store.gain_experience(250)),
+        ("is_character_dead",
+         lambda: [char for char in characters if character_manager.is_character_dead(char)],
+         lambda: store.dead_rows()),
+        ("revive",
+         lambda: [character_manager.revive_character(char) for char in characters],
+         lambda: store.revive()),
+    ]
+    print(f"  {'operation':22} {'dict loop':>10} {'store':>10}")
+    for label, loop, batch in cases:
+        print(f"  {label:22} {timed(loop) * 1000:10.1f} {timed(batch) * 1000:10.1f}")
+
+    assert store.characters() == characters
+
+
+if __name__ == "__main__":
+    run(int(sys.argv[1]) if len(sys.argv) > 1 else 200000)
@@ -0,0 +1,65 @@
+"""
+Benchmark: loaders and quest queries on generated content of growing size
+
+Run with: python benchmarks/bench_quest_scaling.py [sizes] [depth]   e.g. 1000,10000,100000 8
+"""
+
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import character_manager
+import content_generator
+import game_data
+import quest_handler
+from custom_exceptions import InvalidDataFormatError
+
+
+def timed(func):
+    start = time.perf_counter()
+    result = func()
+    return (time.perf_counter() - start) * 1000, result
+
+
+def run(sizes, depth):
+    for count in sizes:
+        with tempfile.TemporaryDirectory() as tmp:
+            content_generator.generate_content(tmp, count, count, seed=1, dag_depth=depth, fan_out=3)
+            quest_file = os.path.join(tmp, "quests.txt")
+            item_file = os.path.join(tmp, "items.txt")
+
+            load_ms, quests = timed(lambda: game_data.load_quests(quest_file, use_cache=False))
+            items_ms, items = timed(lambda: game_data.load_items(item_file, use_cache=False))
+
+            character = character_manager.create_character("Bench", "Warrior")
+            character["level"] = 25
+            character["completed_quests"] = [q for q in list(quests)[: count // 10]]
+            available_ms, available = timed(lambda: quest_handler.get_available_quests(character, quests))
+
+            leaves = list(quests)[-1000:]
+            chain_ms, chains = timed(lambda: [quest_handler.get_quest_prerequisite_chain(q, quests)
+                                              for q in leaves])
+
+            # error path: one bad block about every 1000
+            content_generator.generate_items(item_file, count, seed=2, malformed_rate=0.001)
+
+            def load_bad():
+                try:
+                    game_data.load_items(item_file, use_cache=False)
+                except InvalidDataFormatError as e:
+                    return e.line_number
+            error_ms, line = timed(load_bad)
+
+            print(f"n={count:<7d} load_quests={load_ms:8.1f} ms  load_items={items_ms:8.1f} ms  "
+                  f"available={available_ms:7.1f} ms ({len(available)})  "
+                  f"1000 chains={chain_ms:6.1f} ms (max {max(map(len, chains))})  "
+                  f"first error={error_ms:6.1f} ms (line {line})")
+
+
+if __name__ == "__main__":
+    sizes = [int(size) for size in sys.argv[1].split(",")] if len(sys.argv) > 1 else [1000, 10000, 100000]
+    depth = int(sys.argv[2]) if len(sys.argv) > 2 else 8
+    run(sizes, depth)
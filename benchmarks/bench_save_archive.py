@@ -0,0 +1,85 @@
+"""
+Benchmark: one file per character vs one packed save archive
+
+Reports time per save/load, file count and bytes on disk (allocated
+blocks, which is where tiny files waste space).
+Run with: python benchmarks/bench_save_archive.py [characters]
+"""
+
+import os
+import random
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import character_manager
+from save_archive import SaveArchive
+
+
+def make_characters(count):
+    characters = []
+    for n in range(count):
+        char = character_manager.create_character(f"Hero{n}", "Mage")
+        char["inventory"] = [f"item_{(n + i) % 50}" for i in range(10)]
+        char["completed_quests"] = [f"quest_{(n + i) % 400}" for i in range(40)]
+        characters.append(char)
+    return characters
+
+
+def timed(func):
+    start = time.perf_counter()
+    result = func()
+    return time.perf_counter() - start, result
+
+
+def disk_usage(path):
+    if os.path.isfile(path):
+        return 1, os.stat(path).st_blocks * 512
+    files = 0
+    used = 0
+    for root, _, names in os.walk(path):
+        for name in names:
+            files += 1
+            used += os.stat(os.path.join(root, name)).st_blocks * 512
+    return files, used
+
+
+def run(count):
+    characters = make_characters(count)
+    names = [char["name"] for char in characters]
+    picks = random.Random(1).choices(names, k=count)
+    print(f"{count} characters")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        rows = []
+        files = os.path.join(tmp, "files")
+        plain = SaveArchive(os.path.join(tmp, "plain.qca"))
+        packed = SaveArchive(os.path.join(tmp, "packed.qca"), compress=True)
+
+        for label, target, path in (("files", files, files),
+                                    ("archive", plain, plain.path),
+                                    ("zlib", packed, packed.path)):
+            save, _ = timed(lambda: [character_manager.save_character(char, target) for char in characters])
+            load, _ = timed(lambda: [character_manager.load_character(name, target) for name in picks])
+            file_count, used = disk_usage(path)
+            rows.append((label, save, load, file_count, used))
+
+        batch, _ = timed(lambda: plain.save_characters(characters))
+        repack, _ = timed(plain.repack)
+        plain.close()
+        packed.close()
+        reopen, archive = timed(lambda: SaveArchive(plain.path))
+        archive.close()
+
+    print(f"  {'':8} {'save each':>10} {'load rand':>10} {'files':>7} {'on disk':>10}")
+    for label, save, load, file_count, used in rows:
+        print(f"  {label:8} {save / count * 1e6:8.0f}us {load / count * 1e6:8.0f}us"
+              f" {file_count:7} {used / 1024:8.0f}KB")
+    print(f"  archive save_characters batch: {batch / count * 1e6:.1f}us per character")
+    print(f"  repack {repack * 1000:.1f}ms, reopen (read tail index) {reopen * 1000:.1f}ms")
+
+
+if __name__ == "__main__":
+    run(int(sys.argv[1]) if len(sys.argv) > 1 else 3000)
@@ -0,0 +1,70 @@
+"""
+Benchmark: text vs binary save format throughput
+
+Characters have a full inventory and a long quest history.
+Run with: python benchmarks/bench_save_formats.py [characters] [completed_quests]
+"""
+
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import character_manager
+import inventory_system
+import save_formats
+
+
+def make_characters(count, completed):
+    characters = []
+    for n in range(count):
+        char = character_manager.create_character(f"Hero{n}", "Warrior")
+        char["inventory"] = [f"item_{(n + i) % 97}" for i in range(inventory_system.MAX_INVENTORY_SIZE)]
+        char["active_quests"] = [f"quest_{completed + i}" for i in range(5)]
+        char["completed_quests"] = [f"quest_{i}" for i in range(completed)]
+        char["equipped_weapon"] = "steel_sword"
+        characters.append(char)
+    return characters
+
+
+def rate(count, seconds):
+    return count / seconds if seconds else float("inf")
+
+
+def run(count, completed):
+    characters = make_characters(count, completed)
+    print(f"{count} characters, {inventory_system.MAX_INVENTORY_SIZE} items, {completed} completed quests each")
+
+    for save_format in save_formats.SAVE_FORMATS:
+        start = time.perf_counter()
+        blobs = [save_formats.encode_save(char, save_format) for char in characters]
+        encode = time.perf_counter() - start
+
+        start = time.perf_counter()
+        for blob, char in zip(blobs, characters):
+            save_formats.decode_save(blob, char["name"])
+        decode = time.perf_counter() - start
+
+        with tempfile.TemporaryDirectory() as tmp:
+            start = time.perf_counter()
+            for char in characters:
+                character_manager.save_character(char, tmp, save_format)
+            save = time.perf_counter() - start
+
+            start = time.perf_counter()
+            for char in characters:
+                character_manager.load_character(char["name"], tmp)
+            load = time.perf_counter() - start
+
+        size = sum(len(blob) for blob in blobs) / count
+        print(f"{save_format:7s} {size:7.0f} bytes/save  encode={rate(count, encode):9.0f}/s  "
+              f"decode={rate(count, decode):9.0f}/s  save_character={rate(count, save):8.0f}/s  "
+              f"load_character={rate(count, load):8.0f}/s")
+
+
+if __name__ == "__main__":
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 5000
+    completed = int(sys.argv[2]) if len(sys.argv) > 2 else 200
+    run(count, completed)
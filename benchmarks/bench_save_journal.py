@@ -0,0 +1,63 @@
+"""
+Benchmark: full save after every action vs the append-only journal
+
+Each action is add_gold on a character with a long quest history.
+Run with: python benchmarks/bench_save_journal.py [actions]
+"""
+
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import character_manager
+import save_journal
+
+
+def make_character():
+    char = character_manager.create_character("Hero", "Warrior")
+    char["inventory"] = [f"item_{i}" for i in range(20)]
+    char["completed_quests"] = [f"quest_{i}" for i in range(500)]
+    return char
+
+
+def run(actions):
+    print(f"{actions} add_gold actions")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        char = make_character()
+        start = time.perf_counter()
+        for _ in range(actions):
+            character_manager.add_gold(char, 1)
+            character_manager.save_character(char, tmp)
+        seconds = time.perf_counter() - start
+        size = os.path.getsize(os.path.join(tmp, "Hero_save.txt"))
+        print(f"  save_character each time   {seconds / actions * 1e6:8.1f} us/action, {size} bytes written each")
+
+    for sync in (False, True):
+        with tempfile.TemporaryDirectory() as tmp:
+            char = make_character()
+            journal = save_journal.CharacterJournal(tmp, compact_bytes=1 << 20, sync=sync)
+            journal.track(char)
+            path = save_journal.journal_path("Hero", tmp)
+            header = os.path.getsize(path)
+            start = time.perf_counter()
+            for _ in range(actions):
+                character_manager.add_gold(char, 1)
+            seconds = time.perf_counter() - start
+            per_record = (os.path.getsize(path) - header) / actions
+            journal.close()
+
+            start = time.perf_counter()
+            loaded = character_manager.load_character("Hero", tmp)
+            replay = time.perf_counter() - start
+            assert loaded["gold"] == char["gold"]
+            label = "journal, fsync each" if sync else "journal"
+            print(f"  {label:26} {seconds / actions * 1e6:8.1f} us/action, {per_record:.0f} bytes written each"
+                  f" (load replaying {actions} records: {replay * 1000:.1f} ms)")
+
+
+if __name__ == "__main__":
+    run(int(sys.argv[1]) if len(sys.argv) > 1 else 2000)
@@ -0,0 +1,73 @@
+"""
+Benchmark: listing saves by directory scan vs the save manifest
+
+Save files are written straight to disk (no fsync) so setup stays quick.
+Run with: python benchmarks/bench_save_manifest.py [saves]
+"""
+
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import character_manager
+import save_formats
+import save_manifest
+
+
+def write_saves(directory, count):
+    data = save_formats.encode_save(character_manager.create_character("Hero", "Mage"))
+    for n in range(count):
+        with open(os.path.join(directory, f"Hero{n}_save.txt"), "wb") as f:
+            f.write(data.replace(b"NAME: Hero", f"NAME: Hero{n}".encode(), 1))
+
+
+def scan_listing(directory):
+    # what list_saved_characters used to do
+    return [name[:-9] for name in os.listdir(directory) if name.endswith("_save.txt")]
+
+
+def timed(func, repeat=5):
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def run(count):
+    with tempfile.TemporaryDirectory() as tmp:
+        write_saves(tmp, count)
+        start = time.perf_counter()
+        character_manager.rebuild_save_manifest(tmp)
+        print(f"{count} saves, manifest rebuild {time.perf_counter() - start:.2f}s")
+
+        print(f"  os.listdir scan          {timed(lambda: scan_listing(tmp)) * 1000:8.2f} ms")
+        print(f"  manifest, cached         {timed(lambda: character_manager.list_saved_characters(tmp)) * 1000:8.2f} ms")
+
+        def cold():
+            save_manifest.manifest_cache.clear()
+            character_manager.list_saved_characters(tmp)
+        print(f"  not loaded yet (listdir) {timed(cold) * 1000:8.2f} ms")
+
+        def from_disk():
+            save_manifest.manifest_cache.clear()
+            character_manager.list_saved_character_info(tmp)
+        print(f"  manifest, read from disk {timed(from_disk) * 1000:8.2f} ms")
+
+        # a save copied in behind the manifest's back, then listed again
+        os.link(os.path.join(tmp, "Hero0_save.txt"), os.path.join(tmp, "Copy_save.txt"))
+        print(f"  drift, rescan one folder {timed(lambda: character_manager.list_saved_characters(tmp), 1) * 1000:8.2f} ms")
+
+        page = lambda: character_manager.list_saved_character_info(tmp, "level", offset=100, limit=20)
+        print(f"  sorted page of 20        {timed(page) * 1000:8.2f} ms")
+
+        char = character_manager.create_character("Newcomer", "Rogue")
+        print(f"  save + manifest append   {timed(lambda: character_manager.save_character(char, tmp)) * 1000:8.2f} ms")
+
+
+if __name__ == "__main__":
+    run(int(sys.argv[1]) if len(sys.argv) > 1 else 20000)
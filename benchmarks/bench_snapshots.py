@@ -0,0 +1,89 @@
+"""
+Benchmark: undo-log snapshots vs copy.deepcopy for rollback
+
+Characters carry long quest histories and a reference to the shared
+item catalog (character['game_data']), which deepcopy copies too. The
+last rows grow a banked inventory to show equip+undo doesn't grow with it.
+Run with: python benchmarks/bench_snapshots.py [rounds]
+"""
+
+import copy
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import character_manager
+import inventory_system
+from inventory import Inventory
+from snapshots import snapshot
+
+SWORD = {"item_id": "iron_sword", "name": "Iron Sword", "type": "weapon",
+         "effect": "strength:5", "cost": 50, "description": "d"}
+ITEMS = {f"item_{n}": {"item_id": f"item_{n}", "name": "Thing", "type": "armor",
+                       "effect": "max_health:5", "cost": n, "description": "d"} for n in range(500)}
+ITEMS["iron_sword"] = SWORD
+
+
+def make_character(quests):
+    char = character_manager.create_character("Bench", "Warrior")
+    char["inventory"] = Inventory([f"item_{n % 500}" for n in range(20)] + ["iron_sword"])
+    char["completed_quests"] = [f"quest_{n}" for n in range(quests)]
+    return char
+
+
+def timed(func, rounds):
+    start = time.perf_counter()
+    for _ in range(rounds):
+        func()
+    return (time.perf_counter() - start) / rounds
+
+
+def run(rounds):
+    print(f"{rounds} rounds")
+    print(f"  {'':34} {'deepcopy':>10} {'snapshot':>10}")
+    for quests, game_data in ((10, False), (1000, False), (1000, True)):
+        char = make_character(quests)
+        if game_data:
+            char["game_data"] = {"items": ITEMS}
+        label = f"{quests} quests" + (" + game_data" if game_data else "")
+
+        take_deep = timed(lambda: copy.deepcopy(char), rounds)
+        take_snap = timed(lambda: snapshot(char).release(), rounds)
+        print(f"  {'take, ' + label:34} {take_deep * 1e6:8.1f}us {take_snap * 1e6:8.1f}us")
+
+        # equip and roll back, the case rollback_on_error is for
+        def deep_round():
+            saved = copy.deepcopy(char)
+            inventory_system.equip_weapon(char, "iron_sword", SWORD)
+            char.clear()
+            char.update(saved)
+
+        def snap_round():
+            saved = snapshot(char)
+            inventory_system.equip_weapon(char, "iron_sword", SWORD)
+            saved.restore()
+
+        round_deep = timed(deep_round, rounds)
+        round_snap = timed(snap_round, rounds)
+        print(f"  {'equip+undo, ' + label:34} {round_deep * 1e6:8.1f}us {round_snap * 1e6:8.1f}us")
+
+    for slots in (100, 10000, 100000):
+        char = make_character(10)
+        # sword up front so remove()'s scan doesn't hide the snapshot cost
+        char["inventory"] = Inventory(["iron_sword"] + [f"item_{n % 500}" for n in range(slots)],
+                                      capacity=slots + 10)
+
+        def snap_round():
+            saved = snapshot(char)
+            inventory_system.equip_weapon(char, "iron_sword", SWORD)
+            saved.restore()
+
+        round_snap = timed(snap_round, rounds)
+        label = f"equip+undo, {slots} inventory slots"
+        print(f"  {label:34} {'':>10} {round_snap * 1e6:8.1f}us")
+
+
+if __name__ == "__main__":
+    run(int(sys.argv[1]) if len(sys.argv) > 1 else 2000)
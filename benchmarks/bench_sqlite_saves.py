@@ -0,0 +1,68 @@
+"""
+Benchmark: one file per character vs the sqlite save backend
+
+"who completed quest X" on files means loading every save.
+Run with: python benchmarks/bench_sqlite_saves.py [characters]
+"""
+
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import character_manager
+from sqlite_saves import SqliteSaveBackend
+
+
+def make_characters(count):
+    characters = []
+    for n in range(count):
+        char = character_manager.create_character(f"Hero{n}", "Mage")
+        char["inventory"] = [f"item_{(n + i) % 50}" for i in range(10)]
+        char["completed_quests"] = [f"quest_{(n + i) % 400}" for i in range(40)]
+        characters.append(char)
+    return characters
+
+
+def timed(func):
+    start = time.perf_counter()
+    result = func()
+    return time.perf_counter() - start, result
+
+
+def run(count):
+    characters = make_characters(count)
+    names = [char["name"] for char in characters]
+    print(f"{count} characters")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        rows = []
+        files = os.path.join(tmp, "files")
+        backend = SqliteSaveBackend(os.path.join(tmp, "saves.db"))
+
+        for label, target in (("files", files), ("sqlite", backend)):
+            save, _ = timed(lambda: [character_manager.save_character(char, target) for char in characters])
+            load, _ = timed(lambda: [character_manager.load_character(name, target) for name in names])
+            listing, _ = timed(lambda: character_manager.list_saved_characters(target))
+            rows.append((label, save, load, listing))
+
+        batch, _ = timed(lambda: backend.save_characters(characters))
+        scan, by_scan = timed(lambda: sorted(
+            char["name"] for char in character_manager.load_characters(names, files)
+            if "quest_7" in char["completed_quests"]))
+        query, by_index = timed(lambda: backend.characters_who_completed("quest_7"))
+        assert by_scan == by_index
+        backend.close()
+
+    print(f"  {'':8} {'save each':>10} {'load each':>10} {'list':>8}")
+    for label, save, load, listing in rows:
+        print(f"  {label:8} {save / count * 1e6:8.0f}us {load / count * 1e6:8.0f}us {listing * 1000:6.1f}ms")
+    print(f"  sqlite save_characters batch: {batch / count * 1e6:.0f}us per character")
+    print(f"  completed quest_7: load-and-filter {scan * 1000:.1f}ms, indexed query {query * 1000:.2f}ms"
+          f" ({len(by_index)} characters)")
+
+
+if __name__ == "__main__":
+    run(int(sys.argv[1]) if len(sys.argv) > 1 else 3000)
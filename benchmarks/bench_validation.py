@@ -0,0 +1,99 @@
+"""
+Benchmark: old per-call validators vs the compiled schemas
+
+The old versions rebuilt their key/type tables on every call; they are
+copied here so the two can be compared. The record list repeats 1000
+distinct records so a million of them fit in memory.
+Run with: python benchmarks/bench_validation.py [records]
+"""
+
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import character_manager
+import game_data
+from id_registry import IdList
+from custom_exceptions import InvalidSaveDataError, InvalidDataFormatError
+
+
+def old_validate_character_data(character):
+    valid_character = {
+        "name": str, "class": str, "level": int, "health": int, "max_health": int,
+        "strength": int, "magic": int, "experience": int, "gold": int,
+        "inventory": (list, IdList), "active_quests": (list, IdList),
+        "completed_quests": (list, IdList),
+        "equipped_weapon": (str, type(None)), "equipped_armor": (str, type(None))
+    }
+    for key, expected_type in valid_character.items():
+        if key not in character:
+            raise InvalidSaveDataError(f"Missing key: {key}")
+        if not isinstance(character[key], expected_type):
+            raise InvalidSaveDataError(f"Invalid type for {key}")
+    return True
+
+
+def old_validate_item_data(item_dict):
+    for key in ["item_id", "name", "type", "effect", "cost", "description"]:
+        if key not in item_dict:
+            raise InvalidDataFormatError(f"Missing field in {key}.")
+    if item_dict["type"] not in {"weapon", "armor", "consumable"}:
+        raise InvalidDataFormatError(f"Invalid item type: {item_dict['type']}")
+    if not isinstance(item_dict["cost"], int):
+        raise InvalidDataFormatError("Cost must be an integer.")
+    if ":" not in item_dict["effect"]:
+        raise InvalidDataFormatError("Effect must be printed as 'stat_name:value'.")
+    return True
+
+
+def old_validate_quest_data(quest_dict):
+    for key in ["quest_id", "title", "description", "reward_xp", "reward_gold",
+                "required_level", "prerequisite"]:
+        if key not in quest_dict:
+            raise InvalidDataFormatError(f"Missing field in {key}.")
+    for key in ["reward_xp", "reward_gold", "required_level"]:
+        if not isinstance(quest_dict[key], int):
+            raise InvalidDataFormatError(f"Field '{key}' must be an integer.")
+    return True
+
+
+def make_records(count):
+    characters = [character_manager.create_character(f"Hero{n}", "Mage") for n in range(1000)]
+    items = [{"item_id": f"item_{n}", "name": "Thing", "type": "armor", "effect": "max_health:5",
+              "cost": n, "description": "d"} for n in range(1000)]
+    quests = [{"quest_id": f"quest_{n}", "title": "Q", "description": "d", "reward_xp": n,
+               "reward_gold": n, "required_level": 1, "prerequisite": "NONE"} for n in range(1000)]
+    repeat = count // 1000
+    return characters * repeat, items * repeat, quests * repeat
+
+
+def timed(func, records):
+    start = time.perf_counter()
+    for record in records:
+        func(record)
+    return time.perf_counter() - start
+
+
+def run(count):
+    characters, items, quests = make_records(count)
+    print(f"{len(characters)} records of each kind")
+    print(f"  {'':10} {'old':>8} {'compiled':>9} {'validate_many':>14}")
+    for label, records, old, new, many in (
+        ("character", characters, old_validate_character_data,
+         character_manager.validate_character_data, character_manager.validate_characters),
+        ("item", items, old_validate_item_data, game_data.validate_item_data, game_data.validate_items),
+        ("quest", quests, old_validate_quest_data, game_data.validate_quest_data, game_data.validate_quests),
+    ):
+        old_time = timed(old, records)
+        new_time = timed(new, records)
+        start = time.perf_counter()
+        assert many(records) == []
+        many_time = time.perf_counter() - start
+        print(f"  {label:10} {old_time:7.2f}s {new_time:8.2f}s {many_time:13.2f}s"
+              f"   ({old_time / many_time:.1f}x)")
+
+
+if __name__ == "__main__":
+    run(int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000)
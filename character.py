@@ -0,0 +1,154 @@
+"""
+COMP 163 - Project 3: Quest Chronicles
+Character Module
+
+This module has Character, a __slots__ version of the character dict for
+when lots of them sit in memory at once. It still answers character['gold']
+and the rest of the dict API, so the game code takes either one.
+"""
+
+from collections.abc import MutableMapping
+
+from id_registry import IdList
+from inventory import Inventory
+
+# dict key -> slot name. "class" can't be an attribute name
+FIELD_SLOTS = {
+    "name": "name",
+    "class": "character_class",
+    "level": "level",
+    "health": "health",
+    "max_health": "max_health",
+    "strength": "strength",
+    "magic": "magic",
+    "experience": "experience",
+    "gold": "gold",
+    "inventory": "inventory",
+    "active_quests": "active_quests",
+    "completed_quests": "completed_quests",
+    "equipped_weapon": "equipped_weapon",
+    "equipped_armor": "equipped_armor",
+}
+SLOTS = tuple(FIELD_SLOTS.values())
+LIST_FIELDS = ("inventory", "active_quests", "completed_quests")
+
+# ============================================================================
+# CHARACTER
+# ============================================================================
+
+class Character(MutableMapping):
+    """
+    A character with one slot per field instead of a per-instance dict.
+    Keys outside the normal 14 go in a small `extras` dict that only exists
+    once something uses it. Deleting a field leaves its slot empty, so
+    `key in character` and KeyError behave like they do on a dict.
+    """
+
+    __slots__ = SLOTS + ("extras",)
+
+    def __init__(self, data=()):
+        self.extras = None
+        for key, value in dict(data).items():
+            self[key] = value
+
+    @classmethod
+    def from_dict(cls, data):
+        return cls(data)
+
+    def to_dict(self):
+        # plain dict for save_formats, pickling to other tools, etc
+        return dict(self.items())
+
+    # ------------------------------------------------------------------------
+    # dict api
+    # ------------------------------------------------------------------------
+
+    # these two are the hot path, the try blocks are free when nothing raises
+    def __getitem__(self, key):
+        try:
+            return getattr(self, FIELD_SLOTS[key])
+        except KeyError:
+            if self.extras is not None and key in self.extras:
+                return self.extras[key]
+            raise
+        except AttributeError:
+            raise KeyError(key) from None
+
+    def __setitem__(self, key, value):
+        try:
+            setattr(self, FIELD_SLOTS[key], value)
+        except KeyError:
+            if self.extras is None:
+                self.extras = {}
+            self.extras[key] = value
+
+    def __delitem__(self, key):
+        slot = FIELD_SLOTS.get(key)
+        if slot is None:
+            if self.extras is None or key not in self.extras:
+                raise KeyError(key)
+            del self.extras[key]
+            return
+        try:
+            delattr(self, slot)
+        except AttributeError:
+            raise KeyError(key) from None
+
+    def __contains__(self, key):
+        slot = FIELD_SLOTS.get(key)
+        if slot is None:
+            return self.extras is not None and key in self.extras
+        return hasattr(self, slot)
+
+    def __iter__(self):
+        for key, slot in FIELD_SLOTS.items():
+            if hasattr(self, slot):
+                yield key
+        if self.extras:
+            yield from list(self.extras)
+
+    def __len__(self):
+        return sum(1 for _ in self)
+
+    def __repr__(self):
+        return f"Character({self.to_dict()!r})"
+
+    # ------------------------------------------------------------------------
+    # copies
+    # ------------------------------------------------------------------------
+
+    def copy(self):
+        # the id lists get copied so the two characters can't share an
+        # inventory, everything else is an immutable value anyway
+        clone = Character.__new__(Character)
+        clone.extras = dict(self.extras) if self.extras else None
+        try:
+            # spelled out, a loop of setattr calls is several times slower
+            clone.name = self.name
+            clone.character_class = self.character_class
+            clone.level = self.level
+            clone.health = self.health
+            clone.max_health = self.max_health
+            clone.strength = self.strength
+            clone.magic = self.magic
+            clone.experience = self.experience
+            clone.gold = self.gold
+            clone.inventory = copy_id_list(self.inventory)
+            clone.active_quests = copy_id_list(self.active_quests)
+            clone.completed_quests = copy_id_list(self.completed_quests)
+            clone.equipped_weapon = self.equipped_weapon
+            clone.equipped_armor = self.equipped_armor
+        except AttributeError:
+            # some field was deleted, go one at a time
+            for key, slot in FIELD_SLOTS.items():
+                if hasattr(self, slot):
+                    value = getattr(self, slot)
+                    setattr(clone, slot, copy_id_list(value) if key in LIST_FIELDS else value)
+        return clone
+
+    __copy__ = copy
+
+def copy_id_list(values):
+    if isinstance(values, (IdList, Inventory)):
+        return values.copy()
+    return list(values)
@@ -0,0 +1,147 @@
+"""
+COMP 163 - Project 3: Quest Chronicles
+Character Cache Module
+
+This module keeps recently used characters in memory so a server can
+load/save around every request without re-reading the same save files.
+Changes made through the game APIs mark a character dirty; only dirty
+characters are written back, on eviction or flush.
+"""
+
+import threading
+from collections import OrderedDict
+
+import character_events
+import character_manager
+
+# ============================================================================
+# CHARACTER CACHE
+# ============================================================================
+
+class CharacterCache:
+    """
+    LRU cache of loaded characters, at most max_size of them. load() hands
+    back the cached dict itself, so every caller shares one copy. Changes
+    made by assigning to the dict directly aren't seen; call save() or
+    mark_dirty() after those.
+    """
+
+    def __init__(self, save_directory="data/save_games", max_size=1000, save_format="text"):
+        if max_size < 1:
+            raise ValueError("CharacterCache needs room for at least one character")
+        self.save_directory = save_directory
+        self.max_size = max_size
+        self.save_format = save_format
+        self.entries = OrderedDict()
+        self.names_by_id = {}
+        self.dirty = set()
+        self.lock = threading.RLock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.writebacks = 0
+        character_events.register_mutation_hook(self.on_mutation)
+
+    def load(self, character_name):
+        with self.lock:
+            character = self.entries.get(character_name)
+            if character is not None:
+                self.entries.move_to_end(character_name)
+                self.hits += 1
+                return character
+            self.misses += 1
+            character = character_manager.load_character(character_name, self.save_directory)
+            self.insert(character_name, character)
+            return character
+
+    def save(self, character):
+        # write-back: just remembered as dirty until flush or eviction
+        with self.lock:
+            name = character['name']
+            if self.entries.get(name) is not character:
+                self.insert(name, character)
+            else:
+                self.entries.move_to_end(name)
+            self.dirty.add(name)
+        return True
+
+    def mark_dirty(self, character):
+        with self.lock:
+            name = self.names_by_id.get(id(character))
+            if name is not None:
+                self.dirty.add(name)
+
+    def on_mutation(self, character, op, key, value):
+        # hooks fire on every game change, so only a dict lookup here
+        name = self.names_by_id.get(id(character))
+        if name is not None:
+            with self.lock:
+                self.dirty.add(name)
+
+    def insert(self, character_name, character):
+        old = self.entries.pop(character_name, None)
+        if old is not None:
+            self.names_by_id.pop(id(old), None)
+        # room is made before the new one goes in, so a failed write back
+        # leaves the cache full, in order, and without the new entry
+        while len(self.entries) >= self.max_size:
+            self.evict_oldest()
+        self.entries[character_name] = character
+        self.names_by_id[id(character)] = character_name
+
+    def evict_oldest(self):
+        name, character = next(iter(self.entries.items()))
+        if name in self.dirty:
+            # written before it leaves, so a failed save keeps it cached and dirty
+            self.write_back(name, character)
+        del self.entries[name]
+        self.names_by_id.pop(id(character), None)
+        self.evictions += 1
+
+    def write_back(self, character_name, character):
+        character_manager.save_character(character, self.save_directory, self.save_format)
+        self.dirty.discard(character_name)
+        self.writebacks += 1
+
+    def invalidate(self, character_name):
+        # drops a character without writing it, e.g. after it was deleted
+        with self.lock:
+            character = self.entries.pop(character_name, None)
+            if character is not None:
+                self.names_by_id.pop(id(character), None)
+            self.dirty.discard(character_name)
+
+    def flush(self):
+        with self.lock:
+            for name in sorted(self.dirty):
+                if name in self.entries:
+                    self.write_back(name, self.entries[name])
+        return True
+
+    def stats(self):
+        with self.lock:
+            return {
+                "size": len(self.entries),
+                "dirty": len(self.dirty),
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "writebacks": self.writebacks
+            }
+
+    def __len__(self):
+        return len(self.entries)
+
+    def __contains__(self, character_name):
+        return character_name in self.entries
+
+    def close(self):
+        character_events.unregister_mutation_hook(self.on_mutation)
+        return self.flush()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+        return False
@@ -0,0 +1,48 @@
+"""
+COMP 163 - Project 3: Quest Chronicles
+Character Events Module
+
+This module lets other code hear about character changes made through the
+game APIs (gold, xp, healing, inventory, quests, equipment). Hooks are
+called as hook(character, op, key, value) where op is one of:
+
+    "set"     character[key] is now value
+    "append"  value was appended to the list character[key]
+    "remove"  value was removed from the list character[key]
+
+With no hooks registered every notify call returns right away.
+"""
+
+mutation_hooks = []
+
+def register_mutation_hook(hook):
+    mutation_hooks.append(hook)
+    return hook
+
+def unregister_mutation_hook(hook):
+    if hook in mutation_hooks:
+        mutation_hooks.remove(hook)
+
+# ============================================================================
+# NOTIFY
+# ============================================================================
+
+def record_set(character, *keys):
+    if not mutation_hooks:
+        return
+    for key in keys:
+        value = character[key]
+        for hook in list(mutation_hooks):
+            hook(character, "set", key, value)
+
+def record_append(character, key, value):
+    if not mutation_hooks:
+        return
+    for hook in list(mutation_hooks):
+        hook(character, "append", key, value)
+
+def record_remove(character, key, value):
+    if not mutation_hooks:
+        return
+    for hook in list(mutation_hooks):
+        hook(character, "remove", key, value)
@@ -9,8 +9,21 @@ AI Usage: assisted with making sure this file matches up with gamqe_data.py, ass
 This module handles character creation, loading, and saving.
 """
 
+import asyncio
+import math
 import os
-
+import threading
+import time
+import weakref
+from contextlib import asynccontextmanager
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+import character_events
+import save_formats
+import save_journal
+import save_manifest
+from inventory import Inventory
+from schemas import CHARACTER_SCHEMA
 from custom_exceptions import (
     InvalidCharacterClassError,
     CharacterNotFoundError,
@@ -46,7 +59,7 @@ def create_character(name, character_class):
         "magic": stats["magic"],
         "experience": 0,
         "gold": 100,
-        "inventory": [],
+        "inventory": Inventory(),
         "active_quests": [],
         "completed_quests": [],
         "equipped_weapon": None,
@@ -54,50 +67,54 @@ def create_character(name, character_class):
     }
     
 
-def save_character(character, save_directory="data/save_games"):
+def is_save_backend(save_directory):
+    # save_directory can also be a backend object like
+    # sqlite_saves.SqliteSaveBackend that stores the saves itself
+    return hasattr(save_directory, "load_character")
+
+def require_save_directory(save_directory, what):
+    # for the helpers that work on the save files themselves
+    if is_save_backend(save_directory):
+        raise TypeError(f"{what} needs a save directory, not a {type(save_directory).__name__}")
+
+def save_character(character, save_directory="data/save_games", save_format="text"):
+    if is_save_backend(save_directory):
+        return save_directory.save_character(character)
+    # the whole file gets built up front and written in one go
+    data = save_formats.encode_save(character, save_format)
+    summary = (character['class'], character['level'])
+    return write_save_data(character['name'], data, save_directory, summary)
+
+def write_save_data(character_name, data, save_directory="data/save_games", summary=None):
     # ok so boom we making sure the directory exist
-
-    os.makedirs(save_directory, exist_ok=True)
-    filename = f"{character['name']}_save.txt"
-    filepath = os.path.join(save_directory, filename)
-    inventory = ",".join(character['inventory'])
-    active_quests = ",".join(character['active_quests'])
-    completed_quests = ",".join(character['completed_quests'])
-
-    if character['equipped_armor'] is None:
-        equipped_armor = ''
-    else:
-        equipped_armor = character['equipped_armor']
+    filepath = save_manifest.get_save_path(character_name, save_directory)
+    os.makedirs(os.path.dirname(filepath), exist_ok=True)
 
     # ok so boom we writing the file now
     try:
-        with open(filepath, "w") as f:
-
-            f.write(f"NAME: {character['name']}\n")
-            f.write(f"CLASS: {character['class']}\n")
-            f.write(f"LEVEL: {character['level']}\n")
-            f.write(f"EXPERIENCE: {character['experience']}\n")
-            f.write(f"HEALTH: {character['health']}\n")
-            f.write(f"MAX_HEALTH: {character['max_health']}\n")
-            f.write(f"STRENGTH: {character['strength']}\n")
-            f.write(f"MAGIC: {character['magic']}\n")
-            f.write(f"GOLD: {character['gold']}\n")
-            f.write(f"INVENTORY: {inventory}\n")
-            f.write(f"ACTIVE_QUESTS: {active_quests}\n")
-            f.write(f"COMPLETED_QUESTS: {completed_quests}\n")
-            weapon = character['equipped_weapon'] if character['equipped_weapon'] else ''
-            f.write(f"EQUIPPED_WEAPON: {weapon}\n")
-            f.write(f"EQUIPPED_ARMOR: {equipped_armor}\n")
-        return True
+        write_file_atomic(filepath, data)
     # ok so boom hoe we catching errors
     except (IOError, PermissionError) as meowy:
         raise PermissionError(f"Failed to save character file: {meowy}")
-        return False
 
-def load_character(character_name, save_directory="data/save_games"):
+    # summary is (class, level), only missing for raw bytes from elsewhere
+    if summary is None:
+        character = save_formats.decode_save(data, character_name)
+        summary = (character['class'], character['level'])
+    save_manifest.record_save(save_directory, character_name, summary[0], summary[1],
+                              os.stat(filepath).st_mtime_ns)
+    save_journal.reset_if_exists(character_name, save_directory, data)
+    return True
+
+def load_character(character_name, save_directory="data/save_games", until=None):
+    # until (a time.time() value) stops the journal replay at that point,
+    # for getting a character back as it was earlier
+    if is_save_backend(save_directory):
+        if until is not None:
+            raise TypeError("load_character(until=...) needs a save directory with journals")
+        return save_directory.load_character(character_name)
     # boom we taking that file and making the filepath
-    filename = f"{character_name}_save.txt"
-    filepath = os.path.join(save_directory, filename)
+    filepath = save_manifest.get_save_path(character_name, save_directory)
 
     # im not explaining this again i done did it twice bro
 
@@ -105,107 +122,411 @@ def load_character(character_name, save_directory="data/save_games"):
         raise CharacterNotFoundError(f"{character_name} not found.")
     
     try:
-        with open(filepath, "r") as file:
-            lines = file.readlines()
+        with open(filepath, "rb") as file:
+            data = file.read()
     except:
         raise SaveFileCorruptedError(f"{character_name}'s file is corrupted.")
-    
-    character = {}
-
-    for line in lines:
-        line = line.strip()  
-        if not line: 
-            continue
-        if ":" not in line: 
-            raise InvalidSaveDataError(f"Invalid data format in {character_name}'s file.")
-        
-        parts = line.split(": ", 1)
-        if len(parts) == 1:  
-            parts = line.split(":", 1)
-        if len(parts) != 2:
-            raise InvalidSaveDataError(f"Invalid data format in {character_name}'s file.")
-        
-        key = parts[0]
-        value = parts[1].strip() 
-        character[key] = value
-
-    inventory = (
-        character["INVENTORY"].split(",") if character["INVENTORY"].strip() else []
-    )
-
-    active_quests = (
-        character["ACTIVE_QUESTS"].split(",") if character["ACTIVE_QUESTS"].strip() else []
-    )
-
-    completed_quests = (
-        character["COMPLETED_QUESTS"].split(",") if character["COMPLETED_QUESTS"].strip() else []
-    )
-
-    
-    if "EQUIPPED_WEAPON" in character:
-        if character["EQUIPPED_WEAPON"]:
-            equipped_weapon = character["EQUIPPED_WEAPON"]
-        else:
-            equipped_weapon = None
-    else:
-        equipped_weapon = None
-
-    if "EQUIPPED_ARMOR" in character and character["EQUIPPED_ARMOR"].strip():
-        equipped_armor = character["EQUIPPED_ARMOR"]
-    else:
-        equipped_armor = None
 
+    # text or binary, decode_save figures it out from the header
     # JUST TAKE YOUR CHARACTER BRUH
-    character_dict = {
-        "name": character["NAME"],
-        "class": character["CLASS"],
-        "level": int(character["LEVEL"]),
-        "health": int(character["HEALTH"]),
-        "max_health": int(character["MAX_HEALTH"]),
-        "strength": int(character["STRENGTH"]),
-        "magic": int(character["MAGIC"]),
-        "experience": int(character["EXPERIENCE"]),
-        "gold": int(character["GOLD"]),
-        "inventory": inventory,
-        "active_quests": active_quests,
-        "completed_quests": completed_quests,
-        "equipped_weapon": equipped_weapon,
-        "equipped_armor": equipped_armor
-    }
-    return character_dict
+    character = save_formats.decode_save(data, character_name)
+    save_journal.replay_journal(character, character_name, save_directory, data, until)
+    return character
+
+def convert_save(character_name, save_directory="data/save_games", save_format="binary"):
+    # rewrites one existing save in the other format
+    require_save_directory(save_directory, "convert_save")
+    character = load_character(character_name, save_directory)
+    return save_character(character, save_directory, save_format)
+
+def convert_save_directory(save_directory="data/save_games", save_format="binary"):
+    require_save_directory(save_directory, "convert_save_directory")
+    converted = 0
+    for character_name in list_saved_characters(save_directory):
+        filepath = save_manifest.get_save_path(character_name, save_directory)
+        with open(filepath, "rb") as f:
+            current_format = save_formats.detect_format(f.read(len(save_formats.BINARY_MAGIC)))
+        if current_format != save_format:
+            convert_save(character_name, save_directory, save_format)
+            converted += 1
+    return converted
 
 def list_saved_characters(save_directory="data/save_games"):
-   # grabbing dem character names and LINNNINGG em up
-
-    if not os.path.exists(save_directory):
-        return []
-    files = os.listdir(save_directory)
-    character_names = []
-    for file in files:
-        if file.endswith("_save.txt"):
-            character_name = file[:-9] 
-            character_names.append(character_name)
-    return character_names
+    # names come from the manifest, no directory scan unless it drifted
+    if is_save_backend(save_directory):
+        return save_directory.list_saved_characters()
+    return save_manifest.list_names(save_directory)
+
+def list_saved_character_info(save_directory="data/save_games", sort_by="name",
+                              reverse=False, offset=0, limit=None):
+    # one page of {"name", "class", "level", "modified"} dicts, sort_by is
+    # any of those keys. modified is the save's mtime in nanoseconds
+    require_save_directory(save_directory, "list_saved_character_info")
+    return save_manifest.list_entries(save_directory, sort_by, reverse, offset, limit)
+
+def rebuild_save_manifest(save_directory="data/save_games"):
+    # rescans the saves and rewrites the manifest, returns how many it found
+    require_save_directory(save_directory, "rebuild_save_manifest")
+    return len(save_manifest.rebuild_manifest(save_directory))
+
+def enable_save_sharding(save_directory="data/save_games"):
+    # moves saves into 256 hash subfolders, load/save/delete follow along
+    require_save_directory(save_directory, "enable_save_sharding")
+    moved = save_manifest.enable_sharding(save_directory)
+    save_manifest.rebuild_manifest(save_directory)
+    return moved
 
 def delete_character(character_name, save_directory="data/save_games"):
     # umm. boom ? the same thing again but we go bye bye file
+    if is_save_backend(save_directory):
+        return save_directory.delete_character(character_name)
 
-    filename = f"{character_name}_save.txt"
-    filepath = os.path.join(save_directory, filename)
+    filepath = save_manifest.get_save_path(character_name, save_directory)
     if not os.path.exists(filepath):
         raise CharacterNotFoundError(f"{character_name} not found.")
     os.remove(filepath)
+    save_journal.delete_journal(character_name, save_directory)
+    save_manifest.record_delete(save_directory, character_name)
 
     return True
 # ============================================================================
+# BULK LOADING AND SAVING
+# ============================================================================
+
+# errors that only sink one character in a bulk call, anything else is a bug
+LOAD_ERRORS = (CharacterNotFoundError, SaveFileCorruptedError, InvalidSaveDataError)
+SAVE_ERRORS = (PermissionError, InvalidSaveDataError)
+
+# saves are tiny, the threads spend their time waiting on the disk
+DEFAULT_IO_WORKERS = 8
+
+def load_characters(character_names, save_directory="data/save_games", workers=DEFAULT_IO_WORKERS):
+    # results line up with character_names. a save that can't be loaded
+    # gives its exception object instead of stopping the whole batch
+    character_names = list(character_names)
+    return run_bulk(load_one, [(name, save_directory) for name in character_names], workers)
+
+def iter_load_characters(character_names, save_directory="data/save_games",
+                         workers=DEFAULT_IO_WORKERS):
+    # yields (name, character or exception) as each load finishes
+    character_names = list(character_names)
+    pool = ThreadPoolExecutor(max_workers=max(1, workers))
+    try:
+        futures = {pool.submit(load_one, name, save_directory): name for name in character_names}
+        for future in as_completed(futures):
+            yield futures[future], future.result()
+    finally:
+        # stopping the loop early shouldn't wait on loads nobody wants
+        pool.shutdown(cancel_futures=True)
+
+def save_characters(characters, save_directory="data/save_games", save_format="text",
+                    workers=DEFAULT_IO_WORKERS):
+    # results line up with characters: True or the exception for that save
+    characters = list(characters)
+    if is_save_backend(save_directory) and hasattr(save_directory, "save_characters"):
+        # one all-or-nothing batch, so every result is the same
+        try:
+            save_directory.save_characters(characters)
+        except SAVE_ERRORS as e:
+            return [e] * len(characters)
+        return [True] * len(characters)
+    return run_bulk(save_one, [(char, save_directory, save_format) for char in characters], workers)
+
+def load_one(character_name, save_directory):
+    try:
+        return load_character(character_name, save_directory)
+    except LOAD_ERRORS as e:
+        return e
+
+def save_one(character, save_directory, save_format):
+    try:
+        return save_character(character, save_directory, save_format)
+    except SAVE_ERRORS as e:
+        return e
+
+def run_bulk(func, jobs, workers):
+    workers = max(1, min(workers, len(jobs)))
+    if workers == 1:
+        return [func(*job) for job in jobs]
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        return list(pool.map(func, *zip(*jobs)))
+
+# ============================================================================
+# ASYNC API
+# ============================================================================
+
+# one shared pool for every event loop, so thousands of sessions still
+# only ever have DEFAULT_IO_WORKERS saves hitting the disk at once
+async_executor = None
+async_executor_lock = threading.Lock()
+# event loop -> {character name: [asyncio.Lock, tasks using it]}
+async_locks = weakref.WeakKeyDictionary()
+
+def get_async_executor():
+    global async_executor
+    with async_executor_lock:
+        if async_executor is None:
+            async_executor = ThreadPoolExecutor(max_workers=DEFAULT_IO_WORKERS,
+                                                thread_name_prefix="character-saves")
+        return async_executor
+
+@asynccontextmanager
+async def character_lock(character_name):
+    # saves and loads of one character run one at a time and in order,
+    # different characters don't wait on each other
+    locks = async_locks.setdefault(asyncio.get_running_loop(), {})
+    entry = locks.get(character_name)
+    if entry is None:
+        entry = locks[character_name] = [asyncio.Lock(), 0]
+    entry[1] += 1
+    try:
+        async with entry[0]:
+            yield
+    finally:
+        entry[1] -= 1
+        if entry[1] == 0:
+            del locks[character_name]
+
+async def run_in_executor(func, *args):
+    return await asyncio.get_running_loop().run_in_executor(get_async_executor(), func, *args)
+
+async def async_save_character(character, save_directory="data/save_games", save_format="text"):
+    # the character is encoded right away on the event loop, so changes
+    # made while the write waits for a thread don't end up half in the save
+    # that happens before waiting on the lock, so a save queued behind
+    # another one still writes the state from when it was called
+    name = character['name']
+    if is_save_backend(save_directory):
+        snapshot = dict(character)
+        for key in ('inventory', 'active_quests', 'completed_quests'):
+            snapshot[key] = list(character[key])
+        job = (save_directory.save_character, snapshot)
+    else:
+        data = save_formats.encode_save(character, save_format)
+        summary = (character['class'], character['level'])
+        job = (write_save_data, name, data, save_directory, summary)
+    async with character_lock(name):
+        return await run_in_executor(*job)
+
+async def async_load_character(character_name, save_directory="data/save_games"):
+    async with character_lock(character_name):
+        return await run_in_executor(load_character, character_name, save_directory)
+
+async def async_list_saved_characters(save_directory="data/save_games"):
+    return await run_in_executor(list_saved_characters, save_directory)
+
+# ============================================================================
+# CRASH-SAFE WRITES
+# ============================================================================
+
+def write_file_atomic(filepath, data):
+    # write a temp file next to the real one, fsync it, then rename it over
+    # the old save. a crash leaves either the old file or the new one, never
+    # half of one
+    directory = os.path.dirname(filepath) or "."
+    temp_path = f"{filepath}.{os.getpid()}.{threading.get_ident()}.tmp"
+    try:
+        with open(temp_path, "wb") as f:
+            f.write(data)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(temp_path, filepath)
+    except BaseException:
+        try:
+            os.remove(temp_path)
+        except OSError:
+            pass
+        raise
+    fsync_directory(directory)
+
+def fsync_directory(directory):
+    # makes the rename itself durable, not every platform can open a dir
+    try:
+        fd = os.open(directory, os.O_RDONLY)
+    except OSError:
+        return
+    try:
+        os.fsync(fd)
+    except OSError:
+        pass
+    finally:
+        os.close(fd)
+
+class WriteBehindSaver:
+    """
+    Coalesces saves of the same character. save() only encodes the current
+    state; a background thread writes each character once its oldest
+    pending save is `window` seconds old, so a burst of autosaves costs one
+    fsync. flush() and close() write everything still pending before they
+    return.
+    """
+
+    def __init__(self, save_directory="data/save_games", window=1.0, save_format="text"):
+        require_save_directory(save_directory, "WriteBehindSaver")
+        self.save_directory = save_directory
+        self.window = window
+        self.save_format = save_format
+        self.pending = {}
+        self.condition = threading.Condition()
+        self.write_lock = threading.Lock()
+        self.closed = False
+        self.error = None
+        self.saves_requested = 0
+        self.saves_written = 0
+        self.thread = threading.Thread(target=self.run, daemon=True)
+        self.thread.start()
+
+    def save(self, character):
+        data = save_formats.encode_save(character, self.save_format)
+        summary = (character['class'], character['level'])
+        with self.condition:
+            if self.closed:
+                raise RuntimeError("WriteBehindSaver is closed")
+            self.saves_requested += 1
+            # a newer save replaces the older one but keeps its deadline
+            if character['name'] in self.pending:
+                first_queued = self.pending[character['name']][1]
+            else:
+                first_queued = time.monotonic()
+            self.pending[character['name']] = ((data, summary), first_queued)
+            self.condition.notify()
+        return True
+
+    def run(self):
+        while True:
+            with self.condition:
+                while not self.closed and not self.pending:
+                    self.condition.wait()
+                if self.closed:
+                    return
+                oldest = min(queued for data, queued in self.pending.values())
+                wait = oldest + self.window - time.monotonic()
+                if wait > 0:
+                    self.condition.wait(wait)
+                    continue
+            # taking the due saves and writing them happen under one
+            # write_lock, so a flush() can't get a newer save onto disk in
+            # between and then have it overwritten by this older one
+            with self.write_lock:
+                with self.condition:
+                    due = self.take_due(time.monotonic())
+                self.write_batch(due)
+
+    def take_due(self, now):
+        due = {}
+        for name, (data, queued) in list(self.pending.items()):
+            if queued + self.window <= now:
+                due[name] = data
+                del self.pending[name]
+        return due
+
+    def write_batch(self, batch):
+        # callers hold write_lock
+        for name, (data, summary) in batch.items():
+            try:
+                write_save_data(name, data, self.save_directory, summary)
+                self.saves_written += 1
+            except Exception as e:
+                # surfaced on the next flush()/close()
+                self.error = e
+
+    def flush(self):
+        # waits out a batch the background thread is writing, then writes
+        # everything newer than it
+        with self.write_lock:
+            with self.condition:
+                batch = {name: data for name, (data, queued) in self.pending.items()}
+                self.pending.clear()
+            self.write_batch(batch)
+        if self.error is not None:
+            error, self.error = self.error, None
+            raise error
+        return True
+
+    def close(self):
+        with self.condition:
+            self.closed = True
+            self.condition.notify_all()
+        self.thread.join()
+        return self.flush()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+        return False
+
+# ============================================================================
 # CHARACTER OPERATIONS
 # ============================================================================
 
 def gain_experience(character, xp_amount):
     if character['health'] <= 0:
         raise CharacterDeadError(f"Character '{character['name']}' is DEAD. ")
-    level_up_xp = character['level'] * 100
     character['experience'] += xp_amount
+    start_level = character['level']
+    level_up_xp = start_level * 100
+
+    if character['experience'] < level_up_xp:
+        # most grants don't reach the next level
+        character_events.record_set(character, 'experience')
+        return
+
+    if character['experience'] - level_up_xp < (start_level + 1) * 100:
+        # exactly one level, the same single step the loop takes
+        character['experience'] -= level_up_xp
+        character['level'] += 1
+        character['max_health'] += 10
+        character['strength'] += 2
+        character['magic'] += 2
+        character['health'] = character['max_health']
+    else:
+        level_up_many(character, start_level)
+    character_events.record_set(character, 'experience', 'level', 'max_health',
+                                'strength', 'magic', 'health')
+
+def level_up_many(character, start_level):
+    # a grant worth two or more levels
+    levels = levels_gained(start_level, character['experience'])
+    if levels is None or (levels and not int_stats(character)):
+        level_up_loop(character)
+    elif levels:
+        # same totals the loop below reaches, in one step
+        character['experience'] -= 100 * (levels * start_level + levels * (levels - 1) // 2)
+        character['level'] += levels
+        character['max_health'] += 10 * levels
+        character['strength'] += 2 * levels
+        character['magic'] += 2 * levels
+        character['health'] = character['max_health']
+
+def levels_gained(level, experience):
+    # leveling from `level` to `level + k` costs 100 * (k*level + k(k-1)/2),
+    # so the answer is the biggest k that fits in `experience`. None means
+    # use the loop: non-int values, or negative levels where the cost
+    # isn't increasing and "biggest k that fits" isn't what the loop does
+    if type(level) is not int or type(experience) is not int or level < 0:
+        return None
+    if experience < 100 * level:
+        return 0
+    budget = experience // 100
+    # k^2 + (2*level - 1)k - 2*budget <= 0
+    b = 2 * level - 1
+    k = (math.isqrt(b * b + 8 * budget) - b) // 2
+    # isqrt rounds down, nudge k onto the exact boundary
+    while k * level + k * (k - 1) // 2 > budget:
+        k -= 1
+    while (k + 1) * level + (k + 1) * k // 2 <= budget:
+        k += 1
+    return k
+
+def int_stats(character):
+    # float stats would round differently adding 10*k once vs 10 k times
+    return (type(character['max_health']) is int and type(character['strength']) is int
+            and type(character['magic']) is int)
+
+def level_up_loop(character):
+    level_up_xp = character['level'] * 100
 
     #handles extra xp
     while character['experience'] >= level_up_xp:
@@ -220,6 +541,7 @@ def gain_experience(character, xp_amount):
 def add_gold(character, amount):
 
     character['gold'] += amount
+    character_events.record_set(character, 'gold')
     if character['gold'] < 0:
         raise ValueError("How poor can you possibly get?")
     return character['gold']
@@ -233,6 +555,7 @@ def heal_character(character, amount):
         healed = amount
         character['health'] += amount
 
+    character_events.record_set(character, 'health')
     return healed
 
 def is_character_dead(character):
@@ -245,6 +568,7 @@ def is_character_dead(character):
 def revive_character(character):
     if character['health'] <= 0:
         character['health'] = character['max_health'] // 2
+        character_events.record_set(character, 'health')
         return True
 
 # ============================================================================
@@ -252,31 +576,12 @@ def revive_character(character):
 # ============================================================================
 
 def validate_character_data(character):
-    valid_character = {
-        "name": str,
-        "class": str,
-        "level": int,
-        "health": int,
-        "max_health": int,
-        "strength": int,
-        "magic": int,
-        "experience": int,
-        "gold": int,
-        "inventory": list,
-        "active_quests": list,
-        "completed_quests": list,
-        "equipped_weapon": (str, type(None)),
-        "equipped_armor": (str, type(None))
-    }
-
-    for key, expected_type in valid_character.items():
-        if key not in character:
-            raise InvalidSaveDataError(f"Missing key: {key}")
+    # the key -> type table lives in schemas.CHARACTER_SCHEMA, built once
+    return CHARACTER_SCHEMA.validate(character)
 
-        if not isinstance(character[key], expected_type):
-            raise InvalidSaveDataError(f"Invalid type for {key}")
-
-    return True
+def validate_characters(characters):
+    # every problem in a list of characters, [(position, message), ...]
+    return CHARACTER_SCHEMA.validate_many(characters)
 
 # ============================================================================
 # TESTING
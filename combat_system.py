@@ -6,6 +6,9 @@ Name: madison wilkins
 
 AI Usage: some chatgpt help for code help and bug fixes
 """
+import character_events
+import character_manager
+import snapshots
 from custom_exceptions import (
     InvalidTargetError,
     CombatNotActiveError,
@@ -94,47 +97,51 @@ class SimpleBattle:
         else:
             print("Battle initiated between " + self.character['name'] + " and " + self.enemy['name'] + "!")
 
-        while self.combat_active:
-            self.player_turn()
-            result = self.check_battle_end()
+        # a GameError mid-fight undoes everything the battle did to the
+        # character, rewards included
+        with snapshots.rollback_on_error(self.character):
+            while self.combat_active:
+                self.player_turn()
+                result = self.check_battle_end()
 
-            if not self.combat_active:
-                break
-            if result:
-                break
+                if not self.combat_active:
+                    break
+                if result:
+                    break
 
-            self.enemy_turn()
-            result = self.check_battle_end()
-            if result:
-                break
+                self.enemy_turn()
+                result = self.check_battle_end()
+                if result:
+                    break
 
-            self.turn_counter += 1
+                self.turn_counter += 1
 
-        if result == 'player':
-            rewards = get_victory_rewards(self.enemy)
+            if result == 'player':
+                rewards = get_victory_rewards(self.enemy)
 
-            self.character['xp'] += rewards['xp']
-            self.character['gold'] += rewards['gold']
+                # through character_manager so journals and caches see it
+                character_manager.gain_experience(self.character, rewards['xp'])
+                character_manager.add_gold(self.character, rewards['gold'])
 
-            return {
-                'winner': 'player',
-                'xp_gained': rewards['xp'],
-                'gold_gained': rewards['gold']
-            }
+                return {
+                    'winner': 'player',
+                    'xp_gained': rewards['xp'],
+                    'gold_gained': rewards['gold']
+                }
         
-        elif result == 'enemy':
-            return {
-                'winner': 'enemy',
-                'xp_gained': 0,
-                'gold_gained': 0
-            }
+            elif result == 'enemy':
+                return {
+                    'winner': 'enemy',
+                    'xp_gained': 0,
+                    'gold_gained': 0
+                }
         
-        else:
-            return {
-                'winner': 'none',
-                'xp_gained': 0,
-                'gold_gained': 0
-            }
+            else:
+                return {
+                    'winner': 'none',
+                    'xp_gained': 0,
+                    'gold_gained': 0
+                }
     
     def player_turn(self):
         if not self.combat_active:
@@ -176,6 +183,7 @@ class SimpleBattle:
 
         if self.character['health'] <= 0:
             self.character['health'] = 0 
+            character_events.record_set(self.character, 'health')
             self.combat_active = False  
             display_battle_log(f"{self.character['name']} has been defeated!")
     
@@ -190,6 +198,7 @@ class SimpleBattle:
     def apply_damage(self, target, damage):
         if target['health'] - damage < 0:
             target['health'] = 0
+            character_events.record_set(target, 'health')
     
     def check_battle_end(self):
         if self.enemy['health'] <= 0:
@@ -281,6 +290,7 @@ def cleric_heal(character):
     real_heal = new_health - current_health
 
     character["health"] = new_health
+    character_events.record_set(character, "health")
 
     return f"Cleric healed for {real_heal} health points."
 
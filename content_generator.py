@@ -0,0 +1,170 @@
+"""
+COMP 163 - Project 3: Quest Chronicles
+Content Generator Module
+
+This module writes synthetic quests.txt/items.txt files of any size in
+the normal data format, for benchmarking the loaders and quest logic at
+scale. Output only depends on the arguments and the seed.
+"""
+
+import argparse
+import os
+import random
+from collections import deque
+
+ITEM_STATS = {
+    "weapon": ["strength", "magic"],
+    "armor": ["max_health", "magic", "strength"],
+    "consumable": ["health", "strength", "magic"]
+}
+
+# ============================================================================
+# GENERATORS
+# ============================================================================
+
+def generate_quests(filename, count, seed=0, dag_depth=5, fan_out=3,
+                    level_range=(1, 50), level_step=2, malformed_rate=0.0):
+    """
+    Quests form prerequisite trees at most dag_depth long, each quest
+    unlocking up to fan_out others. Root levels are uniform over
+    level_range and every child is 0..level_step levels above its parent.
+    Returns how many blocks were written and how many are malformed.
+    """
+    rng = random.Random(seed)
+    min_level, max_level = level_range
+    # quests that can still take children: [quest_id, depth, level, slots left]
+    open_parents = deque()
+    malformed = 0
+
+    with open(filename, "w") as f:
+        for i in range(count):
+            quest_id = f"quest_{i}"
+
+            if open_parents:
+                parent = open_parents[0]
+                parent[3] -= 1
+                if parent[3] == 0:
+                    open_parents.popleft()
+                prerequisite = parent[0]
+                depth = parent[1] + 1
+                level = min(max_level, parent[2] + rng.randint(0, level_step))
+            else:
+                prerequisite = "NONE"
+                depth = 1
+                level = rng.randint(min_level, max_level)
+
+            if depth < dag_depth and fan_out > 0:
+                open_parents.append([quest_id, depth, level, fan_out])
+
+            fields = [
+                ("QUEST_ID", quest_id),
+                ("TITLE", f"Quest {i}"),
+                ("DESCRIPTION", f"Generated quest {i} at depth {depth}"),
+                ("REWARD_XP", str(25 * level + rng.randint(0, 50))),
+                ("REWARD_GOLD", str(10 * level + rng.randint(0, 25))),
+                ("REQUIRED_LEVEL", str(level)),
+                ("PREREQUISITE", prerequisite)
+            ]
+            if malformed_rate and rng.random() < malformed_rate:
+                fields = corrupt_block(rng, fields, ["REWARD_XP", "REWARD_GOLD", "REQUIRED_LEVEL"])
+                malformed += 1
+            write_block(f, fields)
+
+    return {"blocks": count, "malformed": malformed}
+
+def generate_items(filename, count, seed=0, type_mix=None, multi_effect_rate=0.1,
+                   cost_range=(10, 1000), malformed_rate=0.0):
+    """
+    type_mix maps item type -> relative weight, for example
+    {"weapon": 1, "armor": 1, "consumable": 2}. Some items get two stat
+    modifiers ("strength:5,magic:2") at multi_effect_rate.
+    """
+    rng = random.Random(seed)
+    if type_mix is None:
+        type_mix = {"weapon": 1, "armor": 1, "consumable": 1}
+    types = list(type_mix)
+    weights = [type_mix[item_type] for item_type in types]
+    malformed = 0
+
+    with open(filename, "w") as f:
+        for i in range(count):
+            item_type = rng.choices(types, weights)[0]
+            stats = ITEM_STATS[item_type]
+            effect_count = 2 if len(stats) > 1 and rng.random() < multi_effect_rate else 1
+            effect = ",".join(f"{stat}:{rng.randint(1, 30)}" for stat in rng.sample(stats, effect_count))
+
+            fields = [
+                ("ITEM_ID", f"item_{i}"),
+                ("NAME", f"Item {i}"),
+                ("TYPE", item_type),
+                ("EFFECT", effect),
+                ("COST", str(rng.randint(*cost_range))),
+                ("DESCRIPTION", f"Generated {item_type} number {i}")
+            ]
+            if malformed_rate and rng.random() < malformed_rate:
+                fields = corrupt_block(rng, fields, ["COST"])
+                malformed += 1
+            write_block(f, fields)
+
+    return {"blocks": count, "malformed": malformed}
+
+def generate_content(directory, quest_count, item_count, seed=0, **options):
+    # writes <directory>/quests.txt and <directory>/items.txt
+    quest_options = {key: value for key, value in options.items()
+                     if key in ("dag_depth", "fan_out", "level_range", "level_step", "malformed_rate")}
+    item_options = {key: value for key, value in options.items()
+                    if key in ("type_mix", "multi_effect_rate", "cost_range", "malformed_rate")}
+    return {
+        "quests": generate_quests(os.path.join(directory, "quests.txt"), quest_count, seed, **quest_options),
+        "items": generate_items(os.path.join(directory, "items.txt"), item_count, seed + 1, **item_options)
+    }
+
+# ============================================================================
+# HELPERS
+# ============================================================================
+
+def write_block(f, fields):
+    for key, value in fields:
+        if key is None:
+            f.write(f"{value}\n")
+        else:
+            f.write(f"{key}: {value}\n")
+    f.write("\n")
+
+def corrupt_block(rng, fields, numeric_keys):
+    # one of the mistakes a hand-edited data file actually ends up with
+    fields = list(fields)
+    mistake = rng.choice(["missing_field", "not_a_number", "no_separator"])
+
+    if mistake == "missing_field":
+        del fields[rng.randrange(1, len(fields))]
+    elif mistake == "not_a_number":
+        key = rng.choice(numeric_keys)
+        fields = [(k, "lots" if k == key else v) for k, v in fields]
+    else:
+        position = rng.randrange(1, len(fields))
+        key, value = fields[position]
+        fields[position] = (None, f"{key} {value}")
+    return fields
+
+
+# ============================================================================
+# TESTING
+# ============================================================================
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Write synthetic quest/item data files.")
+    parser.add_argument("directory")
+    parser.add_argument("--quests", type=int, default=1000)
+    parser.add_argument("--items", type=int, default=1000)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--depth", type=int, default=5)
+    parser.add_argument("--fan-out", type=int, default=3)
+    parser.add_argument("--malformed-rate", type=float, default=0.0)
+    args = parser.parse_args()
+
+    os.makedirs(args.directory, exist_ok=True)
+    result = generate_content(args.directory, args.quests, args.items, args.seed,
+                              dag_depth=args.depth, fan_out=args.fan_out,
+                              malformed_rate=args.malformed_rate)
+    print(result)
@@ -0,0 +1,219 @@
+"""
+COMP 163 - Project 3: Quest Chronicles
+Content Store Module
+
+This module gives one read API over the quest/item catalog that can be
+backed by the normal text files or by a sqlite3 database imported from
+them. Both backends hand back the same dicts load_quests/load_items make.
+"""
+
+import os
+import sqlite3
+
+import game_data
+from custom_exceptions import (
+    MissingDataFileError,
+    QuestNotFoundError,
+    ItemNotFoundError
+)
+
+QUEST_COLUMNS = ("quest_id", "title", "description", "reward_xp",
+                 "reward_gold", "required_level", "prerequisite")
+ITEM_COLUMNS = ("item_id", "name", "type", "effect", "cost", "description")
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS quests (
+    quest_id TEXT PRIMARY KEY,
+    title TEXT NOT NULL,
+    description TEXT NOT NULL,
+    reward_xp INTEGER NOT NULL,
+    reward_gold INTEGER NOT NULL,
+    required_level INTEGER NOT NULL,
+    prerequisite TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS quests_by_level ON quests (required_level);
+CREATE INDEX IF NOT EXISTS quests_by_prerequisite ON quests (prerequisite);
+
+CREATE TABLE IF NOT EXISTS items (
+    item_id TEXT PRIMARY KEY,
+    name TEXT NOT NULL,
+    type TEXT NOT NULL,
+    effect TEXT NOT NULL,
+    cost INTEGER NOT NULL,
+    description TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS items_by_type ON items (type, cost);
+CREATE INDEX IF NOT EXISTS items_by_cost ON items (cost);
+"""
+
+# ============================================================================
+# IMPORTER
+# ============================================================================
+
+def import_text_content(db_path="data/content.db", quest_file="data/quests.txt",
+                        item_file="data/items.txt"):
+    # streams both text files into a fresh database in one transaction
+    connection = sqlite3.connect(db_path)
+    try:
+        with connection:
+            connection.executescript(SCHEMA)
+            connection.execute("DELETE FROM quests")
+            connection.execute("DELETE FROM items")
+            connection.executemany(
+                "INSERT OR REPLACE INTO quests VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (tuple(quest[column] for column in QUEST_COLUMNS)
+                 for quest in game_data.iter_quests(quest_file))
+            )
+            connection.executemany(
+                "INSERT OR REPLACE INTO items VALUES (?, ?, ?, ?, ?, ?)",
+                (tuple(item[column] for column in ITEM_COLUMNS)
+                 for item in game_data.iter_items(item_file))
+            )
+        quest_count = connection.execute("SELECT COUNT(*) FROM quests").fetchone()[0]
+        item_count = connection.execute("SELECT COUNT(*) FROM items").fetchone()[0]
+    finally:
+        connection.close()
+    return {"quests": quest_count, "items": item_count}
+
+# ============================================================================
+# CONTENT STORE
+# ============================================================================
+
+class ContentStore:
+    """
+    Read API over quests and items. backend="text" parses the text files
+    (through load_quests/load_items and their cache), backend="sqlite"
+    runs indexed queries against a database made by import_text_content.
+    """
+
+    def __init__(self, backend="text", quest_file="data/quests.txt",
+                 item_file="data/items.txt", db_path="data/content.db"):
+        if backend not in ("text", "sqlite"):
+            raise ValueError(f"Unknown content backend '{backend}'")
+        self.backend = backend
+        self.quest_file = quest_file
+        self.item_file = item_file
+        self.db_path = db_path
+        self.quests = None
+        self.items = None
+        self.connection = None
+
+        if backend == "sqlite":
+            if not os.path.exists(db_path):
+                raise MissingDataFileError(f"Content database '{db_path}' not found.")
+            self.connection = sqlite3.connect(db_path, check_same_thread=False)
+
+    def close(self):
+        if self.connection is not None:
+            self.connection.close()
+            self.connection = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+        return False
+
+    # ------------------------------------------------------------------------
+    # quests
+    # ------------------------------------------------------------------------
+
+    def get_quest(self, quest_id):
+        if self.backend == "text":
+            quests = self.text_quests()
+            if quest_id not in quests:
+                raise QuestNotFoundError(f"Quest '{quest_id}' does not exist!")
+            return quests[quest_id]
+
+        rows = self.query_quests("WHERE quest_id = ?", (quest_id,))
+        if not rows:
+            raise QuestNotFoundError(f"Quest '{quest_id}' does not exist!")
+        return rows[0]
+
+    def all_quests(self):
+        if self.backend == "text":
+            return self.text_quests()
+        return {quest["quest_id"]: quest for quest in self.query_quests("", ())}
+
+    def quests_by_level(self, min_level, max_level):
+        if self.backend == "text":
+            return [quest for quest in self.text_quests().values()
+                    if min_level <= quest["required_level"] <= max_level]
+        return self.query_quests("WHERE required_level BETWEEN ? AND ? ORDER BY required_level",
+                                 (min_level, max_level))
+
+    def quests_requiring(self, prerequisite):
+        # quests that unlock once `prerequisite` is done ("NONE" = starter quests)
+        if self.backend == "text":
+            return [quest for quest in self.text_quests().values()
+                    if quest["prerequisite"] == prerequisite]
+        return self.query_quests("WHERE prerequisite = ?", (prerequisite,))
+
+    # ------------------------------------------------------------------------
+    # items
+    # ------------------------------------------------------------------------
+
+    def get_item(self, item_id):
+        if self.backend == "text":
+            items = self.text_items()
+            if item_id not in items:
+                raise ItemNotFoundError(f"Item '{item_id}' does not exist!")
+            return items[item_id]
+
+        rows = self.query_items("WHERE item_id = ?", (item_id,))
+        if not rows:
+            raise ItemNotFoundError(f"Item '{item_id}' does not exist!")
+        return rows[0]
+
+    def all_items(self):
+        if self.backend == "text":
+            return self.text_items()
+        return {item["item_id"]: item for item in self.query_items("", ())}
+
+    def items_by_type(self, item_type):
+        if self.backend == "text":
+            return [item for item in self.text_items().values() if item["type"] == item_type]
+        return self.query_items("WHERE type = ? ORDER BY cost", (item_type,))
+
+    def items_in_cost_range(self, min_cost, max_cost, item_type=None):
+        if self.backend == "text":
+            return [item for item in self.text_items().values()
+                    if min_cost <= item["cost"] <= max_cost
+                    and (item_type is None or item["type"] == item_type)]
+        if item_type is None:
+            return self.query_items("WHERE cost BETWEEN ? AND ? ORDER BY cost", (min_cost, max_cost))
+        return self.query_items("WHERE type = ? AND cost BETWEEN ? AND ? ORDER BY cost",
+                                (item_type, min_cost, max_cost))
+
+    # ------------------------------------------------------------------------
+    # backend helpers
+    # ------------------------------------------------------------------------
+
+    def text_quests(self):
+        if self.quests is None:
+            self.quests = game_data.load_quests(self.quest_file)
+        return self.quests
+
+    def text_items(self):
+        if self.items is None:
+            self.items = game_data.load_items(self.item_file)
+        return self.items
+
+    def query_quests(self, where, params):
+        cursor = self.connection.execute(
+            f"SELECT {', '.join(QUEST_COLUMNS)} FROM quests {where}", params
+        )
+        return [dict(zip(QUEST_COLUMNS, row)) for row in cursor]
+
+    def query_items(self, where, params):
+        cursor = self.connection.execute(
+            f"SELECT {', '.join(ITEM_COLUMNS)} FROM items {where}", params
+        )
+        items = []
+        for row in cursor:
+            item = dict(zip(ITEM_COLUMNS, row))
+            # same shape parse_item_block builds
+            item["effects"] = game_data.compile_item_effect(item["effect"])
+            items.append(item)
+        return items
@@ -0,0 +1,160 @@
+"""
+COMP 163 - Project 3: Quest Chronicles
+Data Watcher Module
+
+This module polls the quest and item files while the game is running and
+picks up designer edits without a restart. Only blocks whose text changed
+get parsed again.
+"""
+
+import hashlib
+import os
+import threading
+
+import game_data
+from quest_handler import validate_quest_prerequisites
+
+# ============================================================================
+# DATA WATCHER
+# ============================================================================
+
+class DataWatcher:
+    """
+    Keeps parsed quests/items in sync with their files. Each poll re-hashes
+    the blocks of a changed file and only re-parses the ones with a new hash.
+    Updated catalogs are brand new dicts, so swapping them in is one
+    assignment and readers never see a half-applied reload.
+    """
+
+    def __init__(self, quest_file="data/quests.txt", item_file="data/items.txt", on_change=None):
+        self.quest_file = quest_file
+        self.item_file = item_file
+        self.on_change = on_change
+        self.lock = threading.Lock()
+        self.stop_event = threading.Event()
+        self.thread = None
+        self.last_error = None
+
+        # per kind: file stat, {block hash: record} and {record id: block hash}
+        self.stats = {"quests": None, "items": None}
+        self.parsed_blocks = {"quests": {}, "items": {}}
+        self.block_ids = {"quests": {}, "items": {}}
+
+        self.quests = {}
+        self.items = {}
+        # the first load isn't a change, on_change only hears about edits
+        self.poll(notify=False)
+
+    def poll(self, notify=True):
+        # returns the change set, or None when neither file changed
+        with self.lock:
+            quest_result = self.scan("quests", self.quest_file)
+            item_result = self.scan("items", self.item_file)
+            if quest_result is None and item_result is None:
+                return None
+
+            quests = self.quests if quest_result is None else quest_result[0]
+            items = self.items if item_result is None else item_result[0]
+
+            # a broken edit leaves the last good data in place
+            if quest_result is not None:
+                validate_quest_prerequisites(quests)
+
+            changes = {"quests": empty_changes(), "items": empty_changes()}
+            for kind, result in (("quests", quest_result), ("items", item_result)):
+                if result is None:
+                    continue
+                records, blocks, ids, stats, kind_changes = result
+                self.parsed_blocks[kind] = blocks
+                self.block_ids[kind] = ids
+                self.stats[kind] = stats
+                changes[kind] = kind_changes
+
+            self.quests = quests
+            self.items = items
+
+        if notify and self.on_change is not None and has_changes(changes):
+            self.on_change(self, changes)
+        return changes
+
+    def scan(self, kind, filename):
+        stats = file_stats(filename)
+        if stats is not None and stats == self.stats[kind]:
+            return None
+
+        old_blocks = self.parsed_blocks[kind]
+        old_ids = self.block_ids[kind]
+
+        records = {}
+        blocks = {}
+        ids = {}
+        for line_number, lines in game_data.iter_data_blocks(filename, game_data.DATA_LABELS[kind]):
+            digest = hashlib.blake2b("\n".join(lines).encode(), digest_size=16).digest()
+
+            # unchanged text means the old parsed record is still right
+            record = old_blocks.get(digest)
+            if record is None:
+                record = game_data.parse_data_block(kind, filename, line_number, lines)
+
+            record_id = record["quest_id"] if kind == "quests" else record["item_id"]
+            records[record_id] = record
+            blocks[digest] = record
+            ids[record_id] = digest
+
+        changes = {
+            "added": sorted(set(ids) - set(old_ids)),
+            "removed": sorted(set(old_ids) - set(ids)),
+            "modified": sorted(
+                record_id for record_id, digest in ids.items()
+                if record_id in old_ids and old_ids[record_id] != digest
+            )
+        }
+        return records, blocks, ids, stats, changes
+
+    # ------------------------------------------------------------------------
+    # background polling
+    # ------------------------------------------------------------------------
+
+    def start(self, interval=2.0):
+        if self.thread is not None and self.thread.is_alive():
+            return False
+        self.stop_event.clear()
+        self.thread = threading.Thread(target=self.run, args=(interval,), daemon=True)
+        self.thread.start()
+        return True
+
+    def run(self, interval):
+        while not self.stop_event.wait(interval):
+            try:
+                self.poll()
+                self.last_error = None
+            except Exception as e:
+                # keep watching, the designer is probably mid-edit
+                self.last_error = e
+
+    def stop(self):
+        self.stop_event.set()
+        if self.thread is not None:
+            self.thread.join()
+            self.thread = None
+
+# ============================================================================
+# HELPERS
+# ============================================================================
+
+def file_stats(filename):
+    try:
+        stats = os.stat(filename)
+    except OSError:
+        return None
+    return (stats.st_size, stats.st_mtime_ns)
+
+def empty_changes():
+    return {"added": [], "removed": [], "modified": []}
+
+def has_changes(changes):
+    for kind_changes in changes.values():
+        for ids in kind_changes.values():
+            if ids:
+                return True
+    return False
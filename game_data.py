@@ -10,159 +10,135 @@ This module handles loading and validating game data from text files.
 """
 
 import os
+import glob
+import hashlib
+import pickle
+from functools import lru_cache
+from concurrent.futures import ProcessPoolExecutor
+from schemas import QUEST_SCHEMA, ITEM_SCHEMA
+from quest_handler import validate_quest_prerequisites
 from custom_exceptions import (
     InvalidDataFormatError,
     MissingDataFileError,
     CorruptedDataError
 )
 
+# bump this whenever the parsed dict shape changes so old caches get thrown out
+CACHE_VERSION = 2
+CACHE_SUFFIX = ".cache"
+HASH_CHUNK_SIZE = 1024 * 1024
+
+# what the error messages call each kind of data file
+DATA_LABELS = {"quests": "File", "items": "Item file"}
+
 # ============================================================================
 # DATA LOADING FUNCTIONS
 # ============================================================================
 
-def load_quests(filename="data/quests.txt"):
+def load_quests(filename="data/quests.txt", use_cache=True):
 
-    # ok BET so first we pulling up with the reading of the file.
-    
-    try:
-        with open(filename, "r") as f:
-            try:
-                content = f.read()
-            except Exception:
-                raise CorruptedDataError("This file is unreadable or corrupted.")
-    except FileNotFoundError:
-        raise MissingDataFileError(f"File '{filename}' not found.")
-    
-    # BOOM we sptting the content into blocks by double newlines >_<
-    
-    meows = [meow.strip() for meow in content.split("\n\n") if meow.strip()]
+    # if we already parsed this exact file before just hand that back
+    if use_cache:
+        cached = read_data_cache(filename, "quests")
+        if cached is not None:
+            return cached
+        source_key = get_source_key(filename)
 
     quests = {}
+    for quest in iter_quests(filename):
+        quests[quest["quest_id"]] = quest
 
-    required_fields = [
-        "QUEST_ID", "TITLE", "DESCRIPTION",
-        "REWARD_XP", "REWARD_GOLD", "REQUIRED_LEVEL",
-        "PREREQUISITE"
-    ]
+    if use_cache:
+        write_data_cache(filename, "quests", source_key, quests)
+    return quests
 
-    # and then we parsin' 
+def load_items(filename="data/items.txt", use_cache=True):
+    if use_cache:
+        cached = read_data_cache(filename, "items")
+        if cached is not None:
+            return cached
+        source_key = get_source_key(filename)
 
-    for meow in meows:
-        lines = meow.split("\n")
-        quest_data = {}
+    item = {}
+    for item_dict in iter_items(filename):
+        item[item_dict['item_id']] = item_dict
 
-        for line in lines:
-            if ":" not in line:
-                raise InvalidDataFormatError(f"Invalid line: {line}")
+    if use_cache:
+        write_data_cache(filename, "items", source_key, item)
+    return item
 
-            key, value = line.split(":", 1)
-            key = key.strip()
-            value = value.strip()
+# ============================================================================
+# STREAMING PARSERS
+# ============================================================================
 
-            quest_data[key] = value
+def iter_quests(filename="data/quests.txt"):
+    # same as load_quests but one quest at a time, so memory stays flat
+    for line_number, lines in iter_data_blocks(filename, DATA_LABELS["quests"]):
+        yield parse_data_block("quests", filename, line_number, lines)
 
-        # makin sure all required fields valid and converted correctly yurrrp
-        
-        for req in required_fields:
-            if req not in quest_data:
-                raise InvalidDataFormatError(f"Missing field {req} in {meow}")
-        try:
-            reward_xp = int(quest_data["REWARD_XP"])
-            reward_gold = int(quest_data["REWARD_GOLD"])
-            required_level = int(quest_data["REQUIRED_LEVEL"])
-        except ValueError:
-            raise InvalidDataFormatError("XP, Gold, or Level field is invalid.")
-        prerequisite = quest_data["PREREQUISITE"]
-        # Build final quest dict entry
-        quests[quest_data["QUEST_ID"]] = {
-            "quest_id": quest_data["QUEST_ID"], "title": quest_data["TITLE"],
-            "description": quest_data["DESCRIPTION"],
-            "reward_xp": reward_xp,
-            "reward_gold": reward_gold,
-            "required_level": required_level,
-            "prerequisite": prerequisite
-        }
+def iter_items(filename="data/items.txt"):
+    for line_number, lines in iter_data_blocks(filename, DATA_LABELS["items"]):
+        yield parse_data_block("items", filename, line_number, lines)
 
-    return quests
+def parse_data_block(kind, filename, line_number, lines):
+    # one block's lines -> a validated quest or item dict. errors say
+    # which file and line the block starts on
+    try:
+        if kind == "quests":
+            return build_quest(lines)
+        item_dict = parse_item_block(lines)
+        validate_item_data(item_dict)
+        return item_dict
+    except InvalidDataFormatError as e:
+        raise block_error(e, filename, line_number) from e
+
+def iter_data_blocks(filename, label="File"):
+    # yields (line number the block starts on, stripped lines) for every
+    # blank-line separated block without ever holding the whole file
 
-def load_items(filename="data/items.txt"):
     try:
-        with open(filename, 'r') as f:
-            lines = f.readlines()
+        f = open(filename, "r")
     except FileNotFoundError:
-        raise MissingDataFileError(f"Item file '{filename}' not found.")
+        raise MissingDataFileError(f"{label} '{filename}' not found.")
     except Exception:
-        raise CorruptedDataError(f"Item file '{filename}' is unreadable or corrupted.")
-    
-    item = {}
-    now_meow = []
-    # lookin through each line in the file yup yup
-    for line in lines:
-        stripped = line.strip()
-        if stripped == "":
-            if now_meow:
-                item_dict = parse_item_block(now_meow)
-                validate_item_data(item_dict)
-                item[item_dict['item_id']] = item_dict
-                now_meow = []
-        else:
-            now_meow.append(stripped)
+        raise CorruptedDataError(f"{label} '{filename}' is unreadable or corrupted.")
 
-    # goin through last block if therre is one
-
-    if now_meow:
-        item_dict = parse_item_block(now_meow)
-        validate_item_data(item_dict)
-        item[item_dict['item_id']] = item_dict
+    with f:
+        block = []
+        start = 0
+        line_number = 0
+        try:
+            for line_number, line in enumerate(f, start=1):
+                stripped = line.strip()
+                if stripped == "":
+                    if block:
+                        yield start, block
+                        block = []
+                else:
+                    if not block:
+                        start = line_number
+                    block.append(stripped)
+        except UnicodeDecodeError:
+            raise CorruptedDataError(
+                f"{label} '{filename}' is unreadable or corrupted near line {line_number + 1}."
+            )
 
-    return item
+    # goin through last block if therre is one
+    if block:
+        yield start, block
 
 def validate_quest_data(quest_dict):
-    neededmeows = [
-        "quest_id",
-        "title",
-        "description",
-        "reward_xp",
-        "reward_gold",
-        "required_level",
-        "prerequisite"
-    ]
-    for meowz in neededmeows:
-        if meowz not in quest_dict:
-            raise InvalidDataFormatError(f"Missing field in {meowz}.")
-        
-    needednumericmeows = ["reward_xp", "reward_gold", "required_level"]
-
-    for key in needednumericmeows:
-        if not isinstance(quest_dict[key], int):
-            raise InvalidDataFormatError(f"Field '{key}' must be an integer.")
-    return True
+    return QUEST_SCHEMA.validate(quest_dict)
 
 def validate_item_data(item_dict):
-    neededmeows = [
-        "item_id",
-        "name",
-        "type",
-        "effect",
-        "cost",
-        "description"
-    ]
-    for meowz in neededmeows:
-        if meowz not in item_dict:
-            raise InvalidDataFormatError(f"Missing field in {meowz}.")
-    valid_types = {"weapon", "armor", "consumable"}
-
-    if item_dict["type"] not in valid_types:
-        raise InvalidDataFormatError(f"Invalid item type: {item_dict['type']}")
-    
-    #Cost must be a real integer
-    if not isinstance(item_dict["cost"], int):
-        raise InvalidDataFormatError("Cost must be an integer.")
-    
-    #Effect must be in the format stat_name:value
-    if ":" not in item_dict["effect"]:
-        raise InvalidDataFormatError("Effect must be printed as 'stat_name:value'.")
-    return True
+    return ITEM_SCHEMA.validate(item_dict)
+
+def validate_quests(quests):
+    # all the problems in a whole catalog at once, [(quest_id, message), ...]
+    return QUEST_SCHEMA.validate_many(quests)
+
+def validate_items(items):
+    return ITEM_SCHEMA.validate_many(items)
 
 def create_default_data_files():
     
@@ -209,6 +185,50 @@ DESCRIPTION: Basic melee weapon.
 # HELPER FUNCTIONS
 # ============================================================================
 
+QUEST_FIELDS = [
+    "QUEST_ID", "TITLE", "DESCRIPTION",
+    "REWARD_XP", "REWARD_GOLD", "REQUIRED_LEVEL",
+    "PREREQUISITE"
+]
+
+def build_quest(lines):
+    quest_data = {}
+
+    for line in lines:
+        if ":" not in line:
+            raise InvalidDataFormatError(f"Invalid line: {line}")
+
+        key, value = line.split(":", 1)
+        quest_data[key.strip()] = value.strip()
+
+    # makin sure all required fields valid and converted correctly yurrrp
+    for req in QUEST_FIELDS:
+        if req not in quest_data:
+            block = "\n".join(lines)
+            raise InvalidDataFormatError(f"Missing field {req} in {block}")
+    try:
+        reward_xp = int(quest_data["REWARD_XP"])
+        reward_gold = int(quest_data["REWARD_GOLD"])
+        required_level = int(quest_data["REQUIRED_LEVEL"])
+    except ValueError:
+        raise InvalidDataFormatError("XP, Gold, or Level field is invalid.")
+
+    return {
+        "quest_id": quest_data["QUEST_ID"],
+        "title": quest_data["TITLE"],
+        "description": quest_data["DESCRIPTION"],
+        "reward_xp": reward_xp,
+        "reward_gold": reward_gold,
+        "required_level": required_level,
+        "prerequisite": quest_data["PREREQUISITE"]
+    }
+
+def block_error(error, filename, line_number):
+    # same exception type, just tells you where the bad block starts
+    located = type(error)(f"{error} ({filename}, block at line {line_number})")
+    located.line_number = line_number
+    return located
+
 def parse_quest_block(lines):
 
     # reading, splitting cleaning, and conversion >_<
@@ -249,8 +269,155 @@ def parse_item_block(lines):
     except Exception:
         raise InvalidDataFormatError("Item cost must be an integer")
 
+    # compile the effect string once here instead of on every equip
+    if "effect" in item:
+        item["effects"] = compile_item_effect(item["effect"])
+
     return item
 
+@lru_cache(maxsize=1024)
+def compile_item_effect(effect_string):
+    # "strength:5" -> (("strength", 5),)
+    # "strength:5,magic:2" -> (("strength", 5), ("magic", 2))
+    effects = []
+    for part in effect_string.split(","):
+        if ":" not in part:
+            raise InvalidDataFormatError("Effect must be printed as 'stat_name:value'.")
+        stat_name, value = part.split(":", 1)
+        try:
+            effects.append((stat_name.strip(), int(value)))
+        except ValueError:
+            raise InvalidDataFormatError(f"Effect value for '{stat_name.strip()}' must be an integer.")
+    return tuple(effects)
+
+
+# ============================================================================
+# SHARDED CONTENT PACKS
+# ============================================================================
+
+def load_content_pack(directory="data", workers=None, use_cache=True):
+    # a content pack is <directory>/quests/*.txt and <directory>/items/*.txt
+    if not os.path.isdir(directory):
+        raise MissingDataFileError(f"Content pack directory '{directory}' not found.")
+
+    quest_shards = sorted(glob.glob(os.path.join(directory, "quests", "*.txt")))
+    item_shards = sorted(glob.glob(os.path.join(directory, "items", "*.txt")))
+    jobs = [("quests", path, use_cache) for path in quest_shards]
+    jobs += [("items", path, use_cache) for path in item_shards]
+
+    if workers is None:
+        workers = os.cpu_count() or 1
+    workers = max(1, min(workers, len(jobs)))
+
+    # no point paying for a process pool with one worker
+    if workers == 1:
+        results = [load_shard(*job) for job in jobs]
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            results = list(pool.map(load_shard, *zip(*jobs)))
+
+    quests = merge_shards(quest_shards, results[:len(quest_shards)], "QUEST_ID")
+    items = merge_shards(item_shards, results[len(quest_shards):], "ITEM_ID")
+
+    # prerequisites can point across shards so only check the merged set
+    validate_quest_prerequisites(quests)
+
+    return {"quests": quests, "items": items}
+
+def load_shard(kind, path, use_cache=True):
+    if kind == "quests":
+        return load_quests(path, use_cache)
+    return load_items(path, use_cache)
+
+def merge_shards(shard_paths, shard_results, id_label):
+    merged = {}
+    found_in = {}
+    for path, records in zip(shard_paths, shard_results):
+        for record_id, record in records.items():
+            if record_id in merged:
+                raise InvalidDataFormatError(
+                    f"Duplicate {id_label} '{record_id}' in '{found_in[record_id]}' and '{path}'."
+                )
+            merged[record_id] = record
+            found_in[record_id] = path
+    return merged
+
+# ============================================================================
+# COMPILED DATA CACHE
+# ============================================================================
+
+def get_cache_path(filename):
+    return filename + CACHE_SUFFIX
+
+def get_source_key(filename):
+    # size + mtime are cheap, the hash catches edits that keep both the same
+    try:
+        stats = os.stat(filename)
+        digest = hashlib.sha256()
+        with open(filename, "rb") as f:
+            # a chunk at a time so big packs never sit in memory whole
+            for chunk in iter(lambda: f.read(HASH_CHUNK_SIZE), b""):
+                digest.update(chunk)
+        digest = digest.hexdigest()
+    except OSError:
+        return None
+    return (stats.st_size, stats.st_mtime_ns, digest)
+
+def read_data_cache(filename, kind):
+    try:
+        stats = os.stat(filename)
+        with open(get_cache_path(filename), "rb") as f:
+            snapshot = pickle.load(f)
+    except Exception:
+        return None
+
+    if not isinstance(snapshot, dict):
+        return None
+    if snapshot.get("version") != CACHE_VERSION or snapshot.get("kind") != kind:
+        return None
+
+    size, mtime_ns, digest = snapshot.get("key") or (None, None, None)
+    if size != stats.st_size or mtime_ns != stats.st_mtime_ns:
+        return None
+
+    # only hash the source once the cheap checks already passed
+    key = get_source_key(filename)
+    if key is None or key[2] != digest:
+        return None
+    return snapshot["data"]
+
+def write_data_cache(filename, kind, source_key, data):
+    if source_key is None:
+        return False
+    snapshot = {
+        "version": CACHE_VERSION,
+        "kind": kind,
+        "key": source_key,
+        "data": data
+    }
+    cache_path = get_cache_path(filename)
+    temp_path = f"{cache_path}.{os.getpid()}.tmp"
+
+    # the cache is only a speedup so a read-only data dir is not an error
+    try:
+        with open(temp_path, "wb") as f:
+            pickle.dump(snapshot, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(temp_path, cache_path)
+    except OSError:
+        try:
+            os.remove(temp_path)
+        except OSError:
+            pass
+        return False
+    return True
+
+def clear_data_cache(filename):
+    try:
+        os.remove(get_cache_path(filename))
+    except FileNotFoundError:
+        return False
+    return True
+
 
 # ============================================================================
 # TESTING
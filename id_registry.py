@@ -0,0 +1,237 @@
+"""
+COMP 163 - Project 3: Quest Chronicles
+ID Registry Module
+
+This module interns quest and item ids into small dense integers so
+characters can keep their id lists as compact int arrays. Everything
+outside still sees plain string ids.
+"""
+
+import re
+import threading
+from array import array
+from collections.abc import MutableSequence
+
+from inventory import Inventory
+from snapshots import Watched
+
+CODE_TYPE = "I"
+# IdLists shorter than this check their ints one by one instead
+SHORT_LIST = 16
+
+# ============================================================================
+# ID REGISTRY
+# ============================================================================
+
+class IdRegistry:
+    """Two-way map between string ids and dense ints (0, 1, 2, ...)."""
+
+    def __init__(self):
+        self.codes = {}
+        self.names = []
+        # name -> compiled search for its code's raw bytes in an IdList
+        self.needles = {}
+        self.lock = threading.Lock()
+
+    def intern(self, name):
+        code = self.codes.get(name)
+        if code is None:
+            # the thread pools can intern the same new id at once, so
+            # check again under the lock before handing out a code
+            with self.lock:
+                code = self.codes.get(name)
+                if code is None:
+                    code = len(self.names)
+                    self.names.append(name)
+                    self.needles[name] = re.compile(re.escape(array(CODE_TYPE, [code]).tobytes()))
+                    # published last, a reader that finds the code can
+                    # already look up its name
+                    self.codes[name] = code
+        return code
+
+    def code(self, name):
+        # None means this id was never interned
+        return self.codes.get(name)
+
+    def name(self, code):
+        return self.names[code]
+
+    def __len__(self):
+        return len(self.names)
+
+    def __contains__(self, name):
+        return name in self.codes
+
+# shared registries for the whole catalog
+QUEST_IDS = IdRegistry()
+ITEM_IDS = IdRegistry()
+
+def register_catalog(quest_data_dict, item_data_dict):
+    # done at load time so the catalog ids get the low numbers
+    for quest_id in quest_data_dict:
+        QUEST_IDS.intern(quest_id)
+    for item_id in item_data_dict:
+        ITEM_IDS.intern(item_id)
+
+# ============================================================================
+# INTERNED ID LIST
+# ============================================================================
+
+class IdList(Watched, MutableSequence):
+    """
+    List of string ids stored as an array of registry codes. Acts like a
+    list of strings for append/remove/in/count/iteration. Changes log an
+    undo step for any snapshot watching it.
+    """
+
+    __slots__ = ("codes", "registry", "watchers")
+
+    def __init__(self, registry, names=()):
+        self.registry = registry
+        self.codes = array(CODE_TYPE, [registry.intern(name) for name in names])
+        self.watchers = None
+
+    def __len__(self):
+        return len(self.codes)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self.registry.names[code] for code in self.codes[index]]
+        return self.registry.names[self.codes[index]]
+
+    def __setitem__(self, index, name):
+        if isinstance(index, slice):
+            codes = array(CODE_TYPE, [self.registry.intern(n) for n in name])
+            if self.watchers:
+                self.log_undo("replace", list(self))
+            self.codes[index] = codes
+        else:
+            if self.watchers:
+                self.log_undo("set", self.position(index), self[index])
+            self.codes[index] = self.registry.intern(name)
+
+    def __delitem__(self, index):
+        if self.watchers:
+            if isinstance(index, slice):
+                self.log_undo("replace", list(self))
+            else:
+                self.log_undo("insert", self.position(index), self[index])
+        del self.codes[index]
+
+    def position(self, index):
+        # a negative index as the slot it points at
+        return index + len(self.codes) if index < 0 else index
+
+    def insert(self, index, name):
+        code = self.registry.intern(name)
+        if self.watchers:
+            # array.insert clamps the index into range
+            self.log_undo("delete", min(max(self.position(index), 0), len(self.codes)))
+        self.codes.insert(index, code)
+
+    def append(self, name):
+        code = self.registry.intern(name)
+        if self.watchers:
+            self.log_undo("pop")
+        self.codes.append(code)
+
+    def extend(self, names):
+        intern = self.registry.intern
+        codes = array(CODE_TYPE, [intern(name) for name in names])
+        if self.watchers:
+            self.log_undo("truncate", len(self.codes))
+        self.codes.extend(codes)
+
+    def __iter__(self):
+        names = self.registry.names
+        for code in self.codes:
+            yield names[code]
+
+    def __contains__(self, name):
+        if len(self.codes) < SHORT_LIST:
+            code = self.registry.codes.get(name)
+            return code is not None and code in self.codes
+        return self.find(name) >= 0
+
+    def find(self, name):
+        # position of the first copy of name, or -1
+        codes = self.codes
+        if len(codes) < SHORT_LIST:
+            # comparing a few ints is cheaper than starting up a regex
+            code = self.registry.codes.get(name)
+            if code is not None:
+                try:
+                    return codes.index(code)
+                except ValueError:
+                    pass
+            return -1
+        needle = self.registry.needles.get(name)
+        if needle is None:
+            return -1
+        # the regex runs straight over the array's buffer, so nothing gets
+        # copied and no int object is made per entry. a match has to start
+        # on an item boundary
+        size = codes.itemsize
+        match = needle.search(codes)
+        while match is not None and match.start() % size:
+            match = needle.search(codes, match.start() + 1)
+        return -1 if match is None else match.start() // size
+
+    def count(self, name):
+        code = self.registry.code(name)
+        return 0 if code is None else self.codes.count(code)
+
+    def index(self, name, start=0, stop=None):
+        code = self.registry.code(name)
+        if code is not None:
+            position = self.codes.index(code, start, len(self.codes) if stop is None else stop)
+            return position
+        raise ValueError(f"'{name}' is not in list")
+
+    def remove(self, name):
+        position = self.find(name)
+        if position < 0:
+            raise ValueError(f"'{name}' is not in list")
+        if self.watchers:
+            self.log_undo("insert", position, name)
+        del self.codes[position]
+
+    def clear(self):
+        if self.watchers:
+            self.log_undo("replace", list(self))
+        del self.codes[:]
+
+    def copy(self):
+        clone = IdList(self.registry)
+        clone.codes = self.codes[:]
+        return clone
+
+    def __eq__(self, other):
+        if isinstance(other, IdList):
+            return list(self) == list(other)
+        if isinstance(other, list):
+            return list(self) == other
+        return NotImplemented
+
+    def __repr__(self):
+        return f"IdList({list(self)!r})"
+
+# ============================================================================
+# CHARACTER HELPERS
+# ============================================================================
+
+def intern_character(character):
+    # swaps the character's id lists for compact IdLists, in place. an
+    # IdList has no capacity, so an inventory with its own stays as it is
+    if getattr(character["inventory"], "capacity", None) is None:
+        character["inventory"] = IdList(ITEM_IDS, character["inventory"])
+    character["active_quests"] = IdList(QUEST_IDS, character["active_quests"])
+    character["completed_quests"] = IdList(QUEST_IDS, character["completed_quests"])
+    return character
+
+def unintern_character(character):
+    character["inventory"] = Inventory(character["inventory"],
+                                       getattr(character["inventory"], "capacity", None))
+    character["active_quests"] = list(character["active_quests"])
+    character["completed_quests"] = list(character["completed_quests"])
+    return character
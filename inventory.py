@@ -0,0 +1,175 @@
+"""
+COMP 163 - Project 3: Quest Chronicles
+Inventory Module
+
+This module has Inventory, the list of item ids in character['inventory'].
+It is a real list (indexing, slicing, sort, +, json.dumps all work as
+before) that also keeps a count of each item_id, so `in` and count() are
+O(1) no matter how big it gets. Every list method that changes the
+contents is overridden to keep the counts in step, and to log an undo
+step for any snapshot watching it.
+"""
+
+from collections import Counter
+
+from snapshots import Watched
+
+# ============================================================================
+# INVENTORY
+# ============================================================================
+
+class Inventory(Watched, list):
+    """
+    A list of item ids with O(1) membership and count. capacity is the
+    slot limit inventory_system checks against (None means
+    MAX_INVENTORY_SIZE). A bank can use a bigger one, and the save formats
+    keep it.
+    """
+
+    __slots__ = ("counts", "capacity", "watchers")
+
+    def __init__(self, items=(), capacity=None):
+        super().__init__(items)
+        # item_id -> how many, only items that are there
+        self.counts = Counter(self)
+        self.capacity = capacity
+        self.watchers = None
+
+    def __contains__(self, item_id):
+        return item_id in self.counts
+
+    def count(self, item_id):
+        return self.counts[item_id]
+
+    def item_counts(self):
+        # item_id -> how many, a copy the caller can keep
+        return dict(self.counts)
+
+    def added(self, item_id):
+        self.counts[item_id] += 1
+
+    def dropped(self, item_id):
+        left = self.counts[item_id] - 1
+        if left:
+            self.counts[item_id] = left
+        else:
+            del self.counts[item_id]
+
+    def position(self, index):
+        # a negative index as the slot it points at
+        return index + len(self) if index < 0 else index
+
+    # ------------------------------------------------------------------------
+    # list methods that change the contents
+    # ------------------------------------------------------------------------
+
+    def append(self, item_id):
+        if self.watchers:
+            self.log_undo("pop")
+        list.append(self, item_id)
+        self.added(item_id)
+
+    def extend(self, items):
+        items = list(items)
+        if self.watchers:
+            self.log_undo("truncate", len(self))
+        list.extend(self, items)
+        self.counts.update(items)
+
+    def insert(self, index, item_id):
+        if self.watchers:
+            # list.insert clamps the index into range
+            self.log_undo("delete", min(max(self.position(index), 0), len(self)))
+        list.insert(self, index, item_id)
+        self.added(item_id)
+
+    def remove(self, item_id):
+        # an item that isn't there fails without scanning
+        if item_id not in self.counts:
+            raise ValueError(f"'{item_id}' is not in inventory")
+        index = list.index(self, item_id)
+        if self.watchers:
+            self.log_undo("insert", index, item_id)
+        list.__delitem__(self, index)
+        self.dropped(item_id)
+
+    def pop(self, index=-1):
+        item_id = list.__getitem__(self, index)
+        if self.watchers:
+            self.log_undo("insert", self.position(index), item_id)
+        list.__delitem__(self, index)
+        self.dropped(item_id)
+        return item_id
+
+    def clear(self):
+        if self.watchers:
+            self.log_undo("replace", list(self))
+        list.clear(self)
+        self.counts.clear()
+
+    def __setitem__(self, index, value):
+        if isinstance(index, slice):
+            value = list(value)
+            old = list.__getitem__(self, index)
+            if self.watchers:
+                self.log_undo("replace", list(self))
+            list.__setitem__(self, index, value)
+            for item_id in old:
+                self.dropped(item_id)
+            self.counts.update(value)
+            return
+        old = list.__getitem__(self, index)
+        if self.watchers:
+            self.log_undo("set", self.position(index), old)
+        list.__setitem__(self, index, value)
+        self.dropped(old)
+        self.added(value)
+
+    def __delitem__(self, index):
+        old = list.__getitem__(self, index)
+        if isinstance(index, slice):
+            if self.watchers:
+                self.log_undo("replace", list(self))
+            list.__delitem__(self, index)
+            for item_id in old:
+                self.dropped(item_id)
+            return
+        if self.watchers:
+            self.log_undo("insert", self.position(index), old)
+        list.__delitem__(self, index)
+        self.dropped(old)
+
+    def __iadd__(self, items):
+        self.extend(items)
+        return self
+
+    def __imul__(self, times):
+        if self.watchers:
+            self.log_undo("replace", list(self))
+        list.__imul__(self, times)
+        self.counts = Counter(self)
+        return self
+
+    def sort(self, *, key=None, reverse=False):
+        if self.watchers:
+            self.log_undo("replace", list(self))
+        list.sort(self, key=key, reverse=reverse)
+
+    def reverse(self):
+        if self.watchers:
+            self.log_undo("replace", list(self))
+        list.reverse(self)
+
+    # ------------------------------------------------------------------------
+    # copies
+    # ------------------------------------------------------------------------
+
+    def copy(self):
+        return Inventory(self, self.capacity)
+
+    def __reduce__(self):
+        # pickle/copy would otherwise append items before the counts exist
+        return (Inventory, (list(self), self.capacity))
+
+    def __repr__(self):
+        return f"Inventory({list.__repr__(self)})"
@@ -15,6 +15,10 @@ ItemNotFoundError,
 InsufficientResourcesError,
 InvalidItemTypeError
 )
+import character_events
+import snapshots
+from game_data import compile_item_effect
+from inventory import Inventory
 
 MAX_INVENTORY_SIZE = 20
 
@@ -22,16 +26,27 @@ MAX_INVENTORY_SIZE = 20
 # INVENTORY MANAGEMENT  
 # ============================================================================  
 
+def inventory_capacity(inventory):
+    # an Inventory can carry its own limit (bank storage etc), plain lists
+    # get the normal one
+    capacity = getattr(inventory, "capacity", None)
+    return MAX_INVENTORY_SIZE if capacity is None else capacity
+
+def is_inventory_full(inventory):
+    return len(inventory) >= inventory_capacity(inventory)
+
 def add_item_to_inventory(character, item_id):
-    if len(character['inventory']) >= MAX_INVENTORY_SIZE:
+    if is_inventory_full(character['inventory']):
         raise InventoryFullError("Inventory is full, cannot add more items.")
     character['inventory'].append(item_id)
+    character_events.record_append(character, 'inventory', item_id)
     return True
 
 def remove_item_from_inventory(character, item_id):
     if item_id not in character['inventory']:
         raise ItemNotFoundError("Item not found in inventory. Check ID.")
     character['inventory'].remove(item_id)
+    character_events.record_remove(character, 'inventory', item_id)
     return True
 
 def has_item(character, item_id):
@@ -41,12 +56,17 @@ def count_item(character, item_id):
     return character['inventory'].count(item_id)
 
 def get_inventory_space_remaining(character):
-    remaining = MAX_INVENTORY_SIZE - len(character['inventory'])
+    remaining = inventory_capacity(character['inventory']) - len(character['inventory'])
     return remaining if remaining >= 0 else 0
 
 def clear_inventory(character):
-    removed_items = character['inventory'][:]  # FIXED
-    character['inventory'] = []
+    inventory = character['inventory']
+    removed_items = inventory[:]  # FIXED
+    if isinstance(inventory, Inventory):
+        character['inventory'] = Inventory(capacity=inventory.capacity)
+    else:
+        character['inventory'] = []
+    character_events.record_set(character, 'inventory')
     return removed_items
 
 
@@ -59,11 +79,12 @@ def use_item(character, item_id, item_data):
         raise ItemNotFoundError("Item not found in inventory. Check ID.")
     if item_data['type'] != 'consumable':
         raise InvalidItemTypeError("This item is not a consumable!")
-    stat_name, value = parse_item_effect(item_data['effect'])
-    apply_stat_effect(character, stat_name, value)
+    effects = get_item_effects(item_data)
+    for stat_name, value in effects:
+        apply_stat_effect(character, stat_name, value)
     remove_item_from_inventory(character, item_id)
     item_name = item_data.get('name', item_id)
-    return f"Used {item_name}! {stat_name} increased by {value}!"
+    return f"Used {item_name}! {describe_effects(effects)}!"
 
 def equip_weapon(character, item_id, item_data):
     if item_id not in character["inventory"]:
@@ -72,17 +93,20 @@ def equip_weapon(character, item_id, item_data):
         raise InvalidItemTypeError("Item is not a weapon!")
 
     # SAFETY CHECK (PREVENT INVENTORY OVERFLOW DURING SWAP)
-    if character["equipped_weapon"] is not None and len(character["inventory"]) >= MAX_INVENTORY_SIZE:
+    if character["equipped_weapon"] is not None and is_inventory_full(character["inventory"]):
         raise InventoryFullError("Inventory full — cannot swap weapons.")
 
-    stat_name, value = parse_item_effect(item_data["effect"])
-    character[stat_name] += value
+    effects = get_item_effects(item_data)
+    for stat_name, value in effects:
+        character[stat_name] += value
+        character_events.record_set(character, stat_name)
 
     character["equipped_weapon"] = item_id
+    character_events.record_set(character, "equipped_weapon")
     remove_item_from_inventory(character, item_id)
 
     item_name = item_data.get('name', item_id)
-    return f"Equipped {item_name}! {stat_name} increased by {value}!"
+    return f"Equipped {item_name}! {describe_effects(effects)}!"
 
 def equip_armor(character, item_id, item_data):
     if item_id not in character["inventory"]:
@@ -91,35 +115,42 @@ def equip_armor(character, item_id, item_data):
         raise InvalidItemTypeError("Item is not armor!")
 
     # SAFETY CHECK — PREVENT OVERFLOW BEFORE UNEQUIPPING
-    if character["equipped_armor"] is not None and len(character["inventory"]) >= MAX_INVENTORY_SIZE:
+    if character["equipped_armor"] is not None and is_inventory_full(character["inventory"]):
         raise InventoryFullError("Inventory full — cannot swap armor.")
 
-    if character["equipped_armor"] is not None:
-        old_armor_id = unequip_armor(character)
-        add_item_to_inventory(character, old_armor_id)
+    # a failure halfway through puts the old armor and stats back
+    with snapshots.rollback_on_error(character):
+        if character["equipped_armor"] is not None:
+            old_armor_id = unequip_armor(character)
+            add_item_to_inventory(character, old_armor_id)
 
-    stat_name, value = parse_item_effect(item_data["effect"])
-    character[stat_name] += value
+        effects = get_item_effects(item_data)
+        for stat_name, value in effects:
+            character[stat_name] += value
+            character_events.record_set(character, stat_name)
 
-    character["equipped_armor"] = item_id
-    remove_item_from_inventory(character, item_id)
+        character["equipped_armor"] = item_id
+        character_events.record_set(character, "equipped_armor")
+        remove_item_from_inventory(character, item_id)
 
     item_name = item_data.get('name', item_id)
-    return f"Equipped {item_name}! {stat_name} increased by {value}!"
+    return f"Equipped {item_name}! {describe_effects(effects)}!"
 
 def unequip_weapon(character):
     weapon_id = character["equipped_weapon"]
     if weapon_id is None:
         return None
 
-    if len(character["inventory"]) >= MAX_INVENTORY_SIZE:
+    if is_inventory_full(character["inventory"]):
         raise InventoryFullError("Inventory is full! Cannot unequip weapon!")
 
     weapon_data = character["game_data"]["items"][weapon_id]
-    stat, val = parse_item_effect(weapon_data["effect"])
-    character[stat] -= val
+    for stat, val in get_item_effects(weapon_data):
+        character[stat] -= val
+        character_events.record_set(character, stat)
 
     character["equipped_weapon"] = None
+    character_events.record_set(character, "equipped_weapon")
     return weapon_id
 
 def unequip_armor(character):
@@ -127,14 +158,16 @@ def unequip_armor(character):
     if armor_id is None:
         return None
 
-    if len(character["inventory"]) >= MAX_INVENTORY_SIZE:
+    if is_inventory_full(character["inventory"]):
         raise InventoryFullError("Inventory is full! Cannot unequip armor!")
 
     armor_data = character["game_data"]["items"][armor_id]
-    stat, val = parse_item_effect(armor_data["effect"])
-    character[stat] -= val
+    for stat, val in get_item_effects(armor_data):
+        character[stat] -= val
+        character_events.record_set(character, stat)
 
     character["equipped_armor"] = None
+    character_events.record_set(character, "equipped_armor")
     return armor_id
 
 
@@ -145,10 +178,12 @@ def unequip_armor(character):
 def purchase_item(character, item_id, item_data):
     if character['gold'] < item_data['cost']:
         raise InsufficientResourcesError("You're too poor!")
-    if len(character['inventory']) >= MAX_INVENTORY_SIZE:
+    if is_inventory_full(character['inventory']):
         raise InventoryFullError("Inventory is full! Sell something?")
     character['gold'] -= item_data['cost']
     character['inventory'].append(item_id)
+    character_events.record_set(character, 'gold')
+    character_events.record_append(character, 'inventory', item_id)
     return True
 
 def sell_item(character, item_id, item_data):
@@ -157,6 +192,7 @@ def sell_item(character, item_id, item_data):
     sell_price = item_data['cost'] // 2
     remove_item_from_inventory(character, item_id)
     character['gold'] += sell_price
+    character_events.record_set(character, 'gold')
     return sell_price
 
 
@@ -168,16 +204,32 @@ def parse_item_effect(effect_string):
     parts = effect_string.split(":")
     return parts[0], int(parts[1])
 
+def get_item_effects(item_data):
+    # catalog items already have their effects compiled by game_data,
+    # hand-built item dicts still work off the effect string
+    effects = item_data.get("effects")
+    if effects is None:
+        effects = compile_item_effect(item_data["effect"])
+    return effects
+
+def describe_effects(effects):
+    return " and ".join(f"{stat_name} increased by {value}" for stat_name, value in effects)
+
 def apply_stat_effect(character, stat_name, value):
     character[stat_name] += value
     if stat_name == "health" and character["health"] > character["max_health"]:
         character["health"] = character["max_health"]
+    character_events.record_set(character, stat_name)
 
 def display_inventory(character, item_data_dict):
     lines = ["- CURRENT INVENTORY ! -"]
-    counts = {}
-    for item_id in character["inventory"]:
-        counts[item_id] = counts.get(item_id, 0) + 1
+    inventory = character["inventory"]
+    if isinstance(inventory, Inventory):
+        counts = inventory.item_counts()
+    else:
+        counts = {}
+        for item_id in inventory:
+            counts[item_id] = counts.get(item_id, 0) + 1
 
     if not counts:
         lines.append("Inventory is empty. . Try some shopping!")
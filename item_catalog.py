@@ -0,0 +1,258 @@
+"""
+COMP 163 - Project 3: Quest Chronicles
+Item Catalog Module
+
+This module holds item catalog types that sit on top of game_data for
+when the item file gets too big to load the normal way.
+"""
+
+import mmap
+import re
+import threading
+from bisect import bisect_left, bisect_right
+from itertools import chain
+from collections.abc import Mapping
+
+from game_data import parse_item_block, validate_item_data, block_error
+from inventory_system import get_item_effects
+from custom_exceptions import (
+    InvalidDataFormatError,
+    MissingDataFileError,
+    CorruptedDataError
+)
+
+# blank line(s) between blocks, and the ITEM_ID line inside a block
+BLOCK_SEPARATOR = re.compile(rb"\n(?:[ \t\r]*\n)+")
+ITEM_ID_LINE = re.compile(rb"^[ \t]*ITEM_ID: (.*?)[ \t\r]*$", re.MULTILINE)
+
+# ============================================================================
+# LAZY ITEM CATALOG
+# ============================================================================
+
+class LazyItemCatalog(Mapping):
+    """
+    Read-only item_id -> item dict mapping backed by an mmapped items file.
+    Only the block offsets are found up front, each item gets parsed the
+    first time somebody looks it up.
+    """
+
+    def __init__(self, filename="data/items.txt"):
+        self.filename = filename
+        self.index = {}
+        self.parsed = {}
+
+        try:
+            self.file = open(filename, "rb")
+        except FileNotFoundError:
+            raise MissingDataFileError(f"Item file '{filename}' not found.")
+        except Exception:
+            raise CorruptedDataError(f"Item file '{filename}' is unreadable or corrupted.")
+
+        # mmap can't map an empty file, an empty catalog is fine though
+        try:
+            self.data = mmap.mmap(self.file.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:
+            self.data = b""
+
+        self.build_index()
+
+    def build_index(self):
+        data = self.data
+        find_id = ITEM_ID_LINE.search
+        start = 0
+        bounds = chain((m.span() for m in BLOCK_SEPARATOR.finditer(data)), [(len(data), len(data))])
+
+        for end, next_start in bounds:
+            match = find_id(data, start, end)
+            if match is None:
+                self.missing_item_id(start, end)
+            else:
+                try:
+                    item_id = match.group(1).decode().strip()
+                except UnicodeDecodeError:
+                    raise CorruptedDataError(
+                        f"Item file '{self.filename}' is unreadable or corrupted near line {self.line_number(start)}."
+                    )
+                # later blocks win, same as load_items
+                self.index[item_id] = (start, end - start)
+            start = next_start
+
+    def missing_item_id(self, start, end):
+        # whitespace-only stretches (like the start of the file) aren't blocks
+        if self.data[start:end].strip():
+            error = InvalidDataFormatError("Missing field in item_id.")
+            raise block_error(error, self.filename, self.line_number(start))
+
+    def line_number(self, offset):
+        # only used on the error path so counting here is fine
+        return self.data[:offset].count(b"\n") + 1
+
+    def __getitem__(self, item_id):
+        if item_id in self.parsed:
+            return self.parsed[item_id]
+
+        offset, length = self.index[item_id]
+        try:
+            text = self.data[offset:offset + length].decode()
+        except UnicodeDecodeError:
+            raise CorruptedDataError(
+                f"Item file '{self.filename}' is unreadable or corrupted near line {self.line_number(offset)}."
+            )
+
+        lines = [line.strip() for line in text.splitlines() if line.strip()]
+        try:
+            item_dict = parse_item_block(lines)
+            validate_item_data(item_dict)
+        except InvalidDataFormatError as e:
+            raise block_error(e, self.filename, self.line_number(offset)) from e
+
+        self.parsed[item_id] = item_dict
+        return item_dict
+
+    def __contains__(self, item_id):
+        return item_id in self.index
+
+    def __iter__(self):
+        return iter(self.index)
+
+    def __len__(self):
+        return len(self.index)
+
+    def parsed_count(self):
+        return len(self.parsed)
+
+    def close(self):
+        if isinstance(self.data, mmap.mmap):
+            self.data.close()
+        self.data = b""
+        self.file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+        return False
+
+# ============================================================================
+# ITEM INDEX
+# ============================================================================
+
+class ItemIndex:
+    """
+    Secondary indexes over an item catalog: items by type, items by the
+    stat they modify, and a cost-sorted list for bisect range queries.
+    add_item/remove_item keep everything up to date without a rebuild.
+    Updates and queries take the lock, so a reload thread can change the
+    index in place while the game is reading it.
+    """
+
+    def __init__(self, item_data_dict=None):
+        self.lock = threading.RLock()
+        self.items = {}
+        self.by_type = {}
+        self.by_stat = {}
+        # kept in step: sorted (cost, item_id) keys and just the costs
+        self.cost_keys = []
+        self.costs = []
+        if item_data_dict is not None:
+            for item_dict in item_data_dict.values():
+                self.add_item(item_dict)
+
+    def add_item(self, item_dict):
+        item_id = item_dict["item_id"]
+        with self.lock:
+            if item_id in self.items:
+                self.remove_item(item_id)
+            self.items[item_id] = item_dict
+
+            self.by_type.setdefault(item_dict["type"], set()).add(item_id)
+            for stat_name, value in get_item_effects(item_dict):
+                self.by_stat.setdefault(stat_name, set()).add(item_id)
+
+            key = (item_dict["cost"], item_id)
+            position = bisect_left(self.cost_keys, key)
+            self.cost_keys.insert(position, key)
+            self.costs.insert(position, key[0])
+
+    def remove_item(self, item_id):
+        with self.lock:
+            item_dict = self.items.pop(item_id, None)
+            if item_dict is None:
+                return False
+
+            discard_from(self.by_type, item_dict["type"], item_id)
+            for stat_name, value in get_item_effects(item_dict):
+                discard_from(self.by_stat, stat_name, item_id)
+
+            position = bisect_left(self.cost_keys, (item_dict["cost"], item_id))
+            del self.cost_keys[position]
+            del self.costs[position]
+            return True
+
+    def copy(self):
+        # independent copy, so an updated index can be built off to the side
+        clone = ItemIndex()
+        with self.lock:
+            clone.items = dict(self.items)
+            clone.by_type = {item_type: set(ids) for item_type, ids in self.by_type.items()}
+            clone.by_stat = {stat_name: set(ids) for stat_name, ids in self.by_stat.items()}
+            clone.cost_keys = list(self.cost_keys)
+            clone.costs = list(self.costs)
+        return clone
+
+    def apply_changes(self, item_data_dict, changes):
+        # takes a DataWatcher change set for items. only the changed items
+        # are touched, and readers see all of them or none
+        with self.lock:
+            for item_id in changes["removed"]:
+                self.remove_item(item_id)
+            for item_id in changes["added"] + changes["modified"]:
+                self.add_item(item_data_dict[item_id])
+
+    # ------------------------------------------------------------------------
+    # queries
+    # ------------------------------------------------------------------------
+
+    # every query hands back a new list, so it is safe to use after the
+    # lock is let go
+
+    def items_by_type(self, item_type):
+        with self.lock:
+            return self.sorted_items(self.by_type.get(item_type, ()))
+
+    def items_with_stat(self, stat_name):
+        with self.lock:
+            return self.sorted_items(self.by_stat.get(stat_name, ()))
+
+    def items_in_cost_range(self, min_cost=None, max_cost=None, item_type=None):
+        # both ends inclusive, results come back cheapest first
+        with self.lock:
+            start = 0 if min_cost is None else bisect_left(self.costs, min_cost)
+            end = len(self.costs) if max_cost is None else bisect_right(self.costs, max_cost)
+
+            results = []
+            for cost, item_id in self.cost_keys[start:end]:
+                item_dict = self.items[item_id]
+                if item_type is None or item_dict["type"] == item_type:
+                    results.append(item_dict)
+            return results
+
+    def sorted_by_cost(self):
+        with self.lock:
+            return [self.items[item_id] for cost, item_id in self.cost_keys]
+
+    def sorted_items(self, item_ids):
+        with self.lock:
+            return sorted((self.items[item_id] for item_id in item_ids),
+                          key=lambda item_dict: (item_dict["cost"], item_dict["item_id"]))
+
+    def __len__(self):
+        return len(self.items)
+
+def discard_from(buckets, key, item_id):
+    bucket = buckets.get(key)
+    if bucket is not None:
+        bucket.discard(item_id)
+        if not bucket:
+            del buckets[key]
@@ -16,6 +16,9 @@ import inventory_system
 import quest_handler
 import combat_system
 import game_data
+import data_watcher
+import id_registry
+import item_catalog
 from custom_exceptions import *
 
 # ============================================================================
@@ -25,7 +28,9 @@ from custom_exceptions import *
 current_character = None
 all_quests = {}
 all_items = {}
+item_index = item_catalog.ItemIndex()
 game_running = False
+game_data_watcher = None
 
 # ============================================================================
 # MAIN MENU
@@ -244,20 +249,21 @@ def explore():
     input("Press Enter to continue...")
 
 def shop():
-    global current_character, all_items
+    global current_character, all_items, item_index
     while True:
         print("\n=== Trading Post ===")
         print(f"Your Gold: {current_character['gold']}")
         print("Items for Sale:")
 
-        for item_name, item_info in all_items.items():
-            print(f"- {item_name}: {item_info['cost']} gold")
+        for item_info in item_index.sorted_by_cost():
+            print(f"- {item_info['item_id']}: {item_info['cost']} gold")
 
         print("1. Buy Item")
         print("2. Sell Item")
         print("3. Leave Shop")
+        print("4. Filter Items")
         
-        answer = input("Choose (1-3): ").strip()
+        answer = input("Choose (1-4): ").strip()
         
         if answer == '1':
             item_id = input("Enter item name to buy: ").strip()
@@ -296,9 +302,39 @@ def shop():
 
         elif answer == '3':
             break
+        elif answer == '4':
+            filter_shop_items()
         else:
             print("Invalid selection.")
 
+def filter_shop_items():
+    global item_index
+
+    item_type = input("Type (weapon/armor/consumable, blank for any): ").strip().lower()
+    stat_name = input("Boosts stat (blank for any): ").strip().lower()
+    max_cost = input("Max gold (blank for any): ").strip()
+
+    if item_type and item_type not in ("weapon", "armor", "consumable"):
+        print("Unknown item type.")
+        return
+    if max_cost and not max_cost.isdigit():
+        print("Enter a number for the price.")
+        return
+
+    matches = item_index.items_in_cost_range(
+        max_cost=int(max_cost) if max_cost else None,
+        item_type=item_type or None
+    )
+    if stat_name:
+        boosting = {item_info['item_id'] for item_info in item_index.items_with_stat(stat_name)}
+        matches = [item_info for item_info in matches if item_info['item_id'] in boosting]
+
+    if not matches:
+        print("Nothing matches that.")
+        return
+    for item_info in matches:
+        print(f"- {item_info['item_id']}: {item_info['cost']} gold ({item_info['type']}, {item_info['effect']})")
+
 # ============================================================================
 # HELPER FUNCTIONS
 # ============================================================================
@@ -319,7 +355,7 @@ def save_game():
         print("An I/O error occurred while saving.")
 
 def load_game_data():
-    global all_quests, all_items
+    global all_quests, all_items, item_index
 
     try:
         all_quests = game_data.load_quests() 
@@ -335,6 +371,41 @@ def load_game_data():
         print(f"Error reading game data: {e}")
         raise
 
+    # catalog ids get the low interned numbers
+    id_registry.register_catalog(all_quests, all_items)
+    item_index = item_catalog.ItemIndex(all_items)
+
+def start_data_watcher(interval=2.0):
+    global game_data_watcher
+
+    # picks up edits to the data files without restarting the game
+    game_data_watcher = data_watcher.DataWatcher(on_change=apply_data_changes)
+    apply_data_changes(game_data_watcher, None)
+    game_data_watcher.start(interval)
+    return game_data_watcher
+
+def apply_data_changes(watcher, changes):
+    global all_quests, all_items, item_index
+
+    # the watcher hands over new dicts so this swap is all or nothing
+    all_quests = watcher.quests
+    all_items = watcher.items
+    id_registry.register_catalog(all_quests, all_items)
+
+    # only the edited items are redone, under the index's lock so a
+    # shop() reading it never sees a half-applied reload
+    if changes is None:
+        item_index = item_catalog.ItemIndex(all_items)
+    else:
+        item_index.apply_changes(all_items, changes["items"])
+
+def stop_data_watcher():
+    global game_data_watcher
+
+    if game_data_watcher is not None:
+        game_data_watcher.stop()
+        game_data_watcher = None
+
 def handle_character_death():
     global current_character, game_running
 
@@ -351,7 +422,7 @@ def handle_character_death():
                 game_running = False
                 return
 
-            current_character['gold'] -= 50
+            character_manager.add_gold(current_character, -50)
 
             try:
                 character_manager.revive_character(current_character, cost=50)
@@ -393,6 +464,9 @@ def main():
         print(f"Data error: {e}")
         print("Check your data files.")
         return
+
+    # designer edits to the data files show up while the game runs
+    start_data_watcher()
     
     while True:
         choice = main_menu()
@@ -403,6 +477,7 @@ def main():
             load_game()
         elif choice == 3:
             print("\nExiting Madison's Game.")
+            stop_data_watcher()
             break
         else:
             print("Invalid option.")
@@ -0,0 +1,234 @@
+"""
+COMP 163 - Project 3: Quest Chronicles
+Population Store Module
+
+This module holds a whole world's worth of characters column by column:
+one int64 array per numeric stat instead of one dict per character. The
+batch operations walk those columns directly and behave like calling
+heal_character/add_gold/gain_experience/revive_character on every row.
+"""
+
+from array import array
+from collections.abc import MutableMapping
+
+from character_manager import levels_gained
+from custom_exceptions import CharacterNotFoundError
+from inventory import Inventory
+
+NUMERIC_FIELDS = ("level", "health", "max_health", "strength", "magic", "experience", "gold")
+OBJECT_FIELDS = ("name", "class", "inventory", "active_quests", "completed_quests",
+                 "equipped_weapon", "equipped_armor")
+FIELDS = ("name", "class") + NUMERIC_FIELDS + OBJECT_FIELDS[2:]
+LIST_FIELDS = ("inventory", "active_quests", "completed_quests")
+
+# ============================================================================
+# POPULATION STORE
+# ============================================================================
+
+class PopulationStore:
+    """
+    Characters as columns. Rows are numbered in the order characters were
+    added; `rows` arguments take a list of row numbers and default to
+    everyone. character(row) builds a plain dict copy, view(row) gives a
+    live dict-like window onto the columns.
+    """
+
+    def __init__(self, characters=()):
+        self.columns = {field: array("q") for field in NUMERIC_FIELDS}
+        self.objects = {field: [] for field in OBJECT_FIELDS}
+        self.rows_by_name = {}
+        self.extend(characters)
+
+    def __len__(self):
+        return len(self.objects["name"])
+
+    def add(self, character):
+        row = len(self)
+        for field in NUMERIC_FIELDS:
+            self.columns[field].append(character[field])
+        for field in OBJECT_FIELDS:
+            value = character[field]
+            if field in LIST_FIELDS:
+                value = copy_list(value)
+            self.objects[field].append(value)
+        self.rows_by_name[character["name"]] = row
+        return row
+
+    def extend(self, characters):
+        for character in characters:
+            self.add(character)
+
+    def row(self, character_name):
+        if character_name not in self.rows_by_name:
+            raise CharacterNotFoundError(f"{character_name} not found.")
+        return self.rows_by_name[character_name]
+
+    def character(self, row):
+        # a detached dict, same shape create_character makes
+        character = {}
+        for field in FIELDS:
+            value = self.get_value(row, field)
+            if isinstance(value, list):
+                value = copy_list(value)
+            character[field] = value
+        return character
+
+    def characters(self):
+        return [self.character(row) for row in range(len(self))]
+
+    def view(self, row):
+        return CharacterView(self, row)
+
+    def get_value(self, row, field):
+        if field in self.columns:
+            return self.columns[field][row]
+        return self.objects[field][row]
+
+    def set_value(self, row, field, value):
+        if field in self.columns:
+            self.columns[field][row] = value
+        elif field == "name":
+            del self.rows_by_name[self.objects["name"][row]]
+            self.objects["name"][row] = value
+            self.rows_by_name[value] = row
+        else:
+            self.objects[field][row] = value
+
+    def all_rows(self, rows):
+        return range(len(self)) if rows is None else rows
+
+    # ------------------------------------------------------------------------
+    # batch operations
+    # ------------------------------------------------------------------------
+
+    def heal(self, amount, rows=None):
+        # heal_character on each row, returns the total amount healed
+        health = self.columns["health"]
+        max_health = self.columns["max_health"]
+        if rows is None:
+            before = sum(health)
+            health[:] = array("q", [h + amount if h + amount <= m else m
+                                    for h, m in zip(health, max_health)])
+            return sum(health) - before
+
+        healed = 0
+        for row in rows:
+            h = health[row]
+            new = h + amount if h + amount <= max_health[row] else max_health[row]
+            health[row] = new
+            healed += new - h
+        return healed
+
+    def add_gold(self, amount, rows=None):
+        # like add_gold the gold is added first; rows that end up negative
+        # are reported in one ValueError afterwards
+        gold = self.columns["gold"]
+        if rows is None:
+            gold[:] = array("q", [g + amount for g in gold])
+            broke = [row for row, g in enumerate(gold) if g < 0]
+        else:
+            broke = []
+            for row in rows:
+                gold[row] += amount
+                if gold[row] < 0:
+                    broke.append(row)
+        if broke:
+            raise ValueError(f"How poor can you possibly get? ({len(broke)} characters below 0 gold)")
+        return True
+
+    def gain_experience(self, xp_amount, rows=None):
+        # gain_experience on each living row. dead rows get nothing (the
+        # single version raises CharacterDeadError) and are returned
+        health = self.columns["health"]
+        level = self.columns["level"]
+        experience = self.columns["experience"]
+        max_health = self.columns["max_health"]
+        strength = self.columns["strength"]
+        magic = self.columns["magic"]
+
+        dead = []
+        for row in self.all_rows(rows):
+            if health[row] <= 0:
+                dead.append(row)
+                continue
+            start = level[row]
+            xp = experience[row] + xp_amount
+            levels = levels_gained(start, xp)
+            if levels is None:
+                # negative level, step it like the loop does
+                levels = 0
+                while xp >= (start + levels) * 100:
+                    xp -= (start + levels) * 100
+                    levels += 1
+            else:
+                xp -= 100 * (levels * start + levels * (levels - 1) // 2)
+            experience[row] = xp
+            if levels:
+                level[row] = start + levels
+                max_health[row] += 10 * levels
+                strength[row] += 2 * levels
+                magic[row] += 2 * levels
+                health[row] = max_health[row]
+        return dead
+
+    def revive(self, rows=None):
+        # revive_character on each row, returns how many came back
+        health = self.columns["health"]
+        max_health = self.columns["max_health"]
+        revived = 0
+        for row in self.dead_rows(rows):
+            health[row] = max_health[row] // 2
+            revived += 1
+        return revived
+
+    def dead_rows(self, rows=None):
+        # is_character_dead, as a list of rows
+        health = self.columns["health"]
+        if rows is None:
+            return [row for row, h in enumerate(health) if h <= 0]
+        return [row for row in rows if health[row] <= 0]
+
+def copy_list(values):
+    # an Inventory keeps its type and capacity, IdLists become plain lists
+    if isinstance(values, Inventory):
+        return values.copy()
+    return list(values)
+
+# ============================================================================
+# CHARACTER VIEW
+# ============================================================================
+
+class CharacterView(MutableMapping):
+    """
+    One row of a PopulationStore that reads and writes like a character
+    dict, so the normal game functions can run on it. The id lists are
+    the store's own lists, changes to them stick.
+    """
+
+    __slots__ = ("store", "row")
+
+    def __init__(self, store, row):
+        self.store = store
+        self.row = row
+
+    def __getitem__(self, key):
+        if key not in FIELDS:
+            raise KeyError(key)
+        return self.store.get_value(self.row, key)
+
+    def __setitem__(self, key, value):
+        if key not in FIELDS:
+            raise KeyError(f"PopulationStore has no column '{key}'")
+        self.store.set_value(self.row, key, value)
+
+    def __delitem__(self, key):
+        raise TypeError("Can't delete a column from one character")
+
+    def __iter__(self):
+        return iter(FIELDS)
+
+    def __len__(self):
+        return len(FIELDS)
+
+    def __repr__(self):
+        return f"CharacterView({self.store.character(self.row)!r})"
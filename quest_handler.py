@@ -9,6 +9,7 @@ AI Usage: help from chatgpt with bug fices and code recommendations again.
 This module handles quest management, dependencies, and completion.
 """
 
+import character_events
 from custom_exceptions import (
     QuestNotFoundError,
     QuestRequirementsNotMetError,
@@ -42,6 +43,7 @@ def accept_quest(character, quest_id, quest_data_dict):
         raise QuestRequirementsNotMetError(f"'{quest_id}' is already active!")
     
     character['active_quests'].append(quest_id)
+    character_events.record_append(character, 'active_quests', quest_id)
 
     return True
 
@@ -56,12 +58,15 @@ def complete_quest(character, quest_id, quest_data_dict):
 
     character['active_quests'].remove(quest_id)
     character['completed_quests'].append(quest_id)
+    character_events.record_remove(character, 'active_quests', quest_id)
+    character_events.record_append(character, 'completed_quests', quest_id)
 
     xp_reward = quest["reward_xp"]
     gold_reward = quest["reward_gold"]
 
     character['experience'] += xp_reward
     character['gold'] += gold_reward
+    character_events.record_set(character, 'experience', 'gold')
 
     return {
         "reward_xp": xp_reward,
@@ -73,6 +78,7 @@ def abandon_quest(character, quest_id):
     if quest_id not in character['active_quests']:
         raise QuestNotActiveError(f"You dont have '{quest_id}'!")
     character['active_quests'].remove(quest_id)
+    character_events.record_remove(character, 'active_quests', quest_id)
     return True
 
 def get_active_quests(character, quest_data_dict):
@@ -0,0 +1,307 @@
+"""
+COMP 163 - Project 3: Quest Chronicles
+Save Archive Module
+
+This module packs many character saves into one file. Pass a SaveArchive
+wherever character_manager takes a save_directory. Records are binary
+saves (optionally zlib'd) appended to the file, and every append ends
+with an index block, so loading one character is a single seek + read.
+
+Layout, little endian:
+    "QCAR" | u8 version
+    then any number of blocks:
+        record bytes ...
+        index entries: u64 offset | u32 length | u8 flags | u16 name length | name
+        footer: u64 index offset | u32 entry count | u64 end of previous block | "QCAX"
+
+Each block only lists what it wrote; older blocks are reached through
+the previous-block pointer and newer entries win. repack() rewrites the
+file with one block of live records once old copies pile up.
+"""
+
+import os
+import struct
+import threading
+import zlib
+
+import save_formats
+from custom_exceptions import CharacterNotFoundError, SaveFileCorruptedError
+
+ARCHIVE_MAGIC = b"QCAR"
+ARCHIVE_VERSION = 1
+HEADER = struct.Struct("<4sB")
+ENTRY = struct.Struct("<QIBH")
+FOOTER = struct.Struct("<QIQ4s")
+FOOTER_MAGIC = b"QCAX"
+
+COMPRESSED = 1
+DELETED = 2
+
+# don't bother repacking tiny archives
+REPACK_MIN_BYTES = 64 * 1024
+
+# ============================================================================
+# SAVE ARCHIVE
+# ============================================================================
+
+class SaveArchive:
+    """
+    Many characters in one file. compress=True zlibs each record. Once
+    the file is more than repack_ratio times the size of its live
+    records it is repacked on the next write. sync=False skips the fsync
+    after each write.
+    """
+
+    def __init__(self, path="data/save_games.qca", compress=False, repack_ratio=2.0, sync=True):
+        self.path = path
+        self.compress = compress
+        self.repack_ratio = repack_ratio
+        self.sync = sync
+        self.lock = threading.Lock()
+        # name -> (offset, length, flags) of the newest live record
+        self.index = {}
+        self.live_bytes = 0
+        # where the last good block ends, the next one goes here
+        self.end = HEADER.size
+
+        if not os.path.exists(path) or os.path.getsize(path) == 0:
+            with open(path, "wb") as f:
+                f.write(HEADER.pack(ARCHIVE_MAGIC, ARCHIVE_VERSION))
+        self.file = open(path, "r+b")
+        try:
+            self.read_index()
+        except BaseException:
+            self.close()
+            raise
+
+    def close(self):
+        if self.file is not None:
+            self.file.close()
+            self.file = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+        return False
+
+    def __len__(self):
+        return len(self.index)
+
+    def __contains__(self, character_name):
+        return character_name in self.index
+
+    # ------------------------------------------------------------------------
+    # character_manager backend api
+    # ------------------------------------------------------------------------
+
+    def save_character(self, character):
+        self.write_block([(character['name'], self.encode(character))])
+        return True
+
+    def save_characters(self, characters):
+        # one append and one fsync for the whole batch
+        records = [(character['name'], self.encode(character)) for character in characters]
+        self.write_block(records)
+        return len(records)
+
+    def load_character(self, character_name):
+        # the lock keeps a repack from swapping the file mid-read
+        with self.lock:
+            entry = self.index.get(character_name)
+            if entry is None:
+                raise CharacterNotFoundError(f"{character_name} not found.")
+            offset, length, flags = entry
+            data = os.pread(self.file.fileno(), length, offset)
+        if len(data) != length:
+            raise SaveFileCorruptedError(f"{character_name}'s archive record is cut off.")
+        if flags & COMPRESSED:
+            try:
+                data = zlib.decompress(data)
+            except zlib.error:
+                raise SaveFileCorruptedError(f"{character_name}'s file is corrupted.")
+        return save_formats.decode_save(data, character_name)
+
+    def list_saved_characters(self):
+        return sorted(self.index)
+
+    def delete_character(self, character_name):
+        if character_name not in self.index:
+            raise CharacterNotFoundError(f"{character_name} not found.")
+        self.write_block([(character_name, None)])
+        return True
+
+    # ------------------------------------------------------------------------
+    # writing
+    # ------------------------------------------------------------------------
+
+    def encode(self, character):
+        data = save_formats.encode_binary(character)
+        if self.compress:
+            return zlib.compress(data)
+        return data
+
+    def write_block(self, records):
+        # records are (name, bytes), bytes None means deleted
+        flags = COMPRESSED if self.compress else 0
+        with self.lock:
+            end = self.end
+            previous = end if end > HEADER.size else 0
+            parts = []
+            entries = []
+            offset = end
+            for name, data in records:
+                if data is None:
+                    entries.append((name, 0, 0, DELETED))
+                    continue
+                parts.append(data)
+                entries.append((name, offset, len(data), flags))
+                offset += len(data)
+
+            index_offset = offset
+            for name, record_offset, length, record_flags in entries:
+                encoded = name.encode()
+                parts.append(ENTRY.pack(record_offset, length, record_flags, len(encoded)))
+                parts.append(encoded)
+            parts.append(FOOTER.pack(index_offset, len(entries), previous, FOOTER_MAGIC))
+
+            block = memoryview(b"".join(parts))
+            fd = self.file.fileno()
+            try:
+                # anything past the last good block is junk from a write
+                # that failed, it must not end up inside the chain
+                if os.fstat(fd).st_size != end:
+                    os.ftruncate(fd, end)
+                # unbuffered, so a failed write can't leave bytes behind
+                # in a buffer that gets flushed later
+                written = 0
+                while written < len(block):
+                    written += os.pwrite(fd, block[written:], end + written)
+                if self.sync:
+                    os.fsync(fd)
+            except BaseException:
+                # don't leave half a block behind for the next append
+                os.ftruncate(fd, end)
+                raise
+            self.end = end + len(block)
+
+            for name, record_offset, length, record_flags in entries:
+                self.apply_entry(name, record_offset, length, record_flags)
+
+            if self.needs_repack():
+                self.repack_locked()
+
+    def apply_entry(self, name, offset, length, flags):
+        old = self.index.pop(name, None)
+        if old is not None:
+            self.live_bytes -= old[1]
+        if not flags & DELETED:
+            self.index[name] = (offset, length, flags)
+            self.live_bytes += length
+
+    def needs_repack(self):
+        size = self.file.seek(0, os.SEEK_END)
+        return size > REPACK_MIN_BYTES and size > self.repack_ratio * max(self.live_bytes, 1)
+
+    def repack(self):
+        with self.lock:
+            self.repack_locked()
+
+    def repack_locked(self):
+        # copy live records into a fresh single-block file and swap it in
+        temp_path = f"{self.path}.{os.getpid()}.tmp"
+        fd = self.file.fileno()
+        index = {}
+        with open(temp_path, "wb") as out:
+            out.write(HEADER.pack(ARCHIVE_MAGIC, ARCHIVE_VERSION))
+            offset = HEADER.size
+            for name, (old_offset, length, flags) in self.index.items():
+                out.write(os.pread(fd, length, old_offset))
+                index[name] = (offset, length, flags)
+                offset += length
+            index_offset = offset
+            for name, (record_offset, length, flags) in index.items():
+                encoded = name.encode()
+                out.write(ENTRY.pack(record_offset, length, flags, len(encoded)))
+                out.write(encoded)
+            out.write(FOOTER.pack(index_offset, len(index), 0, FOOTER_MAGIC))
+            out.flush()
+            os.fsync(out.fileno())
+        os.replace(temp_path, self.path)
+        self.file.close()
+        self.file = open(self.path, "r+b")
+        self.index = index
+        self.end = self.file.seek(0, os.SEEK_END)
+
+    # ------------------------------------------------------------------------
+    # reading the index
+    # ------------------------------------------------------------------------
+
+    def read_index(self):
+        f = self.file
+        header = f.read(HEADER.size)
+        if len(header) != HEADER.size or HEADER.unpack(header)[0] != ARCHIVE_MAGIC:
+            raise SaveFileCorruptedError(f"{self.path} is not a save archive.")
+        if HEADER.unpack(header)[1] != ARCHIVE_VERSION:
+            raise SaveFileCorruptedError(f"{self.path} uses archive version {HEADER.unpack(header)[1]}.")
+
+        end = self.recover_end()
+        self.end = max(end, HEADER.size)
+        seen = {}
+        # newest block first, so the first entry seen for a name is current
+        while end:
+            if not self.footer_ok(end):
+                # only the newest footer is checked by recover_end, an older
+                # one this broken means the chain points into junk
+                raise SaveFileCorruptedError(f"{self.path} has a broken block ending at {end}.")
+            index_offset, count, previous, _ = FOOTER.unpack(os.pread(f.fileno(), FOOTER.size, end - FOOTER.size))
+            data = os.pread(f.fileno(), end - FOOTER.size - index_offset, index_offset)
+            entries = []
+            position = 0
+            try:
+                for _ in range(count):
+                    offset, length, flags, name_length = ENTRY.unpack_from(data, position)
+                    position += ENTRY.size
+                    name = data[position:position + name_length].decode()
+                    position += name_length
+                    entries.append((name, offset, length, flags))
+            except (struct.error, UnicodeDecodeError):
+                raise SaveFileCorruptedError(f"{self.path} has a broken index ending at {end}.")
+            for name, offset, length, flags in reversed(entries):
+                if name not in seen:
+                    seen[name] = (offset, length, flags)
+            end = previous
+
+        for name, (offset, length, flags) in seen.items():
+            if not flags & DELETED:
+                self.index[name] = (offset, length, flags)
+                self.live_bytes += length
+
+    def recover_end(self):
+        # a write cut off by a crash leaves junk after the last good footer,
+        # trim back to it. returns where the newest block ends (0 if none)
+        size = self.file.seek(0, os.SEEK_END)
+        if size <= HEADER.size:
+            return 0
+        tail = size
+        while tail > HEADER.size:
+            if self.footer_ok(tail):
+                if tail != size:
+                    self.file.truncate(tail)
+                return tail
+            data = os.pread(self.file.fileno(), tail - HEADER.size, HEADER.size)
+            found = data.rfind(FOOTER_MAGIC, 0, len(data) - 1)
+            if found == -1:
+                break
+            tail = HEADER.size + found + len(FOOTER_MAGIC)
+        self.file.truncate(HEADER.size)
+        return 0
+
+    def footer_ok(self, end):
+        if end - FOOTER.size < HEADER.size:
+            return False
+        index_offset, count, previous, magic = FOOTER.unpack(
+            os.pread(self.file.fileno(), FOOTER.size, end - FOOTER.size))
+        return (magic == FOOTER_MAGIC and HEADER.size <= index_offset <= end - FOOTER.size
+                and previous < end and count * ENTRY.size <= end - FOOTER.size - index_offset)
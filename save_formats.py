@@ -0,0 +1,262 @@
+"""
+COMP 163 - Project 3: Quest Chronicles
+Save Formats Module
+
+This module turns a character dict into save file bytes and back. There
+is the original "KEY: value" text format and a compact versioned binary
+format. decode_save tells them apart by the binary magic header, so old
+text saves keep loading.
+
+Both formats are written to the same <name>_save.txt path, so a binary
+save keeps that .txt name even though it isn't text. Going by the magic
+header instead of the extension means switching a character's format
+never leaves two save files behind.
+
+Text stays the default. Binary saves are a bit smaller and load faster,
+but writing one costs a little more than text because every string gets
+checked for NULs, so it only pays off for saves that are read more often
+than they are written.
+"""
+
+import struct
+
+from custom_exceptions import (
+    SaveFileCorruptedError,
+    InvalidSaveDataError
+)
+from inventory import Inventory
+
+TEXT_FORMAT = "text"
+BINARY_FORMAT = "binary"
+SAVE_FORMATS = (TEXT_FORMAT, BINARY_FORMAT)
+
+# binary layout, everything little endian:
+#   magic "QCSV" | u8 version
+#   7 x i64: level, experience, health, max_health, strength, magic, gold
+#   i64 inventory capacity, -1 for the default
+#   3 x u32: inventory, active_quests and completed_quests counts
+#   u32 byte length | utf-8 strings joined by NUL: name, class,
+#   equipped_weapon, equipped_armor, then the three lists
+# the whole header is one struct pack and every string is one join.
+# versions 1 and 2 wrote a counted array (u32 count | u32 byte length |
+# NUL-joined strings) per list, and version 1 had no capacity
+BINARY_MAGIC = b"QCSV"
+BINARY_VERSION = 3
+HEADER = struct.Struct("<4sB")
+LAYOUT = struct.Struct("<4sB8q4I")
+NUMBERS = struct.Struct("<7q")
+CAPACITY = struct.Struct("<q")
+ARRAY = struct.Struct("<II")
+SEPARATOR = "\0"
+
+LIST_FIELDS = ("inventory", "active_quests", "completed_quests")
+
+# ============================================================================
+# FORMAT DISPATCH
+# ============================================================================
+
+def encode_save(character, save_format=TEXT_FORMAT):
+    if save_format == TEXT_FORMAT:
+        return encode_text(character)
+    if save_format == BINARY_FORMAT:
+        return encode_binary(character)
+    raise ValueError(f"Unknown save format '{save_format}'")
+
+def decode_save(data, character_name):
+    if data.startswith(BINARY_MAGIC):
+        return decode_binary(data, character_name)
+    try:
+        text = data.decode()
+    except UnicodeDecodeError:
+        raise SaveFileCorruptedError(f"{character_name}'s file is corrupted.")
+    return decode_text(text, character_name)
+
+def detect_format(data):
+    return BINARY_FORMAT if data.startswith(BINARY_MAGIC) else TEXT_FORMAT
+
+# ============================================================================
+# TEXT FORMAT
+# ============================================================================
+
+def encode_text(character):
+    weapon = character['equipped_weapon'] if character['equipped_weapon'] else ''
+    armor = character['equipped_armor'] if character['equipped_armor'] is not None else ''
+    text = (
+        f"NAME: {character['name']}\n"
+        f"CLASS: {character['class']}\n"
+        f"LEVEL: {character['level']}\n"
+        f"EXPERIENCE: {character['experience']}\n"
+        f"HEALTH: {character['health']}\n"
+        f"MAX_HEALTH: {character['max_health']}\n"
+        f"STRENGTH: {character['strength']}\n"
+        f"MAGIC: {character['magic']}\n"
+        f"GOLD: {character['gold']}\n"
+        f"INVENTORY: {','.join(character['inventory'])}\n"
+        f"ACTIVE_QUESTS: {','.join(character['active_quests'])}\n"
+        f"COMPLETED_QUESTS: {','.join(character['completed_quests'])}\n"
+        f"EQUIPPED_WEAPON: {weapon}\n"
+        f"EQUIPPED_ARMOR: {armor}\n"
+    )
+    # only written for a non-default capacity, so older readers still cope
+    capacity = inventory_capacity(character['inventory'])
+    if capacity is not None:
+        text += f"INVENTORY_CAPACITY: {capacity}\n"
+    return text.encode()
+
+def inventory_capacity(inventory):
+    return getattr(inventory, "capacity", None)
+
+def decode_text(text, character_name):
+    character = {}
+
+    for line in text.splitlines():
+        line = line.strip()
+        if not line:
+            continue
+        if ":" not in line:
+            raise InvalidSaveDataError(f"Invalid data format in {character_name}'s file.")
+
+        parts = line.split(": ", 1)
+        if len(parts) == 1:
+            parts = line.split(":", 1)
+        if len(parts) != 2:
+            raise InvalidSaveDataError(f"Invalid data format in {character_name}'s file.")
+
+        character[parts[0]] = parts[1].strip()
+
+    capacity = character.get("INVENTORY_CAPACITY")
+    try:
+        return {
+            "name": character["NAME"],
+            "class": character["CLASS"],
+            "level": int(character["LEVEL"]),
+            "health": int(character["HEALTH"]),
+            "max_health": int(character["MAX_HEALTH"]),
+            "strength": int(character["STRENGTH"]),
+            "magic": int(character["MAGIC"]),
+            "experience": int(character["EXPERIENCE"]),
+            "gold": int(character["GOLD"]),
+            "inventory": Inventory(split_ids(character["INVENTORY"]),
+                                   None if capacity is None else int(capacity)),
+            "active_quests": split_ids(character["ACTIVE_QUESTS"]),
+            "completed_quests": split_ids(character["COMPLETED_QUESTS"]),
+            "equipped_weapon": character.get("EQUIPPED_WEAPON") or None,
+            "equipped_armor": character.get("EQUIPPED_ARMOR", "").strip() or None
+        }
+    except KeyError as e:
+        raise InvalidSaveDataError(f"{character_name}'s file is missing {e.args[0]}.")
+    except ValueError:
+        raise InvalidSaveDataError(f"Invalid number in {character_name}'s file.")
+
+def split_ids(value):
+    return value.split(",") if value.strip() else []
+
+# ============================================================================
+# BINARY FORMAT
+# ============================================================================
+
+def encode_binary(character):
+    inventory = character['inventory']
+    active_quests = character['active_quests']
+    completed_quests = character['completed_quests']
+    values = [character['name'], character['class'],
+              character['equipped_weapon'] or '', character['equipped_armor'] or '',
+              *inventory, *active_quests, *completed_quests]
+    joined = SEPARATOR.join(values)
+    # a NUL inside a value would split into extra entries on load
+    if joined.count(SEPARATOR) != len(values) - 1:
+        raise InvalidSaveDataError("Save values can't contain NUL characters.")
+    encoded = joined.encode()
+
+    capacity = inventory_capacity(inventory)
+    try:
+        header = LAYOUT.pack(
+            BINARY_MAGIC, BINARY_VERSION,
+            character['level'], character['experience'], character['health'],
+            character['max_health'], character['strength'], character['magic'],
+            character['gold'], -1 if capacity is None else capacity,
+            len(inventory), len(active_quests), len(completed_quests), len(encoded)
+        )
+    except struct.error:
+        # not an int, or too big for an i64
+        raise InvalidSaveDataError(f"{character['name']}'s stats don't fit the binary save format.")
+    return header + encoded
+
+def decode_binary(data, character_name):
+    try:
+        header_magic, version = HEADER.unpack_from(data, 0)
+        if version == BINARY_VERSION:
+            numbers, capacity, arrays = read_layout(data)
+        elif version in (1, 2):
+            numbers, capacity, arrays = read_arrays(data, version)
+        else:
+            raise InvalidSaveDataError(
+                f"{character_name}'s save uses binary version {version}, expected {BINARY_VERSION}."
+            )
+    except (struct.error, UnicodeDecodeError):
+        raise SaveFileCorruptedError(f"{character_name}'s file is corrupted.")
+
+    strings = arrays[0]
+    level, experience, health, max_health, strength, magic, gold = numbers
+    return {
+        "name": strings[0],
+        "class": strings[1],
+        "level": level,
+        "health": health,
+        "max_health": max_health,
+        "strength": strength,
+        "magic": magic,
+        "experience": experience,
+        "gold": gold,
+        "inventory": Inventory(arrays[1], None if capacity < 0 else capacity),
+        "active_quests": arrays[2],
+        "completed_quests": arrays[3],
+        "equipped_weapon": strings[2] or None,
+        "equipped_armor": strings[3] or None
+    }
+
+def read_layout(data):
+    fields = LAYOUT.unpack_from(data, 0)
+    numbers, capacity = fields[2:9], fields[9]
+    inventory_count, active_count, completed_count, length = fields[10:]
+    if LAYOUT.size + length != len(data):
+        raise struct.error("string block doesn't end with the save")
+    values = data[LAYOUT.size:].decode().split(SEPARATOR)
+    if len(values) != 4 + inventory_count + active_count + completed_count:
+        raise struct.error("string counts don't match the string block")
+    active_start = 4 + inventory_count
+    completed_start = active_start + active_count
+    arrays = [values[:4], values[4:active_start],
+              values[active_start:completed_start], values[completed_start:]]
+    return numbers, capacity, arrays
+
+def read_arrays(data, version):
+    # versions 1 and 2, one counted array after another
+    offset = HEADER.size
+    numbers = NUMBERS.unpack_from(data, offset)
+    offset += NUMBERS.size
+    capacity = -1
+    if version >= 2:
+        capacity, = CAPACITY.unpack_from(data, offset)
+        offset += CAPACITY.size
+
+    arrays = []
+    for _ in range(1 + len(LIST_FIELDS)):
+        values, offset = read_array(data, offset)
+        arrays.append(values)
+    if offset != len(data) or len(arrays[0]) != 4:
+        raise struct.error("counted arrays don't fill the save")
+    return numbers, capacity, arrays
+
+def read_array(data, offset):
+    count, length = ARRAY.unpack_from(data, offset)
+    offset += ARRAY.size
+    end = offset + length
+    if end > len(data):
+        raise struct.error("array runs past the end of the save")
+    if count == 0:
+        return [], end
+    values = data[offset:end].decode().split(SEPARATOR)
+    if len(values) != count:
+        raise struct.error("array count doesn't match its contents")
+    return values, end
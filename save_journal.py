@@ -0,0 +1,244 @@
+"""
+COMP 163 - Project 3: Quest Chronicles
+Save Journal Module
+
+This module adds an append-only journal next to a character's save. While
+a character is tracked, every change made through the game APIs appends
+one short line instead of rewriting the save, and load_character replays
+the journal on top of the save. Once a journal gets big it is folded into
+a fresh save in the background.
+
+Journal file, <name>_journal.txt next to <name>_save.txt:
+    J <tab> id of the save bytes it applies to
+    time_ms <tab> S|A|R <tab> key <tab> json value     (set/append/remove)
+
+A journal whose id doesn't match the current save has already been folded
+into it (or was left behind by a full save) and is ignored.
+"""
+
+import hashlib
+import json
+import os
+import threading
+import time
+
+import character_events
+import character_manager
+import save_formats
+import save_manifest
+from custom_exceptions import SaveFileCorruptedError
+from inventory import Inventory
+
+JOURNAL_SUFFIX = "_journal.txt"
+OP_CODES = {"set": "S", "append": "A", "remove": "R"}
+
+# ============================================================================
+# JOURNAL FILES
+# ============================================================================
+
+def journal_path(character_name, save_directory):
+    save_path = save_manifest.get_save_path(character_name, save_directory)
+    return save_path[:-len(save_manifest.SAVE_SUFFIX)] + JOURNAL_SUFFIX
+
+def snapshot_id(data):
+    return hashlib.blake2b(data, digest_size=16).hexdigest()
+
+def reset_journal(path, data):
+    # truncated in place, not replaced, so an open append handle keeps
+    # writing to the live file
+    with open(path, "w", encoding="utf-8") as f:
+        f.write(f"J\t{snapshot_id(data)}\n")
+
+def reset_if_exists(character_name, save_directory, data):
+    # a full save makes any old journal stale, start it over on the new save
+    path = journal_path(character_name, save_directory)
+    if os.path.exists(path):
+        reset_journal(path, data)
+
+def delete_journal(character_name, save_directory):
+    try:
+        os.remove(journal_path(character_name, save_directory))
+    except FileNotFoundError:
+        pass
+
+def format_record(op, key, value):
+    # default=list turns IdLists into plain json lists
+    return f"{time.time_ns() // 1_000_000}\t{OP_CODES[op]}\t{key}\t{json.dumps(value, default=list)}\n"
+
+def replay_journal(character, character_name, save_directory, data, until=None):
+    # applies the journal for save bytes `data` to the decoded character.
+    # until is a time.time() value, later records are skipped
+    try:
+        f = open(journal_path(character_name, save_directory), "r", encoding="utf-8")
+    except FileNotFoundError:
+        return 0
+
+    until_ms = None if until is None else int(until * 1000)
+    applied = 0
+    with f:
+        if f.readline() != f"J\t{snapshot_id(data)}\n":
+            return 0
+        try:
+            for line in f:
+                # a line without its newline is a write cut off by a crash
+                if not line.endswith("\n"):
+                    break
+                stamp, op, key, value = line[:-1].split("\t", 3)
+                if until_ms is not None and int(stamp) > until_ms:
+                    break
+                apply_record(character, op, key, json.loads(value))
+                applied += 1
+        except (ValueError, KeyError, AttributeError):
+            raise SaveFileCorruptedError(f"{character_name}'s journal is corrupted.")
+    return applied
+
+def apply_record(character, op, key, value):
+    if op == "S":
+        current = character.get(key)
+        # json gives back a list, keep an Inventory an Inventory
+        if isinstance(current, Inventory):
+            value = Inventory(value, current.capacity)
+        character[key] = value
+    elif op == "A":
+        character[key].append(value)
+    elif op == "R":
+        character[key].remove(value)
+    else:
+        raise ValueError(f"Unknown journal op '{op}'")
+
+# ============================================================================
+# CHARACTER JOURNAL
+# ============================================================================
+
+class CharacterJournal:
+    """
+    Journals changes to tracked characters. track() writes one full save
+    and then every mutation through character_manager, inventory_system
+    or quest_handler appends a record. A journal past compact_bytes is
+    folded into a new save by a background thread. sync=True fsyncs every
+    record instead of leaving it to the OS.
+    """
+
+    def __init__(self, save_directory="data/save_games", compact_bytes=64 * 1024,
+                 save_format="text", sync=False):
+        character_manager.require_save_directory(save_directory, "CharacterJournal")
+        self.save_directory = save_directory
+        self.compact_bytes = compact_bytes
+        self.save_format = save_format
+        self.sync = sync
+        self.tracked = {}
+        self.files = {}
+        self.locks = {}
+        self.lock = threading.Lock()
+        self.pending = set()
+        self.condition = threading.Condition()
+        self.closed = False
+        self.error = None
+        self.records_written = 0
+        self.compactions = 0
+        self.thread = threading.Thread(target=self.run, daemon=True)
+        self.thread.start()
+        character_events.register_mutation_hook(self.on_mutation)
+
+    def name_lock(self, character_name):
+        with self.lock:
+            if character_name not in self.locks:
+                self.locks[character_name] = threading.Lock()
+            return self.locks[character_name]
+
+    def track(self, character):
+        name = character['name']
+        with self.name_lock(name):
+            path = journal_path(name, self.save_directory)
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            # the file has to exist first so the snapshot save resets it
+            self.files[name] = open(path, "a", encoding="utf-8")
+            self.write_snapshot(name, character)
+            self.tracked[id(character)] = character
+        return True
+
+    def untrack(self, character):
+        name = character['name']
+        with self.name_lock(name):
+            self.tracked.pop(id(character), None)
+            f = self.files.pop(name, None)
+            if f is not None:
+                f.close()
+
+    def on_mutation(self, character, op, key, value):
+        if id(character) not in self.tracked:
+            return
+        name = character['name']
+        line = format_record(op, key, value)
+        with self.name_lock(name):
+            f = self.files.get(name)
+            if f is None:
+                return
+            f.write(line)
+            f.flush()
+            if self.sync:
+                os.fsync(f.fileno())
+            size = f.tell()
+            self.records_written += 1
+        if size > self.compact_bytes:
+            with self.condition:
+                self.pending.add(name)
+                self.condition.notify()
+
+    def write_snapshot(self, character_name, character):
+        # write_save_data resets the journal onto the new save
+        data = save_formats.encode_save(character, self.save_format)
+        character_manager.write_save_data(character_name, data, self.save_directory,
+                                          (character['class'], character['level']))
+
+    def compact(self, character_name):
+        # rebuilt from save + journal on disk, not from the live character,
+        # so a change that hasn't been journaled yet can't be counted twice
+        with self.name_lock(character_name):
+            character = character_manager.load_character(character_name, self.save_directory)
+            self.write_snapshot(character_name, character)
+            self.compactions += 1
+
+    def run(self):
+        while True:
+            with self.condition:
+                while not self.closed and not self.pending:
+                    self.condition.wait()
+                if self.closed:
+                    return
+                name = self.pending.pop()
+            try:
+                self.compact(name)
+            except Exception as e:
+                # surfaced on close()
+                self.error = e
+
+    def close(self):
+        character_events.unregister_mutation_hook(self.on_mutation)
+        with self.condition:
+            self.closed = True
+            self.condition.notify_all()
+        self.thread.join()
+        # fold whatever was still waiting for the background thread
+        for name in list(self.pending):
+            try:
+                self.compact(name)
+            except Exception as e:
+                self.error = e
+        self.pending.clear()
+        with self.lock:
+            for f in self.files.values():
+                f.close()
+            self.files.clear()
+            self.tracked.clear()
+        if self.error is not None:
+            error, self.error = self.error, None
+            raise error
+        return True
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+        return False
@@ -0,0 +1,409 @@
+"""
+COMP 163 - Project 3: Quest Chronicles
+Save Manifest Module
+
+This module keeps a small index of every save in a save directory (name,
+class, level, last modified) so listing saves with their class and level
+doesn't mean opening every save file. It also handles the optional
+hash-sharded layout where saves live in 256 subdirectories instead of one
+flat folder.
+
+The manifest is built the first time something needs class/level (or on
+rebuild_manifest). Listing just the names is a plain os.listdir until the
+manifest is loaded in memory, because reading the manifest off disk costs
+more than that listdir.
+Once it exists, every read checks the mtime of the save folder and each
+shard folder. Only a folder that changed behind our back gets rescanned,
+and only saves whose mtime moved get decoded again.
+"""
+
+import hashlib
+import os
+import threading
+import time
+
+import save_formats
+
+MANIFEST_NAME = "_manifest.txt"
+SHARD_MARKER = "_sharded"
+SAVE_SUFFIX = "_save.txt"
+
+# rewrite the manifest once it is mostly dead lines
+COMPACT_MIN_LINES = 1000
+# a process that only saves never reads the manifest in, so appending
+# loads it once the file is this big and it can be compacted from then on
+COMPACT_MIN_BYTES = 64 * 1024
+
+# a folder mtime this fresh can still hide a change made later in the same
+# clock tick, so it isn't trusted yet and the folder is checked again.
+# filesystems with whole-second mtimes get a longer wait
+RACY_NS = 20_000_000
+RACY_SECONDS_NS = 2_000_000_000
+
+SORT_KEYS = ("name", "class", "level", "modified")
+
+manifest_lock = threading.Lock()
+# save_directory -> {"entries": {...}, "folders": {folder: mtime}, "size":
+# bytes read, "mtime": manifest mtime, "lines": line count,
+# "orders": {sort key: sorted entry list}}
+manifest_cache = {}
+
+# ============================================================================
+# SAVE PATHS AND SHARDING
+# ============================================================================
+
+def is_sharded(save_directory):
+    return os.path.exists(os.path.join(save_directory, SHARD_MARKER))
+
+def shard_name(character_name):
+    return hashlib.md5(character_name.encode()).hexdigest()[:2]
+
+def get_save_path(character_name, save_directory):
+    filename = f"{character_name}{SAVE_SUFFIX}"
+    if is_sharded(save_directory):
+        return os.path.join(save_directory, shard_name(character_name), filename)
+    return os.path.join(save_directory, filename)
+
+def enable_sharding(save_directory):
+    # moves every flat save into its shard folder, safe to run twice
+    os.makedirs(save_directory, exist_ok=True)
+    moved = 0
+    for filename in os.listdir(save_directory):
+        if not filename.endswith(SAVE_SUFFIX):
+            continue
+        character_name = filename[:-len(SAVE_SUFFIX)]
+        shard = os.path.join(save_directory, shard_name(character_name))
+        os.makedirs(shard, exist_ok=True)
+        os.replace(os.path.join(save_directory, filename), os.path.join(shard, filename))
+        moved += 1
+    with open(os.path.join(save_directory, SHARD_MARKER), "w") as f:
+        f.write("saves are in <first two hex chars of md5(name)>/<name>_save.txt\n")
+    return moved
+
+def scan_save_names(save_directory):
+    # names only, straight from os.listdir without a stat per entry
+    try:
+        filenames = os.listdir(save_directory)
+    except FileNotFoundError:
+        return []
+    names = [filename[:-len(SAVE_SUFFIX)] for filename in filenames if filename.endswith(SAVE_SUFFIX)]
+    if SHARD_MARKER in filenames:
+        for filename in filenames:
+            if len(filename) == 2:
+                try:
+                    shard_files = os.listdir(os.path.join(save_directory, filename))
+                except NotADirectoryError:
+                    continue
+                names.extend(name[:-len(SAVE_SUFFIX)] for name in shard_files if name.endswith(SAVE_SUFFIX))
+    return names
+
+def scan_save_files(save_directory):
+    # the slow path: walk the real files. yields (character name, path)
+    if not os.path.isdir(save_directory):
+        return
+    for entry in os.scandir(save_directory):
+        if entry.is_file() and entry.name.endswith(SAVE_SUFFIX):
+            yield entry.name[:-len(SAVE_SUFFIX)], entry.path
+        elif entry.is_dir() and len(entry.name) == 2:
+            for shard_entry in os.scandir(entry.path):
+                if shard_entry.is_file() and shard_entry.name.endswith(SAVE_SUFFIX):
+                    yield shard_entry.name[:-len(SAVE_SUFFIX)], shard_entry.path
+
+# ============================================================================
+# FOLDER MTIMES
+# ============================================================================
+
+# folders are "" for the save directory itself, or a shard name
+
+def folder_of(character_name, sharded):
+    return shard_name(character_name) if sharded else ""
+
+def folder_path(save_directory, folder):
+    return os.path.join(save_directory, folder) if folder else save_directory
+
+def settled(mtime):
+    # None for an mtime too fresh to trust, see RACY_NS
+    window = RACY_SECONDS_NS if mtime % 1_000_000_000 == 0 else RACY_NS
+    return mtime if time.time_ns() - mtime >= window else None
+
+def folder_mtimes(save_directory):
+    # adding or removing a save moves the mtime of the folder it is in
+    folders = {"": settled(os.stat(save_directory).st_mtime_ns)}
+    if is_sharded(save_directory):
+        for entry in os.scandir(save_directory):
+            if entry.is_dir() and len(entry.name) == 2:
+                folders[entry.name] = settled(entry.stat().st_mtime_ns)
+    return folders
+
+def scan_folder(save_directory, folder):
+    # {character name: (path, mtime)} for one folder
+    found = {}
+    try:
+        entries = list(os.scandir(folder_path(save_directory, folder)))
+    except FileNotFoundError:
+        return found
+    for entry in entries:
+        if entry.is_file() and entry.name.endswith(SAVE_SUFFIX):
+            found[entry.name[:-len(SAVE_SUFFIX)]] = (entry.path, entry.stat().st_mtime_ns)
+    return found
+
+# ============================================================================
+# MANIFEST UPDATES
+# ============================================================================
+
+def manifest_path(save_directory):
+    return os.path.join(save_directory, MANIFEST_NAME)
+
+# one line per change, the name goes last so it can hold anything but "\n":
+#   S <tab> level <tab> modified <tab> class <tab> name
+#   D <tab> name
+#   M <tab> mtime <tab> folder
+# the newest line for a name or folder wins. level/class are "-" for
+# unreadable saves, mtime is "-" for a folder that still has to be checked
+
+def record_save(save_directory, character_name, character_class, level, modified):
+    append_record(save_directory, make_entry(character_name, character_class, level, modified))
+
+def record_delete(save_directory, character_name):
+    append_record(save_directory, character_name)
+
+def make_entry(character_name, character_class, level, modified):
+    return {"name": character_name, "class": character_class, "level": level, "modified": modified}
+
+def format_entry(entry):
+    level = "-" if entry["level"] is None else entry["level"]
+    character_class = "-" if entry["class"] is None else entry["class"]
+    return f"S\t{level}\t{entry['modified']}\t{character_class}\t{entry['name']}\n"
+
+def format_folder(folder, mtime):
+    return f"M\t{'-' if mtime is None else mtime}\t{folder}\n"
+
+def parse_line(entries, folders, line):
+    # raises ValueError on anything that isn't a record
+    if line.startswith("S\t"):
+        _, level, modified, character_class, name = line.rstrip("\n").split("\t", 4)
+        entries[name] = make_entry(name, None if character_class == "-" else character_class,
+                                   None if level == "-" else int(level), int(modified))
+    elif line.startswith("D\t"):
+        entries.pop(line[2:].rstrip("\n"), None)
+    elif line.startswith("M\t"):
+        _, mtime, folder = line.rstrip("\n").split("\t", 2)
+        folders[folder] = None if mtime == "-" else int(mtime)
+    else:
+        raise ValueError(f"Bad manifest line {line!r}")
+
+def append_record(save_directory, record):
+    # record is a saved entry or the name of a deleted character. with no
+    # manifest yet there is nothing to keep current, it gets built (and
+    # picks this save up) the first time it is needed
+    if isinstance(record, dict):
+        name = record["name"]
+        line = format_entry(record)
+    else:
+        name = record
+        line = f"D\t{record}\n"
+    path = manifest_path(save_directory)
+    key = os.path.abspath(save_directory)
+
+    with manifest_lock:
+        if not os.path.exists(path):
+            return
+        # the save/delete moved its folder's mtime, that's not drift
+        folder = folder_of(name, is_sharded(save_directory))
+        mtime = settled(os.stat(folder_path(save_directory, folder)).st_mtime_ns)
+        line += format_folder(folder, mtime)
+        with open(path, "a", encoding="utf-8") as f:
+            before = f.seek(0, os.SEEK_END)
+            f.write(line)
+            after = f.tell()
+
+        # keep our in-memory copy current without re-reading the file,
+        # unless somebody else appended since we last looked
+        cached = manifest_cache.get(key)
+        if cached is not None and cached["size"] == before:
+            if isinstance(record, dict):
+                cached["entries"][name] = record
+            else:
+                cached["entries"].pop(name, None)
+            cached["folders"][folder] = mtime
+            cached["orders"].clear()
+            cached["size"] = after
+            cached["lines"] += 2
+            cached["mtime"] = os.stat(path).st_mtime_ns
+            if needs_compacting(cached):
+                write_manifest_locked(save_directory, cached["entries"], cached["folders"])
+        else:
+            manifest_cache.pop(key, None)
+            if after > COMPACT_MIN_BYTES:
+                load_locked(save_directory, build=False)
+
+# ============================================================================
+# MANIFEST READS
+# ============================================================================
+
+def read_manifest(save_directory):
+    return read_cached(save_directory)["entries"]
+
+def read_cached(save_directory, build=True):
+    # returns the manifest_cache record, brought up to date with any folder
+    # that changed behind our back. a missing or unreadable manifest is
+    # rebuilt, or with build=False a missing one just returns None
+    if not os.path.isdir(save_directory):
+        return {"entries": {}, "folders": {}, "orders": {}}
+    with manifest_lock:
+        return load_locked(save_directory, build)
+
+def load_locked(save_directory, build=True):
+    key = os.path.abspath(save_directory)
+    path = manifest_path(save_directory)
+    try:
+        stats = os.stat(path)
+    except FileNotFoundError:
+        if not build:
+            return None
+        return rebuild_locked(save_directory)
+
+    cached = manifest_cache.get(key)
+    if cached is None or cached["size"] != stats.st_size or cached["mtime"] != stats.st_mtime_ns:
+        entries = {}
+        folders = {}
+        lines = 0
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                for line in f:
+                    parse_line(entries, folders, line)
+                    lines += 1
+        except (ValueError, UnicodeDecodeError):
+            return rebuild_locked(save_directory)
+        cached = {"entries": entries, "folders": folders, "size": stats.st_size,
+                  "mtime": stats.st_mtime_ns, "lines": lines, "orders": {}}
+        manifest_cache[key] = cached
+
+    refresh_locked(save_directory, cached)
+    if needs_compacting(cached):
+        return write_manifest_locked(save_directory, cached["entries"], cached["folders"])
+    return cached
+
+def needs_compacting(cached):
+    return cached["lines"] > COMPACT_MIN_LINES and cached["lines"] > 2 * (len(cached["entries"]) + len(cached["folders"]))
+
+def refresh_locked(save_directory, cached):
+    # rescans only the folders whose mtime moved, and only decodes saves
+    # whose own mtime doesn't match their entry. the fixes are appended,
+    # which leaves the folder mtimes alone
+    current = folder_mtimes(save_directory)
+    recorded = cached["folders"]
+    changed = {folder for folder in current.keys() | recorded.keys()
+               if folder not in current or current[folder] is None or current[folder] != recorded.get(folder)}
+    if not changed:
+        return
+
+    entries = cached["entries"]
+    found = {}
+    for folder in changed:
+        found.update(scan_folder(save_directory, folder))
+
+    lines = []
+    sharded = is_sharded(save_directory)
+    for name in [name for name in entries if name not in found and folder_of(name, sharded) in changed]:
+        del entries[name]
+        lines.append(f"D\t{name}\n")
+    for name, (path, modified) in found.items():
+        entry = entries.get(name)
+        if entry is None or entry["modified"] != modified:
+            entries[name] = read_entry(name, path, modified)
+            lines.append(format_entry(entries[name]))
+    for folder in changed:
+        if folder not in current:
+            recorded.pop(folder, None)
+            lines.append(format_folder(folder, None))
+        elif current[folder] != recorded.get(folder, 0):
+            recorded[folder] = current[folder]
+            lines.append(format_folder(folder, current[folder]))
+
+    if lines:
+        path = manifest_path(save_directory)
+        with open(path, "a", encoding="utf-8") as f:
+            f.writelines(lines)
+        stats = os.stat(path)
+        cached["size"] = stats.st_size
+        cached["mtime"] = stats.st_mtime_ns
+        cached["lines"] += len(lines)
+        cached["orders"].clear()
+
+def read_entry(character_name, path, modified):
+    try:
+        with open(path, "rb") as f:
+            character = save_formats.decode_save(f.read(), character_name)
+        return make_entry(character_name, character["class"], character["level"], modified)
+    except Exception:
+        # still list broken saves, loading them reports the real error
+        return make_entry(character_name, None, None, modified)
+
+def rebuild_manifest(save_directory):
+    with manifest_lock:
+        return rebuild_locked(save_directory)["entries"]
+
+def rebuild_locked(save_directory):
+    # folder mtimes come first, so a save landing mid-scan still shows up
+    # as drift on the next read
+    folders = folder_mtimes(save_directory)
+    entries = {}
+    for character_name, path in scan_save_files(save_directory):
+        entries[character_name] = read_entry(character_name, path, os.stat(path).st_mtime_ns)
+    return write_manifest_locked(save_directory, entries, folders)
+
+def write_manifest_locked(save_directory, entries, folders):
+    path = manifest_path(save_directory)
+    temp_path = f"{path}.{os.getpid()}.tmp"
+    before = os.stat(save_directory).st_mtime_ns
+    with open(temp_path, "w", encoding="utf-8") as f:
+        f.writelines(format_folder(folder, mtime) for folder, mtime in folders.items())
+        f.writelines(format_entry(entry) for entry in entries.values())
+    os.replace(temp_path, path)
+    if folders.get("") == before:
+        # our own temp file and rename moved the save folder's mtime
+        folders[""] = settled(os.stat(save_directory).st_mtime_ns)
+        with open(path, "a", encoding="utf-8") as f:
+            f.write(format_folder("", folders[""]))
+
+    stats = os.stat(path)
+    cached = {"entries": entries, "folders": folders, "size": stats.st_size,
+              "mtime": stats.st_mtime_ns, "lines": len(entries) + len(folders) + 1, "orders": {}}
+    manifest_cache[os.path.abspath(save_directory)] = cached
+    return cached
+
+def sorted_entries(save_directory, sort_by="name", cached=None):
+    # sorted once per manifest change, then every page is just a slice
+    if sort_by not in SORT_KEYS:
+        raise ValueError(f"Can't sort saves by '{sort_by}'")
+    if cached is None:
+        cached = read_cached(save_directory)
+    order = cached["orders"].get(sort_by)
+    if order is None:
+        order = sorted(cached["entries"].values(), key=lambda entry: entry["name"])
+        if sort_by != "name":
+            # stable sort keeps names in order within a tie. broken saves
+            # have no level/class and go last
+            missing = "" if sort_by == "class" else 0
+            order.sort(key=lambda entry: (entry[sort_by] is None,
+                                          missing if entry[sort_by] is None else entry[sort_by]))
+        cached["orders"][sort_by] = order
+    return order
+
+def list_names(save_directory):
+    # reading the manifest off disk is slower than a plain listdir, so
+    # names only come from it once it is already loaded in memory
+    cached = None
+    if os.path.abspath(save_directory) in manifest_cache:
+        cached = read_cached(save_directory, build=False)
+    if cached is None:
+        return sorted(scan_save_names(save_directory))
+    return [entry["name"] for entry in sorted_entries(save_directory, cached=cached)]
+
+def list_entries(save_directory, sort_by="name", reverse=False, offset=0, limit=None):
+    order = sorted_entries(save_directory, sort_by)
+    if reverse:
+        order = order[::-1]
+    end = None if limit is None else offset + limit
+    return [dict(entry) for entry in order[offset:end]]
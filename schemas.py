@@ -0,0 +1,168 @@
+"""
+COMP 163 - Project 3: Quest Chronicles
+Schemas Module
+
+This module holds the record schemas behind validate_character_data,
+validate_quest_data and validate_item_data. A Schema is a list of rules
+that is compiled once into one straight-line check function, so a valid
+record costs a handful of lookups and isinstance calls. Only a record
+that fails the fast check is walked rule by rule to find the error
+message, and validate_many collects every error in a batch.
+
+Rules are (kind, key, arg, message) and run in order:
+    "required"  key must be present
+    "type"      isinstance(value, arg)
+    "choice"    value in arg
+    "contains"  arg in value
+message is formatted with {key} and {value}.
+"""
+
+from id_registry import IdList
+from inventory import Inventory
+from custom_exceptions import InvalidSaveDataError, InvalidDataFormatError
+
+# ============================================================================
+# SCHEMA
+# ============================================================================
+
+class Schema:
+    """
+    A compiled validator. validate() raises `error` with the same message
+    the first failing rule would give; validate_many() returns every
+    problem in a batch instead of stopping at the first.
+    """
+
+    def __init__(self, rules, error):
+        self.rules = tuple(rules)
+        self.error = error
+        self.check = self.compile()
+
+    def compile(self):
+        keys = []
+        for kind, key, arg, message in self.rules:
+            if key not in keys:
+                keys.append(key)
+
+        namespace = {}
+        conditions = []
+        for n, (kind, key, arg, message) in enumerate(self.rules):
+            value = f"v{keys.index(key)}"
+            namespace[f"a{n}"] = arg
+            if kind == "type":
+                conditions.append(f"isinstance({value}, a{n})")
+            elif kind == "choice":
+                conditions.append(f"{value} in a{n}")
+            elif kind == "contains":
+                conditions.append(f"a{n} in {value}")
+            elif kind != "required":
+                raise ValueError(f"Unknown schema rule '{kind}'")
+
+        # a missing key is a KeyError, anything odd is sorted out by the
+        # slow path so the error it raises matches the old validators
+        lines = ["def check(record):", "    try:"]
+        lines += [f"        v{i} = record[{key!r}]" for i, key in enumerate(keys)]
+        lines.append("        return " + (" and ".join(conditions) or "True"))
+        lines.append("    except (KeyError, TypeError):")
+        lines.append("        return False")
+        exec("\n".join(lines), namespace)
+        return namespace["check"]
+
+    def validate(self, record):
+        if self.check(record):
+            return True
+        for kind, key, arg, message in self.rules:
+            if not self.rule_ok(record, kind, key, arg):
+                raise self.error(self.format(message, record, key))
+        return True
+
+    def errors(self, record):
+        # every failing rule, rules on a missing key are skipped
+        found = []
+        missing = set()
+        for kind, key, arg, message in self.rules:
+            if key in missing:
+                continue
+            try:
+                ok = self.rule_ok(record, kind, key, arg)
+            except TypeError:
+                ok = False
+            if not ok:
+                if kind == "required":
+                    missing.add(key)
+                found.append(self.format(message, record, key))
+        return found
+
+    def validate_many(self, records):
+        # records is a list (errors keyed by position) or a dict like
+        # all_items (keyed by id). returns [(key, message), ...]
+        pairs = records.items() if hasattr(records, "items") else enumerate(records)
+        check = self.check
+        problems = []
+        for where, record in pairs:
+            if not check(record):
+                problems.extend((where, message) for message in self.errors(record))
+        return problems
+
+    def rule_ok(self, record, kind, key, arg):
+        if kind == "required":
+            return key in record
+        value = record[key]
+        if kind == "type":
+            return isinstance(value, arg)
+        if kind == "choice":
+            return value in arg
+        return arg in value
+
+    def format(self, message, record, key):
+        return message.format(key=key, value=record.get(key))
+
+def typed_fields(fields, missing, invalid):
+    # required + type rules for each field in turn
+    rules = []
+    for key, types in fields:
+        rules.append(("required", key, None, missing))
+        rules.append(("type", key, types, invalid))
+    return rules
+
+# ============================================================================
+# GAME SCHEMAS
+# ============================================================================
+
+ID_LIST = (list, IdList)
+INVENTORY = (list, IdList, Inventory)
+OPTIONAL_STR = (str, type(None))
+
+CHARACTER_SCHEMA = Schema(typed_fields([
+    ("name", str),
+    ("class", str),
+    ("level", int),
+    ("health", int),
+    ("max_health", int),
+    ("strength", int),
+    ("magic", int),
+    ("experience", int),
+    ("gold", int),
+    ("inventory", INVENTORY),
+    ("active_quests", ID_LIST),
+    ("completed_quests", ID_LIST),
+    ("equipped_weapon", OPTIONAL_STR),
+    ("equipped_armor", OPTIONAL_STR)
+], "Missing key: {key}", "Invalid type for {key}"), InvalidSaveDataError)
+
+QUEST_SCHEMA = Schema(
+    [("required", key, None, "Missing field in {key}.")
+     for key in ("quest_id", "title", "description", "reward_xp", "reward_gold",
+                 "required_level", "prerequisite")]
+    + [("type", key, int, "Field '{key}' must be an integer.")
+       for key in ("reward_xp", "reward_gold", "required_level")],
+    InvalidDataFormatError
+)
+
+ITEM_SCHEMA = Schema(
+    [("required", key, None, "Missing field in {key}.")
+     for key in ("item_id", "name", "type", "effect", "cost", "description")]
+    + [("choice", "type", frozenset({"weapon", "armor", "consumable"}), "Invalid item type: {value}"),
+       ("type", "cost", int, "Cost must be an integer."),
+       ("contains", "effect", ":", "Effect must be printed as 'stat_name:value'.")],
+    InvalidDataFormatError
+)
@@ -0,0 +1,166 @@
+"""
+COMP 163 - Project 3: Quest Chronicles
+Snapshots Module
+
+This module takes cheap snapshots of a character so a multi-step change
+(equip_armor, a whole battle, ...) can be undone. Instead of deepcopying,
+a snapshot keeps the top-level values and the list objects themselves.
+Inventories and IdLists write an undo step to every snapshot watching
+them as they change, so taking a snapshot and rolling back cost as much
+as the change did, not the size of the list. Plain lists can't report
+their changes, so their contents are copied when the snapshot is taken.
+
+Nothing in the character is swapped or wrapped, a reference to one of
+its lists keeps working after a snapshot, a restore or a release.
+
+Only the top level is snapshotted. Nested dicts (like game_data) are
+shared, not copied, and the game code never changes them.
+"""
+
+from contextlib import contextmanager
+
+import character_events
+from custom_exceptions import GameError
+
+# ============================================================================
+# WATCHED SEQUENCES
+# ============================================================================
+
+class Watched:
+    """
+    Mixin for sequences that log undo steps for snapshots. The class
+    needs a `watchers` slot, None while no snapshot is watching, and calls
+    log_undo(step...) before each change when watchers is set. A step is
+    one of ("pop",), ("truncate", length), ("delete", index),
+    ("insert", index, value), ("set", index, value) or ("replace", items).
+    """
+
+    __slots__ = ()
+
+    def watch(self, snapshot):
+        if self.watchers is None:
+            self.watchers = []
+        self.watchers.append(snapshot)
+
+    def unwatch(self, snapshot):
+        if self.watchers:
+            self.watchers = [watcher for watcher in self.watchers if watcher is not snapshot] or None
+
+    def log_undo(self, *step):
+        for snapshot in self.watchers:
+            snapshot.undo.append((self, step))
+
+def undo_step(sequence, step):
+    # goes through the sequence's own methods, so an outer snapshot still
+    # watching it logs the undo as a change of its own
+    action = step[0]
+    if action == "pop":
+        sequence.pop()
+    elif action == "truncate":
+        del sequence[step[1]:]
+    elif action == "delete":
+        del sequence[step[1]]
+    elif action == "insert":
+        sequence.insert(step[1], step[2])
+    elif action == "set":
+        sequence[step[1]] = step[2]
+    else:
+        sequence[:] = step[1]
+
+# ============================================================================
+# SNAPSHOTS
+# ============================================================================
+
+class Snapshot:
+    """
+    A character's state at one moment. restore() puts every top-level
+    value back, including the original list objects with their old
+    contents. It fires mutation events for what it changed, so caches and
+    journals see the rollback. release() drops the snapshot without
+    restoring.
+    """
+
+    def __init__(self, character):
+        self.character = character
+        self.values = {}
+        # (sequence, step) for every change to a watched sequence, oldest first
+        self.undo = []
+        self.watched = []
+        # plain lists and other mutable sequences are copied up front
+        self.lists = {}
+        self.sequences = {}
+
+        for key, value in character.items():
+            if isinstance(value, Watched):
+                # the same list under two keys is only watched once
+                if not any(value is seen for seen in self.watched):
+                    value.watch(self)
+                    self.watched.append(value)
+            elif type(value) is list:
+                self.lists[key] = value[:]
+            elif hasattr(value, "copy") and hasattr(value, "extend"):
+                self.sequences[key] = value.copy()
+            self.values[key] = value
+
+    def restore(self):
+        character = self.character
+        undo, lists, sequences = self.undo, self.lists, self.sequences
+        # stop logging before undoing, our own undo isn't a change to keep
+        self.release()
+
+        changed = []
+        for key in [key for key in character if key not in self.values]:
+            del character[key]
+            changed.append(key)
+
+        touched = set()
+        for sequence, step in reversed(undo):
+            undo_step(sequence, step)
+            touched.add(id(sequence))
+
+        for key, value in self.values.items():
+            dirty = id(value) in touched
+            if key in lists:
+                if value != lists[key]:
+                    value[:] = lists[key]
+                    dirty = True
+            elif key in sequences:
+                value.clear()
+                value.extend(sequences[key])
+                dirty = True
+            if not dirty and key in character and character[key] is value:
+                continue
+            character[key] = value
+            changed.append(key)
+
+        character_events.record_set(character, *[key for key in changed if key in character])
+        return True
+
+    def release(self):
+        for value in self.watched:
+            value.unwatch(self)
+        self.watched = []
+        self.undo = []
+        self.lists = {}
+        self.sequences = {}
+
+def snapshot(character):
+    return Snapshot(character)
+
+def restore(character_snapshot):
+    return character_snapshot.restore()
+
+@contextmanager
+def rollback_on_error(*characters):
+    # with rollback_on_error(character): ... undoes everything done to the
+    # characters inside the block if a GameError escapes it
+    snapshots = [Snapshot(character) for character in characters]
+    try:
+        yield snapshots
+    except GameError:
+        for character_snapshot in reversed(snapshots):
+            character_snapshot.restore()
+        raise
+    finally:
+        for character_snapshot in snapshots:
+            character_snapshot.release()
@@ -0,0 +1,229 @@
+"""
+COMP 163 - Project 3: Quest Chronicles
+SQLite Saves Module
+
+This module stores character saves in one sqlite3 database instead of a
+file per character. Pass a SqliteSaveBackend wherever character_manager
+takes a save_directory and save/load/list/delete go to the database.
+Inventory and quests get their own tables, so questions like "who has
+completed quest X" are an index lookup.
+"""
+
+import queue
+import sqlite3
+from contextlib import contextmanager
+
+from custom_exceptions import CharacterNotFoundError
+from inventory import Inventory
+
+CHARACTER_COLUMNS = ("name", "class", "level", "health", "max_health", "strength", "magic",
+                     "experience", "gold", "equipped_weapon", "equipped_armor")
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS characters (
+    name TEXT PRIMARY KEY,
+    class TEXT NOT NULL,
+    level INTEGER NOT NULL,
+    health INTEGER NOT NULL,
+    max_health INTEGER NOT NULL,
+    strength INTEGER NOT NULL,
+    magic INTEGER NOT NULL,
+    experience INTEGER NOT NULL,
+    gold INTEGER NOT NULL,
+    equipped_weapon TEXT,
+    equipped_armor TEXT,
+    inventory_capacity INTEGER
+);
+
+CREATE TABLE IF NOT EXISTS character_items (
+    name TEXT NOT NULL,
+    position INTEGER NOT NULL,
+    item_id TEXT NOT NULL,
+    PRIMARY KEY (name, position)
+) WITHOUT ROWID;
+
+-- status is 'active' or 'completed'
+CREATE TABLE IF NOT EXISTS character_quests (
+    name TEXT NOT NULL,
+    status TEXT NOT NULL,
+    position INTEGER NOT NULL,
+    quest_id TEXT NOT NULL,
+    PRIMARY KEY (name, status, position)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS quests_by_id ON character_quests (quest_id, status);
+CREATE INDEX IF NOT EXISTS items_by_id ON character_items (item_id);
+"""
+
+# ============================================================================
+# SQLITE SAVE BACKEND
+# ============================================================================
+
+class SqliteSaveBackend:
+    """
+    Character saves in a sqlite3 database in WAL mode. A small pool of
+    connections lets several threads read while one writes. Each save is
+    one transaction; save_characters writes a whole batch in one.
+    """
+
+    def __init__(self, db_path="data/save_games.db", pool_size=4):
+        self.db_path = db_path
+        self.pool = queue.Queue()
+        self.connections = []
+        for _ in range(max(1, pool_size)):
+            connection = sqlite3.connect(db_path, timeout=30, check_same_thread=False,
+                                         isolation_level=None)
+            connection.execute("PRAGMA journal_mode=WAL")
+            # WAL + NORMAL only loses the last commits on power loss, never
+            # corrupts the database
+            connection.execute("PRAGMA synchronous=NORMAL")
+            self.connections.append(connection)
+            self.pool.put(connection)
+        with self.connection() as connection:
+            connection.executescript(SCHEMA)
+            # databases from before inventory_capacity existed
+            columns = [row[1] for row in connection.execute("PRAGMA table_info(characters)")]
+            if "inventory_capacity" not in columns:
+                connection.execute("ALTER TABLE characters ADD COLUMN inventory_capacity INTEGER")
+
+    @contextmanager
+    def connection(self):
+        connection = self.pool.get()
+        try:
+            yield connection
+        finally:
+            self.pool.put(connection)
+
+    @contextmanager
+    def transaction(self):
+        with self.connection() as connection:
+            # IMMEDIATE takes the write lock up front instead of failing
+            # halfway through when another writer got there first
+            connection.execute("BEGIN IMMEDIATE")
+            try:
+                yield connection
+                connection.execute("COMMIT")
+            except BaseException:
+                # a COMMIT that failed can leave the transaction open too
+                if connection.in_transaction:
+                    connection.execute("ROLLBACK")
+                raise
+
+    def close(self):
+        for connection in self.connections:
+            connection.close()
+        self.connections = []
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+        return False
+
+    # ------------------------------------------------------------------------
+    # character_manager backend api
+    # ------------------------------------------------------------------------
+
+    def save_character(self, character):
+        with self.transaction() as connection:
+            write_character(connection, character)
+        return True
+
+    def save_characters(self, characters):
+        # all or nothing
+        count = 0
+        with self.transaction() as connection:
+            for character in characters:
+                write_character(connection, character)
+                count += 1
+        return count
+
+    def load_character(self, character_name):
+        with self.connection() as connection:
+            row = connection.execute(
+                f"SELECT {', '.join(CHARACTER_COLUMNS)}, inventory_capacity FROM characters WHERE name = ?",
+                (character_name,)
+            ).fetchone()
+            if row is None:
+                raise CharacterNotFoundError(f"{character_name} not found.")
+            inventory = [item_id for (item_id,) in connection.execute(
+                "SELECT item_id FROM character_items WHERE name = ? ORDER BY position",
+                (character_name,)
+            )]
+            quests = {"active": [], "completed": []}
+            for status, quest_id in connection.execute(
+                "SELECT status, quest_id FROM character_quests WHERE name = ? ORDER BY status, position",
+                (character_name,)
+            ):
+                quests[status].append(quest_id)
+
+        character = dict(zip(CHARACTER_COLUMNS, row))
+        character["inventory"] = Inventory(inventory, row[-1])
+        character["active_quests"] = quests["active"]
+        character["completed_quests"] = quests["completed"]
+        return character
+
+    def list_saved_characters(self):
+        with self.connection() as connection:
+            return [name for (name,) in connection.execute("SELECT name FROM characters ORDER BY name")]
+
+    def delete_character(self, character_name):
+        with self.transaction() as connection:
+            deleted = connection.execute("DELETE FROM characters WHERE name = ?",
+                                         (character_name,)).rowcount
+            if not deleted:
+                raise CharacterNotFoundError(f"{character_name} not found.")
+            delete_lists(connection, character_name)
+        return True
+
+    # ------------------------------------------------------------------------
+    # queries
+    # ------------------------------------------------------------------------
+
+    def characters_who_completed(self, quest_id):
+        return self.names_with_quest(quest_id, "completed")
+
+    def characters_on_quest(self, quest_id):
+        return self.names_with_quest(quest_id, "active")
+
+    def characters_holding(self, item_id):
+        with self.connection() as connection:
+            return [name for (name,) in connection.execute(
+                "SELECT DISTINCT name FROM character_items WHERE item_id = ? ORDER BY name", (item_id,)
+            )]
+
+    def names_with_quest(self, quest_id, status):
+        with self.connection() as connection:
+            return [name for (name,) in connection.execute(
+                "SELECT DISTINCT name FROM character_quests WHERE quest_id = ? AND status = ? ORDER BY name",
+                (quest_id, status)
+            )]
+
+# ============================================================================
+# HELPERS
+# ============================================================================
+
+def write_character(connection, character):
+    name = character["name"]
+    connection.execute(
+        f"INSERT OR REPLACE INTO characters ({', '.join(CHARACTER_COLUMNS)}, inventory_capacity) "
+        f"VALUES ({', '.join('?' * (len(CHARACTER_COLUMNS) + 1))})",
+        tuple(character[column] for column in CHARACTER_COLUMNS)
+        + (getattr(character["inventory"], "capacity", None),)
+    )
+    delete_lists(connection, name)
+    connection.executemany(
+        "INSERT INTO character_items VALUES (?, ?, ?)",
+        ((name, position, item_id) for position, item_id in enumerate(character["inventory"]))
+    )
+    connection.executemany(
+        "INSERT INTO character_quests VALUES (?, ?, ?, ?)",
+        [(name, "active", position, quest_id)
+         for position, quest_id in enumerate(character["active_quests"])]
+        + [(name, "completed", position, quest_id)
+           for position, quest_id in enumerate(character["completed_quests"])]
+    )
+
+def delete_lists(connection, character_name):
+    connection.execute("DELETE FROM character_items WHERE name = ?", (character_name,))
+    connection.execute("DELETE FROM character_quests WHERE name = ?", (character_name,))
@@ -0,0 +1,128 @@
+"""
+Test Character Cache
+Tests for the LRU character cache and its write-back
+"""
+
+import pytest
+import sys
+import os
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import character_manager
+import inventory_system
+from character_cache import CharacterCache
+from custom_exceptions import CharacterNotFoundError
+
+def save_heroes(directory, count):
+    for n in range(count):
+        character_manager.save_character(character_manager.create_character(f"Hero{n}", "Mage"), str(directory))
+
+# ============================================================================
+# CACHE TESTS
+# ============================================================================
+
+def test_cache_hits_and_misses(tmp_path):
+    """Test that a second load comes from memory"""
+    save_heroes(tmp_path, 2)
+    with CharacterCache(str(tmp_path)) as cache:
+        first = cache.load("Hero0")
+        assert cache.load("Hero0") is first
+        cache.load("Hero1")
+        assert cache.stats()['hits'] == 1
+        assert cache.stats()['misses'] == 2
+
+        with pytest.raises(CharacterNotFoundError):
+            cache.load("Nobody")
+
+def test_cache_evicts_least_recently_used(tmp_path):
+    """Test LRU order and the size bound"""
+    save_heroes(tmp_path, 3)
+    with CharacterCache(str(tmp_path), max_size=2) as cache:
+        cache.load("Hero0")
+        cache.load("Hero1")
+        cache.load("Hero0")
+        cache.load("Hero2")
+
+        assert "Hero1" not in cache
+        assert "Hero0" in cache
+        assert len(cache) == 2
+        assert cache.stats()['evictions'] == 1
+        # Hero1 was never changed so nothing was written
+        assert cache.stats()['writebacks'] == 0
+
+def test_game_changes_mark_dirty_and_write_back(tmp_path):
+    """Test that mutations through the game APIs get written on eviction"""
+    save_heroes(tmp_path, 2)
+    with CharacterCache(str(tmp_path), max_size=1) as cache:
+        char = cache.load("Hero0")
+        character_manager.add_gold(char, 50)
+        inventory_system.add_item_to_inventory(char, "health_potion")
+        assert cache.stats()['dirty'] == 1
+
+        cache.load("Hero1")
+        assert cache.stats()['writebacks'] == 1
+
+    reloaded = character_manager.load_character("Hero0", str(tmp_path))
+    assert reloaded['gold'] == 150
+    assert reloaded['inventory'] == ["health_potion"]
+
+def test_save_and_flush_only_write_dirty(tmp_path):
+    """Test that flush writes dirty characters once and clean ones never"""
+    save_heroes(tmp_path, 3)
+    cache = CharacterCache(str(tmp_path))
+    for n in range(3):
+        cache.load(f"Hero{n}")
+
+    char = cache.load("Hero1")
+    char['gold'] = 7
+    cache.save(char)
+    cache.flush()
+    cache.flush()
+    assert cache.stats()['writebacks'] == 1
+    assert character_manager.load_character("Hero1", str(tmp_path))['gold'] == 7
+
+    # direct edits need mark_dirty
+    char['gold'] = 8
+    cache.mark_dirty(char)
+    cache.close()
+    assert character_manager.load_character("Hero1", str(tmp_path))['gold'] == 8
+
+def test_untracked_characters_ignored(tmp_path):
+    """Test that changes to characters outside the cache don't count"""
+    with CharacterCache(str(tmp_path)) as cache:
+        character_manager.add_gold(character_manager.create_character("Loose", "Rogue"), 5)
+        assert cache.stats()['dirty'] == 0
+
+def test_failed_eviction_keeps_dirty_character(tmp_path, monkeypatch):
+    """Test that a write-back error on eviction doesn't lose the changes"""
+    save_heroes(tmp_path, 2)
+    cache = CharacterCache(str(tmp_path), max_size=1)
+    hero = cache.load("Hero0")
+    character_manager.add_gold(hero, 50)
+
+    save_character = character_manager.save_character
+    def disk_full(*args):
+        raise OSError("disk full")
+    monkeypatch.setattr(character_manager, "save_character", disk_full)
+    with pytest.raises(OSError):
+        cache.load("Hero1")
+    assert "Hero0" in cache
+    assert "Hero1" not in cache and len(cache) == 1
+    assert cache.load("Hero0") is hero
+
+    monkeypatch.setattr(character_manager, "save_character", save_character)
+    cache.close()
+    assert character_manager.load_character("Hero0", str(tmp_path))['gold'] == hero['gold']
+
+def test_invalidate_drops_without_writing(tmp_path):
+    """Test invalidate forgets a character and its changes"""
+    save_heroes(tmp_path, 1)
+    with CharacterCache(str(tmp_path)) as cache:
+        character_manager.add_gold(cache.load("Hero0"), 50)
+        cache.invalidate("Hero0")
+        assert "Hero0" not in cache
+    assert character_manager.load_character("Hero0", str(tmp_path))['gold'] == 100
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,122 @@
+"""
+Test Character Class
+Tests for the slotted Character and the game code running on it
+"""
+
+import pytest
+import sys
+import os
+import copy
+import pickle
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import character_manager
+import inventory_system
+import quest_handler
+import combat_system
+import save_formats
+from character import Character
+from custom_exceptions import InvalidSaveDataError
+
+def make_character():
+    return Character.from_dict(character_manager.create_character("Slotty", "Warrior"))
+
+# ============================================================================
+# DICT API TESTS
+# ============================================================================
+
+def test_character_round_trips_dict():
+    """Test that to_dict/from_dict keep every field"""
+    data = character_manager.create_character("Slotty", "Mage")
+    char = Character.from_dict(data)
+
+    assert char.to_dict() == data
+    assert char == data
+    assert char['class'] == "Mage"
+    assert char.character_class == "Mage"
+    assert len(char) == 14
+    assert list(char) == list(data)
+
+def test_character_has_no_instance_dict():
+    """Test that the slots actually replace __dict__"""
+    assert not hasattr(make_character(), "__dict__")
+
+def test_character_missing_and_extra_keys():
+    """Test KeyError, extras and deleting like a dict"""
+    char = make_character()
+
+    with pytest.raises(KeyError):
+        char['xp']
+    assert char.get('xp', 0) == 0
+
+    char['title'] = "the Brave"
+    assert char['title'] == "the Brave"
+    assert 'title' in char
+    assert len(char) == 15
+
+    del char['equipped_armor']
+    assert 'equipped_armor' not in char
+    assert 'equipped_armor' not in char.copy()
+    assert char.copy()['title'] == "the Brave"
+    with pytest.raises(InvalidSaveDataError):
+        character_manager.validate_character_data(char)
+
+def test_character_copy_is_independent():
+    """Test that copies don't share their id lists"""
+    char = make_character()
+    char['inventory'].append("health_potion")
+
+    clone = copy.copy(char)
+    clone['inventory'].append("iron_sword")
+    clone['gold'] = 1
+
+    assert char['inventory'] == ["health_potion"]
+    assert char['gold'] == 100
+    assert clone['inventory'] == ["health_potion", "iron_sword"]
+
+def test_character_pickles():
+    """Test that slotted characters survive pickle"""
+    char = make_character()
+    char['title'] = "the Brave"
+    assert pickle.loads(pickle.dumps(char)) == char
+
+# ============================================================================
+# GAME CODE TESTS
+# ============================================================================
+
+def test_game_functions_accept_character():
+    """Test the dict-based game functions work on a Character unchanged"""
+    char = make_character()
+    quests = {"q1": {"quest_id": "q1", "title": "Q", "description": "d", "reward_xp": 250,
+                     "reward_gold": 40, "required_level": 1, "prerequisite": "NONE"}}
+    items = {"health_potion": {"item_id": "health_potion", "name": "Potion", "type": "consumable",
+                               "effect": "health:20", "cost": 25, "description": "d"}}
+
+    character_manager.validate_character_data(char)
+    character_manager.gain_experience(char, 250)
+    character_manager.add_gold(char, 10)
+    assert char['level'] == 2
+
+    inventory_system.purchase_item(char, "health_potion", items["health_potion"])
+    assert inventory_system.has_item(char, "health_potion")
+
+    quest_handler.accept_quest(char, "q1", quests)
+    quest_handler.complete_quest(char, "q1", quests)
+    assert quest_handler.is_quest_completed(char, "q1")
+
+    enemy = combat_system.create_enemy("goblin")
+    health = enemy['health']
+    combat_system.warrior_power_strike(char, enemy)
+    assert enemy['health'] < health
+
+def test_character_saves_and_loads(tmp_path):
+    """Test both save formats take a Character"""
+    char = make_character()
+    for save_format in save_formats.SAVE_FORMATS:
+        character_manager.save_character(char, str(tmp_path), save_format)
+        loaded = character_manager.load_character("Slotty", str(tmp_path))
+        assert Character.from_dict(loaded) == char
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
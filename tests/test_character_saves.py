@@ -0,0 +1,402 @@
+"""
+Test Character Saves
+Tests for save formats and save storage in character_manager
+"""
+
+import pytest
+import sys
+import os
+import time
+import threading
+import asyncio
+import struct
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import character_manager
+import save_formats
+import save_manifest
+from custom_exceptions import SaveFileCorruptedError, InvalidSaveDataError, CharacterNotFoundError
+
+def make_character(name="SaveTest"):
+    char = character_manager.create_character(name, "Cleric")
+    char['inventory'] = ["health_potion"] * 5 + ["iron_sword"]
+    char['active_quests'] = ["orc_menace"]
+    char['completed_quests'] = [f"quest_{i}" for i in range(50)]
+    char['equipped_armor'] = "leather_armor"
+    char['gold'] = 12345
+    return char
+
+# ============================================================================
+# SAVE FORMAT TESTS
+# ============================================================================
+
+def test_binary_round_trip(tmp_path):
+    """Test that a binary save loads back to the same character"""
+    char = make_character()
+
+    character_manager.save_character(char, str(tmp_path), save_format="binary")
+    with open(tmp_path / "SaveTest_save.txt", "rb") as f:
+        assert f.read(4) == save_formats.BINARY_MAGIC
+
+    assert character_manager.load_character("SaveTest", str(tmp_path)) == char
+
+def test_text_and_binary_load_the_same(tmp_path):
+    """Test that load_character auto-detects both formats"""
+    char = make_character()
+    text_dir = tmp_path / "text"
+    binary_dir = tmp_path / "binary"
+
+    character_manager.save_character(char, str(text_dir))
+    character_manager.save_character(char, str(binary_dir), save_format="binary")
+
+    assert character_manager.load_character("SaveTest", str(text_dir)) == \
+        character_manager.load_character("SaveTest", str(binary_dir))
+
+def test_convert_save_directory(tmp_path):
+    """Test converting existing text saves to binary and back"""
+    for name in ("One", "Two"):
+        character_manager.save_character(make_character(name), str(tmp_path))
+
+    assert character_manager.convert_save_directory(str(tmp_path), "binary") == 2
+    assert character_manager.convert_save_directory(str(tmp_path), "binary") == 0
+    assert character_manager.load_character("One", str(tmp_path)) == make_character("One")
+
+    assert character_manager.convert_save_directory(str(tmp_path), "text") == 2
+    assert (tmp_path / "Two_save.txt").read_text().startswith("NAME: Two")
+
+def test_bad_binary_saves(tmp_path):
+    """Test truncated and wrong-version binary saves"""
+    data = save_formats.encode_binary(make_character())
+
+    (tmp_path / "Cut_save.txt").write_bytes(data[:-3])
+    with pytest.raises(SaveFileCorruptedError):
+        character_manager.load_character("Cut", str(tmp_path))
+
+    (tmp_path / "Future_save.txt").write_bytes(data[:4] + bytes([99]) + data[5:])
+    with pytest.raises(InvalidSaveDataError):
+        character_manager.load_character("Future", str(tmp_path))
+
+def test_older_binary_versions_still_load(tmp_path):
+    """Test that version 1 and 2 saves, one counted array per list, load"""
+    char = make_character()
+
+    def counted(values):
+        encoded = "\0".join(values).encode()
+        return struct.pack("<II", len(values), len(encoded)) + encoded
+
+    numbers = struct.pack("<7q", *[char[field] for field in
+                                   ("level", "experience", "health", "max_health",
+                                    "strength", "magic", "gold")])
+    arrays = counted([char['name'], char['class'], "", char['equipped_armor']])
+    arrays += b"".join(counted(char[field])
+                       for field in ("inventory", "active_quests", "completed_quests"))
+
+    (tmp_path / "SaveTest_save.txt").write_bytes(b"QCSV" + bytes([1]) + numbers + arrays)
+    assert character_manager.load_character("SaveTest", str(tmp_path)) == char
+
+    data = b"QCSV" + bytes([2]) + numbers + struct.pack("<q", 40) + arrays
+    (tmp_path / "SaveTest_save.txt").write_bytes(data)
+    loaded = character_manager.load_character("SaveTest", str(tmp_path))
+    assert loaded == char and loaded['inventory'].capacity == 40
+
+def test_binary_rejects_stats_that_dont_fit():
+    """Test out of range stats raise InvalidSaveDataError, not struct.error"""
+    char = make_character()
+    char['gold'] = 2 ** 64
+    with pytest.raises(InvalidSaveDataError):
+        save_formats.encode_binary(char)
+    # text saves have no width limit
+    assert save_formats.decode_save(save_formats.encode_text(char), "SaveTest")["gold"] == 2 ** 64
+
+# ============================================================================
+# CRASH-SAFE SAVE TESTS
+# ============================================================================
+
+def test_save_leaves_no_temp_files(tmp_path):
+    """Test that atomic saves clean up after themselves"""
+    character_manager.save_character(make_character(), str(tmp_path))
+    character_manager.save_character(make_character(), str(tmp_path))
+
+    assert sorted(os.listdir(tmp_path)) == ["SaveTest_save.txt"]
+
+def test_failed_write_keeps_old_save(tmp_path, monkeypatch):
+    """Test that a crash mid-write leaves the previous save loadable"""
+    char = make_character()
+    character_manager.save_character(char, str(tmp_path))
+
+    def crash(*args):
+        raise OSError("disk on fire")
+    monkeypatch.setattr(os, "fsync", crash)
+
+    char['gold'] = 1
+    with pytest.raises(OSError):
+        character_manager.save_character(char, str(tmp_path))
+
+    assert character_manager.load_character("SaveTest", str(tmp_path))['gold'] == 12345
+    assert sorted(os.listdir(tmp_path)) == ["SaveTest_save.txt"]
+
+def test_write_behind_coalesces_saves(tmp_path):
+    """Test that repeated saves in the window become one write"""
+    char = make_character()
+    saver = character_manager.WriteBehindSaver(str(tmp_path), window=60)
+
+    for gold in range(10):
+        char['gold'] = gold
+        saver.save(char)
+    assert not os.path.exists(tmp_path / "SaveTest_save.txt")
+
+    saver.close()
+    assert saver.saves_requested == 10
+    assert saver.saves_written == 1
+    assert character_manager.load_character("SaveTest", str(tmp_path))['gold'] == 9
+
+def test_write_behind_flush_never_loses_to_older_batch(tmp_path):
+    """Test a flush racing the background thread still ends on the newest save"""
+    char = make_character()
+    saver = character_manager.WriteBehindSaver(str(tmp_path), window=0)
+    write_batch = saver.write_batch
+    racers = []
+
+    def race_then_write(batch):
+        if threading.current_thread() is saver.thread and not racers:
+            # a newer save + flush right after the background thread took
+            # the older one, before it hit the disk
+            newer = dict(char, gold=2)
+            racer = threading.Thread(target=lambda: (saver.save(newer), saver.flush()))
+            racers.append(racer)
+            racer.start()
+            racer.join(0.2)
+        write_batch(batch)
+
+    saver.write_batch = race_then_write
+    char['gold'] = 1
+    saver.save(char)
+    while not racers:
+        time.sleep(0.01)
+    racers[0].join()
+    saver.close()
+    assert character_manager.load_character("SaveTest", str(tmp_path))['gold'] == 2
+
+def test_write_behind_background_flush(tmp_path):
+    """Test that the background thread writes once the window passes"""
+    with character_manager.WriteBehindSaver(str(tmp_path), window=0.01) as saver:
+        saver.save(make_character())
+        for _ in range(200):
+            if saver.saves_written:
+                break
+            time.sleep(0.01)
+        assert saver.saves_written == 1
+
+# ============================================================================
+# SAVE MANIFEST TESTS
+# ============================================================================
+
+def save_many(directory, specs):
+    for name, character_class, level in specs:
+        char = character_manager.create_character(name, character_class)
+        char['level'] = level
+        character_manager.save_character(char, str(directory))
+
+def test_manifest_tracks_saves_and_deletes(tmp_path):
+    """Test that listing follows saves and deletes without a rescan"""
+    save_many(tmp_path, [("Bo", "Mage", 3), ("Al", "Warrior", 7)])
+    character_manager.delete_character("Bo", str(tmp_path))
+
+    info = character_manager.list_saved_character_info(str(tmp_path))
+    assert [entry['name'] for entry in info] == ["Al"]
+    assert info[0]['class'] == "Warrior"
+    assert info[0]['level'] == 7
+    assert character_manager.list_saved_characters(str(tmp_path)) == ["Al"]
+
+def test_manifest_sorted_pages(tmp_path):
+    """Test sorting and offset/limit paging"""
+    save_many(tmp_path, [("A", "Mage", 5), ("B", "Rogue", 1), ("C", "Cleric", 9), ("D", "Mage", 3)])
+
+    by_level = character_manager.list_saved_character_info(str(tmp_path), sort_by="level", reverse=True)
+    assert [entry['name'] for entry in by_level] == ["C", "A", "D", "B"]
+
+    page = character_manager.list_saved_character_info(str(tmp_path), offset=1, limit=2)
+    assert [entry['name'] for entry in page] == ["B", "C"]
+
+    with pytest.raises(ValueError):
+        character_manager.list_saved_character_info(str(tmp_path), sort_by="gold")
+
+def test_manifest_heals_after_outside_changes(tmp_path):
+    """Test that files added or removed behind its back are picked up"""
+    save_many(tmp_path, [("Al", "Warrior", 2)])
+    character_manager.list_saved_character_info(str(tmp_path))
+
+    # an old-style save copied in by hand, and the manifest going missing
+    (tmp_path / "Cy_save.txt").write_bytes((tmp_path / "Al_save.txt").read_bytes())
+    assert character_manager.list_saved_characters(str(tmp_path)) == ["Al", "Cy"]
+
+    os.remove(tmp_path / "_manifest.txt")
+    assert character_manager.list_saved_characters(str(tmp_path)) == ["Al", "Cy"]
+
+def test_manifest_sees_changes_in_shard_folders(tmp_path):
+    """Test that a save dropped into an existing shard folder is noticed"""
+    save_many(tmp_path, [("Al", "Warrior", 2)])
+    character_manager.enable_save_sharding(str(tmp_path))
+    character_manager.list_saved_character_info(str(tmp_path))
+
+    # same shard as Al, so the top folder's mtime never moves
+    name = next(f"Cy{n}" for n in range(1000)
+                if save_manifest.shard_name(f"Cy{n}") == save_manifest.shard_name("Al"))
+    shard = tmp_path / save_manifest.shard_name("Al")
+    (shard / f"{name}_save.txt").write_bytes((shard / "Al_save.txt").read_bytes())
+    assert character_manager.list_saved_characters(str(tmp_path)) == ["Al", name]
+
+def test_manifest_drift_only_decodes_changed_saves(tmp_path, monkeypatch):
+    """Test that an outside change doesn't re-read every save"""
+    save_many(tmp_path, [(f"Hero{n}", "Mage", n) for n in range(10)])
+    character_manager.list_saved_character_info(str(tmp_path))
+    (tmp_path / "Cy_save.txt").write_bytes((tmp_path / "Hero1_save.txt").read_bytes())
+
+    decoded = []
+    decode_save = save_formats.decode_save
+    monkeypatch.setattr(save_formats, "decode_save",
+                        lambda data, name: decoded.append(name) or decode_save(data, name))
+    info = character_manager.list_saved_character_info(str(tmp_path), sort_by="level")
+    assert decoded == ["Cy"]
+    assert [entry['name'] for entry in info[:3]] == ["Hero0", "Cy", "Hero1"]
+
+def test_manifest_rebuilds_when_corrupt(tmp_path):
+    """Test that garbage in the manifest triggers a rescan"""
+    save_many(tmp_path, [("Al", "Warrior", 2)])
+    with open(tmp_path / "_manifest.txt", "a") as f:
+        f.write("not json\n")
+    assert character_manager.list_saved_characters(str(tmp_path)) == ["Al"]
+
+def test_first_manifest_includes_older_saves(tmp_path):
+    """Test that saving doesn't build a manifest, listing info does"""
+    save_many(tmp_path, [("Al", "Warrior", 2), ("Bo", "Mage", 4), ("Cy", "Rogue", 1)])
+    assert not (tmp_path / "_manifest.txt").exists()
+    assert character_manager.list_saved_characters(str(tmp_path)) == ["Al", "Bo", "Cy"]
+    assert not (tmp_path / "_manifest.txt").exists()
+
+    info = character_manager.list_saved_character_info(str(tmp_path), sort_by="level")
+    assert [entry['name'] for entry in info] == ["Cy", "Al", "Bo"]
+    assert (tmp_path / "_manifest.txt").exists()
+
+def test_manifest_compacts_in_a_process_that_only_saves(tmp_path, monkeypatch):
+    """Test that appends alone don't grow the manifest forever"""
+    save_many(tmp_path, [("Al", "Warrior", 2)])
+    character_manager.list_saved_character_info(str(tmp_path))
+    monkeypatch.setattr(save_manifest, "COMPACT_MIN_LINES", 20)
+    monkeypatch.setattr(save_manifest, "COMPACT_MIN_BYTES", 200)
+
+    # like a fresh process that never reads the manifest in
+    save_manifest.manifest_cache.clear()
+    for level in range(30):
+        save_many(tmp_path, [("Al", "Warrior", level)])
+
+    with open(tmp_path / "_manifest.txt") as f:
+        assert len(f.readlines()) <= 2 * save_manifest.COMPACT_MIN_LINES
+    assert character_manager.list_saved_character_info(str(tmp_path))[0]['level'] == 29
+
+def test_sharded_save_directory(tmp_path):
+    """Test that sharding moves saves into subfolders and everything still works"""
+    save_many(tmp_path, [("Al", "Warrior", 2), ("Bo", "Mage", 4)])
+    assert character_manager.enable_save_sharding(str(tmp_path)) == 2
+    assert not (tmp_path / "Al_save.txt").exists()
+
+    save_many(tmp_path, [("Cy", "Rogue", 1)])
+    assert character_manager.list_saved_characters(str(tmp_path)) == ["Al", "Bo", "Cy"]
+    assert character_manager.load_character("Bo", str(tmp_path))['level'] == 4
+
+    character_manager.delete_character("Al", str(tmp_path))
+    assert character_manager.rebuild_save_manifest(str(tmp_path)) == 2
+
+# ============================================================================
+# BULK LOAD/SAVE TESTS
+# ============================================================================
+
+def test_bulk_save_and_load_in_order(tmp_path):
+    """Test that bulk results line up with the names given"""
+    characters = [make_character(f"Bulk{n}") for n in range(20)]
+    for n, char in enumerate(characters):
+        char['gold'] = n
+
+    assert character_manager.save_characters(characters, str(tmp_path), workers=4) == [True] * 20
+
+    names = [f"Bulk{n}" for n in reversed(range(20))]
+    loaded = character_manager.load_characters(names, str(tmp_path), workers=4)
+    assert [char['gold'] for char in loaded] == list(reversed(range(20)))
+
+def test_bulk_load_reports_errors_per_name(tmp_path):
+    """Test that one bad save doesn't sink the batch"""
+    character_manager.save_character(make_character("Good"), str(tmp_path))
+    (tmp_path / "Broken_save.txt").write_text("NAME: Broken\n")
+
+    good, missing, broken = character_manager.load_characters(["Good", "Nobody", "Broken"], str(tmp_path))
+    assert good['name'] == "Good"
+    assert isinstance(missing, CharacterNotFoundError)
+    assert isinstance(broken, InvalidSaveDataError)
+
+def test_bulk_save_reports_errors_per_character(tmp_path):
+    """Test that an unsavable character comes back as its error"""
+    bad = make_character("Bad")
+    bad['equipped_weapon'] = "a\0b"
+    results = character_manager.save_characters([make_character("Fine"), bad], str(tmp_path),
+                                                save_format="binary")
+    assert results[0] is True
+    assert isinstance(results[1], InvalidSaveDataError)
+
+def test_iter_load_characters_streams_everything(tmp_path):
+    """Test the streaming loader yields every name once"""
+    character_manager.save_characters([make_character(f"S{n}") for n in range(10)], str(tmp_path))
+    results = dict(character_manager.iter_load_characters([f"S{n}" for n in range(11)], str(tmp_path)))
+    assert len(results) == 11
+    assert results["S3"]['name'] == "S3"
+    assert isinstance(results["S10"], CharacterNotFoundError)
+
+# ============================================================================
+# ASYNC API TESTS
+# ============================================================================
+
+def test_async_save_load_list(tmp_path):
+    """Test the coroutines round-trip a character"""
+    async def scenario():
+        char = make_character("Async")
+        assert await character_manager.async_save_character(char, str(tmp_path), "binary")
+        loaded = await character_manager.async_load_character("Async", str(tmp_path))
+        names = await character_manager.async_list_saved_characters(str(tmp_path))
+        return char, loaded, names
+
+    char, loaded, names = asyncio.run(scenario())
+    assert loaded == char
+    assert names == ["Async"]
+
+def test_async_saves_of_one_character_stay_in_order(tmp_path, monkeypatch):
+    """Test that concurrent saves of the same character land in call order"""
+    written = []
+    write_save_data = character_manager.write_save_data
+    def record_gold(name, data, *args):
+        written.append(save_formats.decode_save(data, name)['gold'])
+        return write_save_data(name, data, *args)
+    monkeypatch.setattr(character_manager, "write_save_data", record_gold)
+
+    async def scenario():
+        char = make_character("Async")
+        tasks = []
+        for gold in range(30):
+            char['gold'] = gold
+            tasks.append(asyncio.ensure_future(character_manager.async_save_character(char, str(tmp_path))))
+            # let the save start, so the later ones queue up on its lock
+            # while the gold keeps changing
+            await asyncio.sleep(0)
+        await asyncio.gather(*tasks)
+        return await character_manager.async_load_character("Async", str(tmp_path))
+
+    assert asyncio.run(scenario())['gold'] == 29
+    assert written == list(range(30))
+    assert all(not locks for locks in character_manager.async_locks.values())
+
+def test_async_load_missing_raises(tmp_path):
+    """Test errors come through the coroutine"""
+    with pytest.raises(CharacterNotFoundError):
+        asyncio.run(character_manager.async_load_character("Nobody", str(tmp_path)))
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
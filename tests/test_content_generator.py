@@ -0,0 +1,71 @@
+"""
+Test Content Generator
+Tests that generated data files are valid, seeded and shaped as asked
+"""
+
+import pytest
+import sys
+import os
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import content_generator
+import game_data
+import quest_handler
+from custom_exceptions import InvalidDataFormatError
+
+# ============================================================================
+# GENERATOR TESTS
+# ============================================================================
+
+def test_generated_files_load(tmp_path):
+    """Test that generated files load and pass prerequisite validation"""
+    content_generator.generate_content(str(tmp_path), 500, 300, seed=7)
+
+    quests = game_data.load_quests(str(tmp_path / "quests.txt"), use_cache=False)
+    items = game_data.load_items(str(tmp_path / "items.txt"), use_cache=False)
+
+    assert len(quests) == 500
+    assert len(items) == 300
+    assert quest_handler.validate_quest_prerequisites(quests)
+
+def test_generator_is_deterministic(tmp_path):
+    """Test that the same seed gives the same bytes"""
+    first = tmp_path / "a.txt"
+    second = tmp_path / "b.txt"
+    content_generator.generate_items(str(first), 200, seed=3)
+    content_generator.generate_items(str(second), 200, seed=3)
+
+    assert first.read_text() == second.read_text()
+
+def test_dag_depth_and_fan_out(tmp_path):
+    """Test that prerequisite chains and child counts respect the limits"""
+    quest_file = str(tmp_path / "quests.txt")
+    content_generator.generate_quests(quest_file, 400, dag_depth=4, fan_out=2)
+    quests = game_data.load_quests(quest_file, use_cache=False)
+
+    children = {}
+    for quest_id, quest in quests.items():
+        chain = quest_handler.get_quest_prerequisite_chain(quest_id, quests)
+        assert len(chain) <= 4
+        children[quest["prerequisite"]] = children.get(quest["prerequisite"], 0) + 1
+        if quest["prerequisite"] != "NONE":
+            assert quest["required_level"] >= quests[quest["prerequisite"]]["required_level"]
+
+    del children["NONE"]
+    assert max(children.values()) == 2
+
+def test_type_mix_and_malformed_blocks(tmp_path):
+    """Test the type mix option and that malformed blocks break loading"""
+    item_file = str(tmp_path / "items.txt")
+    content_generator.generate_items(item_file, 100, type_mix={"weapon": 1})
+    items = game_data.load_items(item_file, use_cache=False)
+    assert {item["type"] for item in items.values()} == {"weapon"}
+
+    result = content_generator.generate_items(item_file, 100, malformed_rate=0.5)
+    assert 0 < result["malformed"] < 100
+    with pytest.raises(InvalidDataFormatError):
+        game_data.load_items(item_file, use_cache=False)
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
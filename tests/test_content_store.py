@@ -0,0 +1,72 @@
+"""
+Test Content Store
+Tests that the text and sqlite content backends agree
+"""
+
+import pytest
+import sys
+import os
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import content_store
+from custom_exceptions import QuestNotFoundError, ItemNotFoundError, MissingDataFileError
+
+DATA_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "data")
+QUEST_FILE = os.path.join(DATA_DIR, "quests.txt")
+ITEM_FILE = os.path.join(DATA_DIR, "items.txt")
+
+@pytest.fixture
+def stores(tmp_path):
+    db_path = str(tmp_path / "content.db")
+    counts = content_store.import_text_content(db_path, QUEST_FILE, ITEM_FILE)
+    assert counts == {"quests": 7, "items": 10}
+
+    text = content_store.ContentStore("text", QUEST_FILE, ITEM_FILE)
+    sqlite = content_store.ContentStore("sqlite", db_path=db_path)
+    yield text, sqlite
+    sqlite.close()
+
+def by_id(records, key):
+    return sorted(records, key=lambda record: record[key])
+
+# ============================================================================
+# BACKEND TESTS
+# ============================================================================
+
+def test_backends_return_same_catalog(stores):
+    """Test that both backends give the same quest and item dicts"""
+    text, sqlite = stores
+
+    assert sqlite.all_quests() == text.all_quests()
+    assert sqlite.all_items() == text.all_items()
+    assert sqlite.get_item("iron_sword") == text.get_item("iron_sword")
+
+def test_backends_agree_on_queries(stores):
+    """Test the indexed queries against the text scans"""
+    text, sqlite = stores
+
+    assert by_id(sqlite.quests_by_level(2, 3), "quest_id") == by_id(text.quests_by_level(2, 3), "quest_id")
+    assert by_id(sqlite.quests_requiring("first_steps"), "quest_id") == \
+        by_id(text.quests_requiring("first_steps"), "quest_id")
+    assert by_id(sqlite.items_by_type("armor"), "item_id") == by_id(text.items_by_type("armor"), "item_id")
+    assert by_id(sqlite.items_in_cost_range(50, 150, "consumable"), "item_id") == \
+        by_id(text.items_in_cost_range(50, 150, "consumable"), "item_id")
+
+def test_store_errors(stores, tmp_path):
+    """Test missing records and a missing database"""
+    text, sqlite = stores
+
+    for store in (text, sqlite):
+        with pytest.raises(QuestNotFoundError):
+            store.get_quest("fake_quest")
+        with pytest.raises(ItemNotFoundError):
+            store.get_item("fake_item")
+
+    with pytest.raises(MissingDataFileError):
+        content_store.ContentStore("sqlite", db_path=str(tmp_path / "nope.db"))
+    with pytest.raises(ValueError):
+        content_store.ContentStore("postgres")
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,202 @@
+"""
+Test Data Loading
+Tests for the faster data loading paths in game_data
+"""
+
+import pytest
+import sys
+import os
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import game_data
+from custom_exceptions import (
+    InvalidDataFormatError,
+    CorruptedDataError,
+    MissingDataFileError,
+    QuestNotFoundError
+)
+
+QUEST_TEXT = """QUEST_ID: first_steps
+TITLE: First Steps
+DESCRIPTION: Begin your adventure
+REWARD_XP: 50
+REWARD_GOLD: 25
+REQUIRED_LEVEL: 1
+PREREQUISITE: NONE
+
+QUEST_ID: goblin_hunter
+TITLE: Goblin Hunter
+DESCRIPTION: Defeat 3 goblins
+REWARD_XP: 100
+REWARD_GOLD: 75
+REQUIRED_LEVEL: 2
+PREREQUISITE: first_steps
+"""
+
+ITEM_TEXT = """ITEM_ID: health_potion
+NAME: Health Potion
+TYPE: consumable
+EFFECT: health:20
+COST: 25
+DESCRIPTION: Restores 20 health points
+
+ITEM_ID: iron_sword
+NAME: Iron Sword
+TYPE: weapon
+EFFECT: strength:5
+COST: 100
+DESCRIPTION: A sturdy iron sword
+"""
+
+def write_file(path, text):
+    with open(path, "w") as f:
+        f.write(text)
+    return str(path)
+
+# ============================================================================
+# COMPILED CACHE TESTS
+# ============================================================================
+
+def test_cache_written_and_reused(tmp_path):
+    """Test that a second load comes straight from the cache file"""
+    quest_file = write_file(tmp_path / "quests.txt", QUEST_TEXT)
+
+    first = game_data.load_quests(quest_file)
+    assert os.path.exists(game_data.get_cache_path(quest_file))
+
+    cached = game_data.read_data_cache(quest_file, "quests")
+    assert cached == first
+    assert game_data.load_quests(quest_file) == first
+
+def test_stale_cache_is_rebuilt(tmp_path):
+    """Test that editing the source file invalidates the cache"""
+    quest_file = write_file(tmp_path / "quests.txt", QUEST_TEXT)
+    game_data.load_quests(quest_file)
+
+    write_file(quest_file, QUEST_TEXT.replace("REWARD_XP: 50", "REWARD_XP: 55"))
+    quests = game_data.load_quests(quest_file)
+
+    assert quests["first_steps"]["reward_xp"] == 55
+    assert game_data.read_data_cache(quest_file, "quests")["first_steps"]["reward_xp"] == 55
+
+def test_cache_kind_is_checked(tmp_path):
+    """Test that an items cache is never handed back for quests"""
+    item_file = write_file(tmp_path / "items.txt", ITEM_TEXT)
+    items = game_data.load_items(item_file)
+
+    assert game_data.read_data_cache(item_file, "items") == items
+    assert game_data.read_data_cache(item_file, "quests") is None
+
+def test_bad_file_is_not_cached(tmp_path):
+    """Test that a failed parse never leaves a cache behind"""
+    bad_file = write_file(tmp_path / "bad.txt", "This is not valid quest data")
+
+    with pytest.raises(InvalidDataFormatError):
+        game_data.load_quests(bad_file)
+    assert not os.path.exists(game_data.get_cache_path(bad_file))
+
+# ============================================================================
+# STREAMING PARSER TESTS
+# ============================================================================
+
+def test_iter_quests_yields_one_at_a_time(tmp_path):
+    """Test that iter_quests is a generator giving quest dicts"""
+    quest_file = write_file(tmp_path / "quests.txt", QUEST_TEXT)
+
+    quests = game_data.iter_quests(quest_file)
+    first = next(quests)
+    assert first["quest_id"] == "first_steps"
+    assert first["reward_xp"] == 50
+    assert [q["quest_id"] for q in quests] == ["goblin_hunter"]
+
+def test_iter_items_matches_load_items(tmp_path):
+    """Test that load_items is built from the same records iter_items yields"""
+    item_file = write_file(tmp_path / "items.txt", ITEM_TEXT)
+
+    items = list(game_data.iter_items(item_file))
+    assert {item["item_id"]: item for item in items} == game_data.load_items(item_file, use_cache=False)
+
+def test_bad_block_reports_line_number(tmp_path):
+    """Test that the error points at the line where the bad block starts"""
+    bad_text = ITEM_TEXT.replace("COST: 100", "COST: lots")
+    item_file = write_file(tmp_path / "items.txt", bad_text)
+
+    with pytest.raises(InvalidDataFormatError) as info:
+        list(game_data.iter_items(item_file))
+    assert info.value.line_number == 8
+    assert "line 8" in str(info.value)
+
+def test_unreadable_file_is_corrupted(tmp_path):
+    """Test that undecodable bytes raise CorruptedDataError"""
+    quest_file = tmp_path / "quests.txt"
+    quest_file.write_bytes(b"QUEST_ID: \xff\xfe\xfa\n")
+
+    with pytest.raises(CorruptedDataError):
+        game_data.load_quests(str(quest_file), use_cache=False)
+
+# ============================================================================
+# CONTENT PACK TESTS
+# ============================================================================
+
+def make_pack(root):
+    os.makedirs(root / "quests")
+    os.makedirs(root / "items")
+    first, second = QUEST_TEXT.split("\n\n")
+    write_file(root / "quests" / "a.txt", first)
+    write_file(root / "quests" / "b.txt", second)
+    write_file(root / "items" / "a.txt", ITEM_TEXT)
+    return str(root)
+
+def test_content_pack_merges_shards(tmp_path):
+    """Test that shards are merged and cross-shard prerequisites are fine"""
+    pack = game_data.load_content_pack(make_pack(tmp_path), workers=2)
+
+    assert set(pack["quests"]) == {"first_steps", "goblin_hunter"}
+    assert set(pack["items"]) == {"health_potion", "iron_sword"}
+    assert pack == game_data.load_content_pack(str(tmp_path), workers=1)
+
+def test_content_pack_duplicate_ids(tmp_path):
+    """Test that the same ITEM_ID in two shards is rejected"""
+    make_pack(tmp_path)
+    write_file(tmp_path / "items" / "b.txt", ITEM_TEXT)
+
+    with pytest.raises(InvalidDataFormatError) as info:
+        game_data.load_content_pack(str(tmp_path), workers=1)
+    assert "Duplicate ITEM_ID" in str(info.value)
+
+def test_content_pack_missing_prerequisite(tmp_path):
+    """Test that prerequisites are validated on the merged quests"""
+    make_pack(tmp_path)
+    os.remove(tmp_path / "quests" / "a.txt")
+
+    with pytest.raises(QuestNotFoundError):
+        game_data.load_content_pack(str(tmp_path), workers=1)
+
+def test_content_pack_missing_directory(tmp_path):
+    """Test that a missing pack directory raises MissingDataFileError"""
+    with pytest.raises(MissingDataFileError):
+        game_data.load_content_pack(str(tmp_path / "nope"))
+
+# ============================================================================
+# COMPILED EFFECT TESTS
+# ============================================================================
+
+def test_items_have_compiled_effects(tmp_path):
+    """Test that loaded items carry their effects as (stat, value) tuples"""
+    item_file = write_file(tmp_path / "items.txt", ITEM_TEXT)
+    items = game_data.load_items(item_file)
+
+    assert items["iron_sword"]["effects"] == (("strength", 5),)
+    assert items["iron_sword"]["effect"] == "strength:5"
+
+def test_compile_multiple_effects():
+    """Test that comma separated effects compile to several modifiers"""
+    assert game_data.compile_item_effect("strength:5,magic:2") == (("strength", 5), ("magic", 2))
+    assert game_data.compile_item_effect("strength: 5") == (("strength", 5),)
+
+    with pytest.raises(InvalidDataFormatError):
+        game_data.compile_item_effect("strength:lots")
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
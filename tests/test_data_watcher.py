@@ -0,0 +1,114 @@
+"""
+Test Data Watcher
+Tests for hot-reloading quest and item data
+"""
+
+import pytest
+import sys
+import os
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import data_watcher
+import main
+from custom_exceptions import InvalidDataFormatError
+
+QUEST_BLOCK = """QUEST_ID: {quest_id}
+TITLE: {title}
+DESCRIPTION: Test quest
+REWARD_XP: 50
+REWARD_GOLD: 25
+REQUIRED_LEVEL: 1
+PREREQUISITE: NONE
+"""
+
+ITEM_BLOCK = """ITEM_ID: health_potion
+NAME: Health Potion
+TYPE: consumable
+EFFECT: health:20
+COST: 25
+DESCRIPTION: Restores 20 health points
+"""
+
+def write_quests(path, titles):
+    blocks = [QUEST_BLOCK.format(quest_id=quest_id, title=title) for quest_id, title in titles]
+    path.write_text("\n".join(blocks))
+    # make sure the stat changes even on coarse filesystem clocks
+    stats = os.stat(path)
+    os.utime(path, ns=(stats.st_atime_ns, stats.st_mtime_ns + 1000000))
+
+@pytest.fixture
+def watcher(tmp_path):
+    write_quests(tmp_path / "quests.txt", [("a", "A"), ("b", "B")])
+    (tmp_path / "items.txt").write_text(ITEM_BLOCK)
+    return data_watcher.DataWatcher(str(tmp_path / "quests.txt"), str(tmp_path / "items.txt"))
+
+def test_watcher_initial_load(watcher):
+    """Test that the watcher starts with everything loaded"""
+    assert set(watcher.quests) == {"a", "b"}
+    assert set(watcher.items) == {"health_potion"}
+    assert watcher.poll() is None
+
+def test_watcher_change_set(watcher, tmp_path):
+    """Test added, removed and modified ids after an edit"""
+    old_quests = watcher.quests
+    untouched = watcher.quests["a"]
+    write_quests(tmp_path / "quests.txt", [("a", "A"), ("b", "B2"), ("c", "C")])
+
+    changes = watcher.poll()
+
+    assert changes["quests"] == {"added": ["c"], "removed": [], "modified": ["b"]}
+    assert changes["items"] == {"added": [], "removed": [], "modified": []}
+    assert watcher.quests["b"]["title"] == "B2"
+    assert watcher.quests["a"] is untouched  # not re-parsed
+    assert old_quests is not watcher.quests
+    assert set(old_quests) == {"a", "b"}  # old snapshot left alone
+
+def test_watcher_keeps_old_data_on_bad_edit(watcher, tmp_path):
+    """Test that a broken edit raises and leaves the last good data"""
+    (tmp_path / "quests.txt").write_text("not a quest")
+
+    with pytest.raises(InvalidDataFormatError):
+        watcher.poll()
+    assert set(watcher.quests) == {"a", "b"}
+
+def test_watcher_on_change_callback(tmp_path):
+    """Test that on_change gets called with the change set"""
+    seen = []
+    write_quests(tmp_path / "quests.txt", [("a", "A")])
+    (tmp_path / "items.txt").write_text(ITEM_BLOCK)
+    watcher = data_watcher.DataWatcher(
+        str(tmp_path / "quests.txt"), str(tmp_path / "items.txt"),
+        on_change=lambda w, changes: seen.append(changes)
+    )
+    # the initial load isn't reported as a change
+    assert seen == []
+
+    write_quests(tmp_path / "quests.txt", [])
+    watcher.poll()
+
+    assert len(seen) == 1
+    assert seen[0]["quests"]["removed"] == ["a"]
+
+def test_game_applies_item_edits_in_place(tmp_path, monkeypatch):
+    """Test that a reload updates the game's item index without rebuilding it"""
+    write_quests(tmp_path / "quests.txt", [("a", "A")])
+    (tmp_path / "items.txt").write_text(ITEM_BLOCK)
+    for name in ("all_quests", "all_items", "item_index"):
+        monkeypatch.setattr(main, name, getattr(main, name))
+    watcher = data_watcher.DataWatcher(str(tmp_path / "quests.txt"), str(tmp_path / "items.txt"),
+                                       on_change=main.apply_data_changes)
+    main.apply_data_changes(watcher, None)
+    index = main.item_index
+
+    (tmp_path / "items.txt").write_text(ITEM_BLOCK.replace("COST: 25", "COST: 5"))
+    stats = os.stat(tmp_path / "items.txt")
+    os.utime(tmp_path / "items.txt", ns=(stats.st_atime_ns, stats.st_mtime_ns + 1000000))
+    watcher.poll()
+
+    assert main.item_index is index
+    assert [item["cost"] for item in index.sorted_by_cost()] == [5]
+    assert main.all_items["health_potion"]["cost"] == 5
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,117 @@
+"""
+Test ID Registry
+Tests for interned quest and item ids
+"""
+
+import pytest
+import sys
+import os
+from concurrent.futures import ThreadPoolExecutor
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import character_manager
+import inventory_system
+import quest_handler
+import id_registry
+
+# ============================================================================
+# REGISTRY TESTS
+# ============================================================================
+
+def test_registry_is_dense_and_stable():
+    """Test that ids get 0, 1, 2... and keep their number"""
+    registry = id_registry.IdRegistry()
+
+    assert registry.intern("a") == 0
+    assert registry.intern("b") == 1
+    assert registry.intern("a") == 0
+    assert registry.name(1) == "b"
+    assert registry.code("missing") is None
+
+def test_id_list_acts_like_list():
+    """Test the list operations the game modules use"""
+    ids = id_registry.IdList(id_registry.IdRegistry(), ["potion", "sword", "potion"])
+
+    assert ids == ["potion", "sword", "potion"]
+    assert "sword" in ids
+    assert "never_seen" not in ids
+    assert ids.count("potion") == 2
+    ids.remove("potion")
+    ids.append("shield")
+    assert ids[:] == ["sword", "potion", "shield"]
+    assert ",".join(ids) == "sword,potion,shield"
+    with pytest.raises(ValueError):
+        ids.remove("never_seen")
+
+def test_id_list_ignores_matches_across_entries():
+    """Test that a code's bytes straddling two entries isn't a hit"""
+    registry = id_registry.IdRegistry()
+    for n in range(2):
+        registry.intern(f"id_{n}")
+    ids = id_registry.IdList(registry)
+    # little endian 00 00 00 01 | 00 00 00 00 holds id_1's bytes 01 00 00 00
+    ids.codes.extend([0x01000000, 0])
+
+    assert "id_1" not in ids
+    ids.append("id_1")
+    assert "id_1" in ids
+    ids.remove("id_1")
+    assert list(ids.codes) == [0x01000000, 0]
+
+# ============================================================================
+# CHARACTER TESTS
+# ============================================================================
+
+def test_interned_character_works_with_game_modules():
+    """Test that an interned character still plays and saves normally"""
+    char = id_registry.intern_character(character_manager.create_character("InternTest", "Rogue"))
+    quests = {
+        'first_quest': {
+            'quest_id': 'first_quest', 'title': 'First', 'reward_xp': 10,
+            'reward_gold': 5, 'required_level': 1, 'prerequisite': 'NONE'
+        }
+    }
+
+    inventory_system.add_item_to_inventory(char, "health_potion")
+    quest_handler.accept_quest(char, 'first_quest', quests)
+    quest_handler.complete_quest(char, 'first_quest', quests)
+
+    assert isinstance(char['inventory'], id_registry.IdList)
+    assert inventory_system.has_item(char, "health_potion")
+    assert quest_handler.is_quest_completed(char, 'first_quest')
+    assert character_manager.validate_character_data(char)
+
+    character_manager.save_character(char)
+    try:
+        loaded = character_manager.load_character("InternTest")
+        assert loaded['inventory'] == ["health_potion"]
+        assert loaded['completed_quests'] == ["first_quest"]
+    finally:
+        character_manager.delete_character("InternTest")
+
+# ============================================================================
+# THREAD SAFETY
+# ============================================================================
+
+def test_concurrent_intern_hands_out_one_code_per_name():
+    """Test interning the same new ids from many threads at once"""
+    registry = id_registry.IdRegistry()
+    names = [f"threaded_{n}" for n in range(2000)]
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        results = list(pool.map(lambda name: registry.intern(name), names * 4))
+    assert len(registry) == 2000
+    for name, code in zip(names * 4, results):
+        assert registry.name(code) == name
+
+def test_idlist_copy_stays_an_idlist():
+    """Test copy() keeps the compact form"""
+    ids = id_registry.IdList(id_registry.QUEST_IDS, ["a", "b", "a"])
+    clone = ids.copy()
+    assert isinstance(clone, id_registry.IdList)
+    clone.remove("a")
+    assert list(clone) == ["b", "a"] and list(ids) == ["a", "b", "a"]
+    assert "b" in clone and "c" not in clone
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,163 @@
+"""
+Test Inventory System
+Tests for item effects and inventory storage in inventory_system
+"""
+
+import pytest
+import sys
+import os
+import copy
+import json
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import character_manager
+import inventory_system
+import save_journal
+from inventory import Inventory
+from custom_exceptions import InventoryFullError
+
+# ============================================================================
+# ITEM EFFECT TESTS
+# ============================================================================
+
+def test_equip_with_multiple_effects():
+    """Test that every modifier of a multi-stat item gets applied and removed"""
+    char = character_manager.create_character("EffectTest", "Mage")
+    staff = {'type': 'weapon', 'name': 'Odd Staff', 'effect': 'strength:5,magic:2',
+             'effects': (('strength', 5), ('magic', 2))}
+    char['game_data'] = {'items': {'odd_staff': staff}}
+    strength, magic = char['strength'], char['magic']
+
+    inventory_system.add_item_to_inventory(char, "odd_staff")
+    message = inventory_system.equip_weapon(char, "odd_staff", staff)
+
+    assert char['strength'] == strength + 5
+    assert char['magic'] == magic + 2
+    assert message == "Equipped Odd Staff! strength increased by 5 and magic increased by 2!"
+
+    inventory_system.unequip_weapon(char)
+    assert char['strength'] == strength
+    assert char['magic'] == magic
+
+def test_effect_string_still_works():
+    """Test that item dicts without compiled effects still work"""
+    char = {'inventory': ['health_potion'], 'health': 50, 'max_health': 100}
+    potion = {'type': 'consumable', 'name': 'Health Potion', 'effect': 'health:20'}
+
+    message = inventory_system.use_item(char, "health_potion", potion)
+
+    assert char['health'] == 70
+    assert message == "Used Health Potion! health increased by 20!"
+
+# ============================================================================
+# INVENTORY TYPE TESTS
+# ============================================================================
+
+def test_inventory_acts_like_a_list():
+    """Test Inventory answers the list operations callers use"""
+    inventory = Inventory(["potion", "sword", "potion"])
+    assert len(inventory) == 3
+    assert "sword" in inventory and "shield" not in inventory
+    assert inventory.count("potion") == 2
+    # order matters, like a list
+    assert inventory == ["potion", "sword", "potion"]
+    assert inventory != ["sword", "potion", "potion"]
+    assert inventory[-1] == "potion" and inventory[:2] == ["potion", "sword"]
+
+    # remove takes the first copy, pop the last slot
+    inventory.append("shield")
+    inventory.remove("potion")
+    assert list(inventory) == ["sword", "potion", "shield"]
+    assert inventory.pop() == "shield" and inventory.pop(0) == "sword"
+    inventory.insert(0, "bow")
+    inventory[1] = "axe"
+    assert inventory == ["bow", "axe"] and "potion" not in inventory
+    with pytest.raises(ValueError):
+        inventory.remove("potion")
+    del inventory[0]
+    assert inventory.pop() == "axe" and inventory == []
+
+def test_inventory_is_a_real_list():
+    """Test the list features callers expect, and counts staying right"""
+    inventory = Inventory(["sword", "potion", "sword"], capacity=5)
+    assert isinstance(inventory, list)
+    assert json.dumps(inventory) == '["sword", "potion", "sword"]'
+    assert inventory + ["bow"] == ["sword", "potion", "sword", "bow"]
+    assert inventory * 2 == ["sword", "potion", "sword"] * 2
+
+    inventory.sort()
+    assert inventory == ["potion", "sword", "sword"]
+    inventory += ["bow"]
+    inventory *= 2
+    del inventory[1:4]
+    inventory[0:1] = ["axe", "axe"]
+    assert inventory.count("axe") == 2 and inventory.count("sword") == 2
+    assert inventory.count("potion") == 1 and "bow" in inventory
+    assert inventory.item_counts() == {item_id: list(inventory).count(item_id) for item_id in set(inventory)}
+
+    for clone in (inventory.copy(), copy.copy(inventory), copy.deepcopy(inventory)):
+        assert isinstance(clone, Inventory) and clone.capacity == 5
+        assert clone == inventory and clone.count("axe") == 2
+
+def test_new_characters_and_saves_use_inventory(tmp_path):
+    """Test created and loaded characters get an Inventory back"""
+    char = character_manager.create_character("Bag", "Rogue")
+    assert isinstance(char['inventory'], Inventory)
+    char['inventory'].extend(["health_potion", "iron_sword", "health_potion"])
+    for save_format in ("text", "binary"):
+        character_manager.save_character(char, str(tmp_path), save_format)
+        loaded = character_manager.load_character("Bag", str(tmp_path))
+        assert isinstance(loaded['inventory'], Inventory)
+        assert loaded['inventory'].count("health_potion") == 2
+        assert loaded == char
+
+def test_inventory_capacity():
+    """Test inventory_system checks an Inventory's own capacity"""
+    char = {'inventory': Inventory(capacity=3)}
+    for _ in range(3):
+        inventory_system.add_item_to_inventory(char, "coin")
+    assert inventory_system.get_inventory_space_remaining(char) == 0
+    with pytest.raises(InventoryFullError):
+        inventory_system.add_item_to_inventory(char, "coin")
+
+    removed = inventory_system.clear_inventory(char)
+    assert removed == ["coin", "coin", "coin"]
+    assert isinstance(char['inventory'], Inventory) and char['inventory'].capacity == 3
+
+    bank = {'inventory': Inventory(capacity=10000)}
+    for n in range(50):
+        inventory_system.add_item_to_inventory(bank, f"item_{n % 5}")
+    assert inventory_system.count_item(bank, "item_3") == 10
+    assert inventory_system.get_inventory_space_remaining(bank) == 9950
+
+@pytest.mark.parametrize("save_format", ["text", "binary"])
+def test_inventory_capacity_survives_saving(tmp_path, save_format):
+    """Test a bank's capacity comes back from a save and a journal replay"""
+    char = character_manager.create_character("Banker", "Rogue")
+    char['inventory'] = Inventory([f"item_{n % 5}" for n in range(50)], capacity=10000)
+    character_manager.save_character(char, str(tmp_path), save_format)
+
+    loaded = character_manager.load_character("Banker", str(tmp_path))
+    assert loaded['inventory'].capacity == 10000
+    assert list(loaded['inventory']) == list(char['inventory'])
+    assert inventory_system.get_inventory_space_remaining(loaded) == 9950
+
+    with save_journal.CharacterJournal(str(tmp_path), save_format=save_format) as journal:
+        journal.track(loaded)
+        inventory_system.add_item_to_inventory(loaded, "gem")
+        inventory_system.clear_inventory(loaded)
+    replayed = character_manager.load_character("Banker", str(tmp_path))
+    assert replayed['inventory'].capacity == 10000
+    assert len(replayed['inventory']) == 0
+
+def test_display_inventory_from_counts():
+    """Test display_inventory with an Inventory"""
+    char = {'inventory': Inventory(["health_potion", "iron_sword", "health_potion"])}
+    items = {"health_potion": {"name": "Health Potion", "type": "consumable"}}
+    text = inventory_system.display_inventory(char, items)
+    assert "Health Potion | x2 (consumable)" in text
+    assert "iron_sword | x1 (Unknown)" in text
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,125 @@
+"""
+Test Item Catalog
+Tests for the item catalog types in item_catalog
+"""
+
+import pytest
+import sys
+import os
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import game_data
+import inventory_system
+import item_catalog
+from custom_exceptions import InvalidDataFormatError, MissingDataFileError
+
+DATA_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "data")
+ITEM_FILE = os.path.join(DATA_DIR, "items.txt")
+
+# ============================================================================
+# LAZY ITEM CATALOG TESTS
+# ============================================================================
+
+def test_lazy_catalog_matches_load_items():
+    """Test that the lazy catalog gives the same items as load_items"""
+    expected = game_data.load_items(ITEM_FILE, use_cache=False)
+
+    with item_catalog.LazyItemCatalog(ITEM_FILE) as catalog:
+        assert len(catalog) == len(expected)
+        assert set(catalog) == set(expected)
+        assert catalog.parsed_count() == 0
+        assert dict(catalog.items()) == expected
+
+def test_lazy_catalog_parses_on_first_lookup():
+    """Test that items are parsed once and then reused"""
+    with item_catalog.LazyItemCatalog(ITEM_FILE) as catalog:
+        assert "iron_sword" in catalog
+        assert catalog.parsed_count() == 0
+
+        sword = catalog["iron_sword"]
+        assert sword["cost"] == 100
+        assert catalog["iron_sword"] is sword
+        assert catalog.parsed_count() == 1
+        assert catalog.get("missing_item") is None
+
+def test_lazy_catalog_works_with_inventory():
+    """Test that inventory functions accept the catalog like a dict"""
+    char = {'inventory': [], 'gold': 500}
+
+    with item_catalog.LazyItemCatalog(ITEM_FILE) as catalog:
+        inventory_system.purchase_item(char, "iron_sword", catalog["iron_sword"])
+        text = inventory_system.display_inventory(char, catalog)
+
+    assert char['gold'] == 400
+    assert "Iron Sword | x1 (weapon)" in text
+
+def test_lazy_catalog_errors(tmp_path):
+    """Test missing files and bad blocks raise the data exceptions"""
+    with pytest.raises(MissingDataFileError):
+        item_catalog.LazyItemCatalog(str(tmp_path / "nope.txt"))
+
+    bad_file = tmp_path / "items.txt"
+    bad_file.write_text("ITEM_ID: broken\nNAME: Broken\nTYPE: weapon\n")
+    with item_catalog.LazyItemCatalog(str(bad_file)) as catalog:
+        with pytest.raises(InvalidDataFormatError):
+            catalog["broken"]
+
+# ============================================================================
+# ITEM INDEX TESTS
+# ============================================================================
+
+def test_item_index_queries():
+    """Test type, stat and cost range queries against a full scan"""
+    items = game_data.load_items(ITEM_FILE, use_cache=False)
+    index = item_catalog.ItemIndex(items)
+
+    weapons = index.items_by_type("weapon")
+    assert [item["item_id"] for item in weapons] == ["iron_sword", "fire_staff", "steel_sword"]
+
+    magic = {item["item_id"] for item in index.items_with_stat("magic")}
+    assert magic == {"fire_staff", "magic_robe", "wisdom_elixir"}
+
+    cheap_weapons = index.items_in_cost_range(max_cost=200, item_type="weapon")
+    assert [item["item_id"] for item in cheap_weapons] == ["iron_sword", "fire_staff"]
+
+    in_range = index.items_in_cost_range(50, 100)
+    expected = [item for item in items.values() if 50 <= item["cost"] <= 100]
+    assert sorted(item["item_id"] for item in in_range) == sorted(item["item_id"] for item in expected)
+    assert [item["cost"] for item in index.sorted_by_cost()] == sorted(item["cost"] for item in items.values())
+
+def test_item_index_incremental_updates():
+    """Test that adding, replacing and removing items keeps indexes right"""
+    items = game_data.load_items(ITEM_FILE, use_cache=False)
+    index = item_catalog.ItemIndex(items)
+
+    bow = {"item_id": "bow", "type": "weapon", "cost": 60, "effect": "strength:2",
+           "effects": (("strength", 2),)}
+    index.add_item(bow)
+    assert bow in index.items_in_cost_range(60, 60)
+
+    cheaper_bow = dict(bow, cost=10, effect="magic:1", effects=(("magic", 1),))
+    index.add_item(cheaper_bow)
+    assert index.items_in_cost_range(60, 60) == []
+    assert cheaper_bow in index.items_with_stat("magic")
+    assert cheaper_bow not in index.items_with_stat("strength")
+
+    assert index.remove_item("bow")
+    assert len(index) == len(items)
+    assert not index.remove_item("bow")
+
+def test_item_index_copy_is_independent():
+    """Test changes to a copied index leave the original alone"""
+    items = game_data.load_items(ITEM_FILE, use_cache=False)
+    index = item_catalog.ItemIndex(items)
+    clone = index.copy()
+    some_id = next(iter(items))
+    clone.remove_item(some_id)
+    clone.add_item({"item_id": "bow", "type": "weapon", "cost": 60, "effect": "strength:2",
+                    "effects": (("strength", 2),)})
+    assert len(index) == len(items) and some_id in index.items
+    assert "bow" not in index.items
+    assert [item["item_id"] for item in index.sorted_by_cost()].count("bow") == 0
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
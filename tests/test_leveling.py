@@ -0,0 +1,94 @@
+"""
+Test Leveling
+Property tests: the closed-form gain_experience must match the old
+one-level-at-a-time loop exactly
+"""
+
+import pytest
+import sys
+import os
+import random
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import character_manager
+from custom_exceptions import CharacterDeadError
+
+def reference_gain_experience(character, xp_amount):
+    # the original loop, kept here as the spec
+    level_up_xp = character['level'] * 100
+    character['experience'] += xp_amount
+    while character['experience'] >= level_up_xp:
+        character['experience'] -= level_up_xp
+        character['level'] += 1
+        character['max_health'] += 10
+        character['strength'] += 2
+        character['magic'] += 2
+        character['health'] = character['max_health']
+        level_up_xp = character['level'] * 100
+
+def random_character(rng, level, experience):
+    char = character_manager.create_character("Prop", rng.choice(["Warrior", "Mage", "Rogue", "Cleric"]))
+    char['level'] = level
+    char['experience'] = experience
+    char['health'] = rng.randint(1, char['max_health'])
+    return char
+
+def check_same(char, xp_amount):
+    expected = dict(char)
+    reference_gain_experience(expected, xp_amount)
+    character_manager.gain_experience(char, xp_amount)
+    assert char == expected
+    for key in ('level', 'experience', 'max_health', 'health'):
+        assert type(char[key]) is type(expected[key])
+
+# ============================================================================
+# PROPERTY TESTS
+# ============================================================================
+
+def test_matches_loop_small_values():
+    """Test every small level/xp combination exhaustively"""
+    rng = random.Random(0)
+    for level in range(0, 30):
+        for experience in range(-150, 400, 7):
+            for xp_amount in (0, 1, 99, 100, 101, 250, 4999, 5000):
+                check_same(random_character(rng, level, experience), xp_amount)
+
+def test_matches_loop_random_large_grants():
+    """Test seeded random grants up to and past level 1000"""
+    rng = random.Random(163)
+    for _ in range(300):
+        level = rng.randint(0, 1200)
+        experience = rng.randint(0, level * 100)
+        xp_amount = rng.choice([rng.randint(0, 10 ** 4), rng.randint(0, 10 ** 8), rng.randint(0, 10 ** 9)])
+        check_same(random_character(rng, level, experience), xp_amount)
+
+def test_matches_loop_exact_thresholds():
+    """Test grants that land exactly on a level boundary and one short"""
+    rng = random.Random(7)
+    for _ in range(200):
+        level = rng.randint(1, 500)
+        levels = rng.randint(1, 300)
+        cost = 100 * (levels * level + levels * (levels - 1) // 2)
+        for xp_amount in (cost - 1, cost, cost + 1):
+            check_same(random_character(rng, level, 0), xp_amount)
+
+def test_falls_back_to_loop_for_odd_values():
+    """Test negative levels and float xp/stats still follow the loop"""
+    rng = random.Random(1)
+    check_same(random_character(rng, -3, 0), 250)
+    check_same(random_character(rng, 2, 0), 1234.5)
+    char = random_character(rng, 2, 0)
+    char['strength'] = 0.1
+    check_same(char, 100000)
+
+def test_dead_character_still_raises():
+    """Test the health check happens before any xp is added"""
+    char = character_manager.create_character("Prop", "Mage")
+    char['health'] = 0
+    with pytest.raises(CharacterDeadError):
+        character_manager.gain_experience(char, 10 ** 9)
+    assert char['experience'] == 0
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
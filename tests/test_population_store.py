@@ -0,0 +1,120 @@
+"""
+Test Population Store
+Tests that the batch operations match the per-character functions
+"""
+
+import pytest
+import sys
+import os
+import random
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import character_manager
+import inventory_system
+from inventory import Inventory
+from population_store import PopulationStore
+from custom_exceptions import CharacterDeadError, CharacterNotFoundError
+
+def make_population(count, seed=0):
+    rng = random.Random(seed)
+    characters = []
+    for n in range(count):
+        char = character_manager.create_character(f"Pop{n}", rng.choice(["Warrior", "Mage", "Rogue", "Cleric"]))
+        char['level'] = rng.randint(1, 40)
+        char['experience'] = rng.randint(0, 500)
+        char['health'] = rng.choice([0, -5, rng.randint(1, char['max_health'])])
+        char['gold'] = rng.randint(0, 300)
+        characters.append(char)
+    return characters
+
+# ============================================================================
+# BATCH OPERATION TESTS
+# ============================================================================
+
+def test_batch_ops_match_single_functions():
+    """Test heal/gain_experience/revive against the per-character versions"""
+    characters = make_population(300)
+    store = PopulationStore(characters)
+
+    for char in characters:
+        character_manager.heal_character(char, 15)
+    store.heal(15)
+
+    dead_rows = []
+    for row, char in enumerate(characters):
+        try:
+            character_manager.gain_experience(char, 12345)
+        except CharacterDeadError:
+            dead_rows.append(row)
+    assert store.gain_experience(12345) == dead_rows
+
+    assert store.dead_rows() == [row for row, char in enumerate(characters)
+                                 if character_manager.is_character_dead(char)]
+    revived = sum(1 for char in characters if character_manager.revive_character(char))
+    assert store.revive() == revived
+
+    assert store.characters() == characters
+
+def test_batch_ops_on_some_rows():
+    """Test that rows= limits the operation"""
+    characters = make_population(20, seed=3)
+    store = PopulationStore(characters)
+    rows = [1, 5, 7]
+
+    healed = sum(character_manager.heal_character(characters[row], 1000) for row in rows)
+    assert store.heal(1000, rows) == healed
+    store.add_gold(10, rows)
+    for row in rows:
+        character_manager.add_gold(characters[row], 10)
+    assert store.characters() == characters
+
+def test_add_gold_reports_broke_rows():
+    """Test that going below 0 gold still raises, after adding"""
+    store = PopulationStore(make_population(5))
+    with pytest.raises(ValueError):
+        store.add_gold(-10 ** 6)
+    assert all(gold < 0 for gold in store.columns['gold'])
+
+# ============================================================================
+# VIEW TESTS
+# ============================================================================
+
+def test_view_reads_and_writes_columns():
+    """Test a view works with the normal game functions"""
+    store = PopulationStore(make_population(3))
+    view = store.view(store.row("Pop1"))
+
+    view['health'] = 1
+    character_manager.heal_character(view, 5)
+    inventory_system.add_item_to_inventory(view, "health_potion")
+    assert store.character(1)['health'] == 6
+    assert store.character(1)['inventory'] == ["health_potion"]
+
+    with pytest.raises(KeyError):
+        view['xp'] = 1
+    with pytest.raises(CharacterNotFoundError):
+        store.row("Nobody")
+
+def test_character_is_a_detached_copy():
+    """Test that materialised dicts don't write back"""
+    store = PopulationStore(make_population(2))
+    char = store.character(0)
+    char['gold'] = -1
+    char['inventory'].append("x")
+    assert store.character(0)['gold'] != -1
+    assert store.character(0)['inventory'] == []
+
+def test_store_keeps_inventory_capacity():
+    """Test that an Inventory and its capacity go in and come back out"""
+    bank = character_manager.create_character("Bank", "Rogue")
+    bank['inventory'] = Inventory(["gem", "coin"], capacity=10000)
+    store = PopulationStore([bank])
+
+    for inventory in (store.view(0)['inventory'], store.character(0)['inventory']):
+        assert isinstance(inventory, Inventory)
+        assert inventory.capacity == 10000 and inventory == ["gem", "coin"]
+    assert store.character(0)['inventory'] is not store.view(0)['inventory']
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
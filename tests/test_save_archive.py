@@ -0,0 +1,157 @@
+"""
+Test Save Archive
+Tests for packing many characters into one archive file
+"""
+
+import pytest
+import sys
+import os
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import character_manager
+import save_archive
+from save_archive import SaveArchive
+from custom_exceptions import CharacterNotFoundError, SaveFileCorruptedError
+
+def make_character(name, gold=100):
+    char = character_manager.create_character(name, "Warrior")
+    char['inventory'] = ["health_potion"] * 3
+    char['completed_quests'] = [f"quest_{i}" for i in range(30)]
+    char['gold'] = gold
+    return char
+
+# ============================================================================
+# ARCHIVE TESTS
+# ============================================================================
+
+@pytest.mark.parametrize("compress", [False, True])
+def test_archive_through_character_manager(tmp_path, compress):
+    """Test save/load/list/delete with an archive in place of a directory"""
+    path = str(tmp_path / "saves.qca")
+    with SaveArchive(path, compress=compress) as archive:
+        for n in range(5):
+            character_manager.save_character(make_character(f"A{n}", n), archive)
+        character_manager.save_character(make_character("A2", 999), archive)
+        character_manager.delete_character("A4", archive)
+
+        assert character_manager.list_saved_characters(archive) == ["A0", "A1", "A2", "A3"]
+        assert character_manager.load_character("A2", archive)['gold'] == 999
+        with pytest.raises(CharacterNotFoundError):
+            character_manager.load_character("A4", archive)
+
+    assert os.listdir(tmp_path) == ["saves.qca"]
+
+    # everything comes back from the tail index after reopening
+    with SaveArchive(path, compress=compress) as archive:
+        assert archive.list_saved_characters() == ["A0", "A1", "A2", "A3"]
+        assert archive.load_character("A2") == make_character("A2", 999)
+
+def test_archive_batch_save(tmp_path):
+    """Test save_characters writes a batch in one block"""
+    with SaveArchive(str(tmp_path / "saves.qca")) as archive:
+        assert archive.save_characters([make_character(f"B{n}") for n in range(50)]) == 50
+        assert len(archive) == 50
+        assert archive.load_character("B49")['name'] == "B49"
+
+def test_archive_repacks_old_copies(tmp_path, monkeypatch):
+    """Test that rewriting the same characters triggers a repack"""
+    monkeypatch.setattr(save_archive, "REPACK_MIN_BYTES", 0)
+    path = tmp_path / "saves.qca"
+    with SaveArchive(str(path), sync=False) as archive:
+        for gold in range(40):
+            archive.save_characters([make_character(f"R{n}", gold) for n in range(3)])
+        assert path.stat().st_size <= 2 * archive.live_bytes + 1024
+        assert archive.load_character("R1")['gold'] == 39
+
+    with SaveArchive(str(path)) as archive:
+        assert archive.load_character("R2")['gold'] == 39
+
+def test_archive_explicit_repack_keeps_everything(tmp_path):
+    """Test repack drops deleted and old records but nothing live"""
+    path = tmp_path / "saves.qca"
+    with SaveArchive(str(path)) as archive:
+        archive.save_characters([make_character(f"C{n}") for n in range(10)])
+        archive.save_characters([make_character(f"C{n}", 5) for n in range(10)])
+        archive.delete_character("C0")
+        before = path.stat().st_size
+        archive.repack()
+        assert path.stat().st_size < before
+        assert archive.list_saved_characters() == [f"C{n}" for n in range(1, 10)]
+        assert archive.load_character("C9")['gold'] == 5
+
+def test_archive_recovers_from_torn_write(tmp_path):
+    """Test a half-written last block is dropped on open"""
+    path = tmp_path / "saves.qca"
+    with SaveArchive(str(path)) as archive:
+        archive.save_character(make_character("Safe"))
+    good_size = path.stat().st_size
+    with open(path, "ab") as f:
+        f.write(b"\x01" * 37 + save_archive.FOOTER_MAGIC[:2])
+
+    with SaveArchive(str(path)) as archive:
+        assert archive.list_saved_characters() == ["Safe"]
+        assert path.stat().st_size == good_size
+        archive.save_character(make_character("Next"))
+    with SaveArchive(str(path)) as archive:
+        assert archive.list_saved_characters() == ["Next", "Safe"]
+
+def test_archive_writes_over_junk_after_last_block(tmp_path):
+    """Test junk that shows up while open doesn't end up in the block chain"""
+    path = tmp_path / "saves.qca"
+    with SaveArchive(str(path)) as archive:
+        archive.save_character(make_character("Safe"))
+        with open(path, "ab") as f:
+            f.write(b"\x07" * 40)
+        archive.save_character(make_character("Next"))
+
+    with SaveArchive(str(path)) as archive:
+        assert archive.list_saved_characters() == ["Next", "Safe"]
+        assert archive.load_character("Safe")['gold'] == 100
+
+def test_archive_failed_write_is_undone(tmp_path, monkeypatch):
+    """Test a write that fails partway is cut back off the file"""
+    path = tmp_path / "saves.qca"
+    with SaveArchive(str(path)) as archive:
+        archive.save_character(make_character("Safe"))
+        good_size = path.stat().st_size
+
+        def crash(fd):
+            raise OSError("disk on fire")
+        monkeypatch.setattr(os, "fsync", crash)
+        with pytest.raises(OSError):
+            archive.save_character(make_character("Lost"))
+        monkeypatch.undo()
+        assert path.stat().st_size == good_size
+
+        archive.save_character(make_character("Next"))
+    with SaveArchive(str(path)) as archive:
+        assert archive.list_saved_characters() == ["Next", "Safe"]
+
+def test_archive_broken_older_block(tmp_path, monkeypatch):
+    """Test a chain pointing at a bad footer raises and closes the file"""
+    path = tmp_path / "saves.qca"
+    with SaveArchive(str(path)) as archive:
+        archive.save_character(make_character("Old"))
+        first_end = path.stat().st_size
+        archive.save_character(make_character("New"))
+    data = bytearray(path.read_bytes())
+    data[first_end - 4:first_end] = b"JUNK"
+    path.write_bytes(bytes(data))
+
+    closed = []
+    close = SaveArchive.close
+    monkeypatch.setattr(SaveArchive, "close", lambda self: closed.append(True) or close(self))
+    with pytest.raises(SaveFileCorruptedError):
+        SaveArchive(str(path))
+    assert closed == [True]
+
+def test_not_an_archive(tmp_path):
+    """Test opening some other file fails clearly"""
+    path = tmp_path / "other.qca"
+    path.write_bytes(b"NAME: nope\n")
+    with pytest.raises(SaveFileCorruptedError):
+        SaveArchive(str(path))
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
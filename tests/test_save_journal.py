@@ -0,0 +1,157 @@
+"""
+Test Save Journal
+Tests for journaled character saves and compaction
+"""
+
+import pytest
+import sys
+import os
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import character_manager
+import character_events
+import inventory_system
+import quest_handler
+import save_journal
+import combat_system
+from custom_exceptions import SaveFileCorruptedError
+
+QUESTS = {"q1": {"quest_id": "q1", "title": "Q", "description": "d", "reward_xp": 150,
+                 "reward_gold": 40, "required_level": 1, "prerequisite": "NONE"}}
+
+def play_a_bit(char):
+    character_manager.add_gold(char, 25)
+    character_manager.gain_experience(char, 120)
+    inventory_system.add_item_to_inventory(char, "health_potion")
+    inventory_system.add_item_to_inventory(char, "iron_sword")
+    inventory_system.remove_item_from_inventory(char, "health_potion")
+    quest_handler.accept_quest(char, "q1", QUESTS)
+    quest_handler.complete_quest(char, "q1", QUESTS)
+    char['health'] = 10
+    character_manager.heal_character(char, 5)
+
+# ============================================================================
+# MUTATION HOOK TESTS
+# ============================================================================
+
+def test_mutation_hooks_see_game_changes():
+    """Test that the game APIs report what they change"""
+    seen = []
+    hook = character_events.register_mutation_hook(lambda char, op, key, value: seen.append((op, key, value)))
+    try:
+        char = character_manager.create_character("Hooked", "Rogue")
+        character_manager.add_gold(char, 5)
+        inventory_system.add_item_to_inventory(char, "health_potion")
+        quest_handler.accept_quest(char, "q1", QUESTS)
+    finally:
+        character_events.unregister_mutation_hook(hook)
+
+    assert seen == [("set", "gold", 105), ("append", "inventory", "health_potion"),
+                    ("append", "active_quests", "q1")]
+
+# ============================================================================
+# JOURNAL TESTS
+# ============================================================================
+
+def test_journal_replays_on_load(tmp_path):
+    """Test that load_character gets back every journaled change"""
+    char = character_manager.create_character("Jo", "Cleric")
+    with save_journal.CharacterJournal(str(tmp_path)) as journal:
+        journal.track(char)
+        snapshot = (tmp_path / "Jo_save.txt").read_bytes()
+        play_a_bit(char)
+        assert journal.records_written > 0
+
+    # the save itself was never rewritten, the journal carries everything
+    assert (tmp_path / "Jo_save.txt").read_bytes() == snapshot
+    assert character_manager.load_character("Jo", str(tmp_path)) == char
+
+def test_journal_keeps_combat_changes(tmp_path, monkeypatch):
+    """Test that battle rewards, damage and healing all reach the journal"""
+    char = character_manager.create_character("Jo", "Cleric")
+    with save_journal.CharacterJournal(str(tmp_path)) as journal:
+        journal.track(char)
+        enemy = combat_system.create_enemy("goblin")
+        enemy['health'] = 1
+        monkeypatch.setattr("builtins.input", lambda prompt="": "1")
+        assert combat_system.SimpleBattle(char, enemy).start_battle()['winner'] == 'player'
+
+        combat_system.SimpleBattle(char, enemy).apply_damage(char, char['health'] + 1)
+        combat_system.cleric_heal(char)
+
+    loaded = character_manager.load_character("Jo", str(tmp_path))
+    assert loaded == char
+    assert loaded['gold'] == 110
+    assert loaded['health'] == 30
+
+def test_journal_compacts_in_background(tmp_path):
+    """Test that a big journal gets folded into the save"""
+    char = character_manager.create_character("Jo", "Cleric")
+    with save_journal.CharacterJournal(str(tmp_path), compact_bytes=200) as journal:
+        journal.track(char)
+        for _ in range(30):
+            character_manager.add_gold(char, 1)
+        for _ in range(200):
+            if journal.compactions:
+                break
+            time.sleep(0.01)
+        assert journal.compactions >= 1
+        character_manager.add_gold(char, 1)
+
+    assert (tmp_path / "Jo_journal.txt").stat().st_size < 200
+    assert character_manager.load_character("Jo", str(tmp_path))['gold'] == 131
+
+def test_full_save_makes_journal_stale(tmp_path):
+    """Test that a normal save isn't double-applied with an old journal"""
+    char = character_manager.create_character("Jo", "Cleric")
+    with save_journal.CharacterJournal(str(tmp_path)) as journal:
+        journal.track(char)
+        inventory_system.add_item_to_inventory(char, "health_potion")
+        character_manager.save_character(char, str(tmp_path))
+        inventory_system.add_item_to_inventory(char, "iron_sword")
+
+    assert character_manager.load_character("Jo", str(tmp_path))['inventory'] == ["health_potion", "iron_sword"]
+
+def test_journal_point_in_time(tmp_path):
+    """Test loading the character as of an earlier time"""
+    char = character_manager.create_character("Jo", "Cleric")
+    with save_journal.CharacterJournal(str(tmp_path)) as journal:
+        journal.track(char)
+        character_manager.add_gold(char, 50)
+        time.sleep(0.01)
+        middle = time.time()
+        time.sleep(0.01)
+        character_manager.add_gold(char, 50)
+
+    assert character_manager.load_character("Jo", str(tmp_path), until=middle)['gold'] == 150
+    assert character_manager.load_character("Jo", str(tmp_path))['gold'] == 200
+
+def test_journal_torn_and_corrupt_lines(tmp_path):
+    """Test a cut-off last line is skipped but garbage is an error"""
+    char = character_manager.create_character("Jo", "Cleric")
+    with save_journal.CharacterJournal(str(tmp_path)) as journal:
+        journal.track(char)
+        character_manager.add_gold(char, 50)
+
+    path = tmp_path / "Jo_journal.txt"
+    with open(path, "a") as f:
+        f.write("123\tS\tgold")
+    assert character_manager.load_character("Jo", str(tmp_path))['gold'] == 150
+
+    with open(path, "a") as f:
+        f.write("\n123\tR\tinventory\t\"nothing\"\n")
+    with pytest.raises(SaveFileCorruptedError):
+        character_manager.load_character("Jo", str(tmp_path))
+
+def test_delete_removes_journal(tmp_path):
+    """Test delete_character cleans up the journal too"""
+    char = character_manager.create_character("Jo", "Cleric")
+    with save_journal.CharacterJournal(str(tmp_path)) as journal:
+        journal.track(char)
+    character_manager.delete_character("Jo", str(tmp_path))
+    assert not (tmp_path / "Jo_journal.txt").exists()
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,105 @@
+"""
+Test Schemas
+Tests for the compiled character/quest/item validators
+"""
+
+import pytest
+import sys
+import os
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import character_manager
+import game_data
+from character import Character
+from schemas import Schema
+from custom_exceptions import InvalidSaveDataError, InvalidDataFormatError
+
+def make_quest(**changes):
+    quest = {"quest_id": "q1", "title": "Q", "description": "d", "reward_xp": 10,
+             "reward_gold": 5, "required_level": 1, "prerequisite": "NONE"}
+    quest.update(changes)
+    return quest
+
+def make_item(**changes):
+    item = {"item_id": "sword", "name": "Sword", "type": "weapon", "effect": "strength:5",
+            "cost": 50, "description": "d"}
+    item.update(changes)
+    return item
+
+# ============================================================================
+# CHARACTER VALIDATION
+# ============================================================================
+
+def test_character_messages_match_old_validator():
+    """Test the first failing key is reported, in key order"""
+    char = character_manager.create_character("Schema", "Mage")
+    assert character_manager.validate_character_data(char)
+    assert character_manager.validate_character_data(Character.from_dict(char))
+
+    del char['gold']
+    char['level'] = "1"
+    # level comes before gold, so its type error is reported first
+    with pytest.raises(InvalidSaveDataError, match="Invalid type for level"):
+        character_manager.validate_character_data(char)
+    char['level'] = 1
+    with pytest.raises(InvalidSaveDataError, match="Missing key: gold"):
+        character_manager.validate_character_data(char)
+
+def test_validate_characters_reports_everything():
+    """Test validate_characters lists every problem in the batch"""
+    good = character_manager.create_character("Good", "Warrior")
+    bad = character_manager.create_character("Bad", "Rogue")
+    bad['gold'] = 1.5
+    del bad['inventory']
+    bad['equipped_armor'] = 3
+    assert character_manager.validate_characters([good, bad, good]) == [
+        (1, "Invalid type for gold"),
+        (1, "Missing key: inventory"),
+        (1, "Invalid type for equipped_armor")
+    ]
+    assert character_manager.validate_characters([good, good]) == []
+
+# ============================================================================
+# QUEST AND ITEM VALIDATION
+# ============================================================================
+
+def test_quest_messages():
+    """Test quest validation keeps its messages"""
+    assert game_data.validate_quest_data(make_quest())
+    quest = make_quest(reward_xp="10")
+    del quest["prerequisite"]
+    # missing fields are all checked before types
+    with pytest.raises(InvalidDataFormatError, match="Missing field in prerequisite"):
+        game_data.validate_quest_data(quest)
+    with pytest.raises(InvalidDataFormatError, match="Field 'reward_gold' must be an integer"):
+        game_data.validate_quest_data(make_quest(reward_gold=None))
+
+def test_item_messages():
+    """Test item validation keeps its messages"""
+    assert game_data.validate_item_data(make_item())
+    with pytest.raises(InvalidDataFormatError, match="Invalid item type: shield"):
+        game_data.validate_item_data(make_item(type="shield"))
+    with pytest.raises(InvalidDataFormatError, match="Cost must be an integer"):
+        game_data.validate_item_data(make_item(cost="50"))
+    with pytest.raises(InvalidDataFormatError, match="stat_name:value"):
+        game_data.validate_item_data(make_item(effect="strength 5"))
+
+def test_validate_items_keyed_by_id():
+    """Test catalog-wide validation reports problems by item id"""
+    items = {"a": make_item(item_id="a"), "b": make_item(item_id="b", type="hat", cost="x")}
+    del items["a"]["name"]
+    assert game_data.validate_items(items) == [
+        ("a", "Missing field in name."),
+        ("b", "Invalid item type: hat"),
+        ("b", "Cost must be an integer.")
+    ]
+    assert game_data.validate_quests({"q1": make_quest()}) == []
+
+def test_unknown_rule_rejected():
+    """Test a schema with a made up rule fails when built"""
+    with pytest.raises(ValueError):
+        Schema([("between", "level", (1, 10), "bad")], InvalidSaveDataError)
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,250 @@
+"""
+Test Snapshots
+Tests for undo-log character snapshots and rollback
+"""
+
+import pytest
+import sys
+import os
+import copy
+import pickle
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import character_events
+import character_manager
+import inventory_system
+import combat_system
+from character import Character
+from id_registry import QUEST_IDS, IdList, intern_character
+from inventory import Inventory
+from snapshots import snapshot, restore, rollback_on_error
+from custom_exceptions import InvalidItemTypeError, InsufficientResourcesError, InvalidDataFormatError
+
+SWORD = {"item_id": "iron_sword", "name": "Iron Sword", "type": "weapon",
+         "effect": "strength:5", "cost": 50, "description": "d"}
+PLATE = {"item_id": "plate", "name": "Plate", "type": "armor",
+         "effect": "max_health:10", "cost": 80, "description": "d"}
+
+def make_character(name="Snap"):
+    char = character_manager.create_character(name, "Warrior")
+    char['gold'] = 200
+    char['inventory'] = Inventory(["health_potion", "iron_sword"])
+    char['game_data'] = {"items": {"iron_sword": SWORD, "plate": PLATE}}
+    return char
+
+# ============================================================================
+# SNAPSHOT / RESTORE
+# ============================================================================
+
+def test_restore_puts_everything_back():
+    """Test restore undoes stat, list and new-key changes"""
+    char = make_character()
+    before = copy.deepcopy(char)
+
+    inventory = char['inventory']
+    quests = char['completed_quests']
+    snap = snapshot(char)
+    inventory_system.equip_weapon(char, "iron_sword", SWORD)
+    inventory_system.purchase_item(char, "plate", PLATE)
+    char['completed_quests'].append("first_steps")
+    char['temporary'] = True
+    assert char != before
+
+    restore(snap)
+    assert char == before
+    # the original list object is back, not a copy of it
+    assert char['inventory'] is inventory
+    assert char['completed_quests'] is quests
+
+def test_big_inventory_logs_only_its_changes():
+    """Test a snapshot of a big inventory keeps one undo step, not a copy"""
+    char = make_character()
+    char['inventory'] = Inventory([f"item_{n}" for n in range(10000)], capacity=20000)
+    snap = snapshot(char)
+    char['inventory'].append("elixir")
+    assert snap.undo == [(char['inventory'], ("pop",))]
+    snap.restore()
+    assert len(char['inventory']) == 10000 and "elixir" not in char['inventory']
+    assert not char['inventory'].watchers
+
+def test_references_stay_live_after_snapshot():
+    """Test a list fetched before a snapshot is still the character's list"""
+    char = make_character()
+    ref = char['active_quests']
+    char['inventory'].append("plate")
+    inventory_system.equip_armor(char, "plate", PLATE)
+    ref.append("q1")
+    assert char['active_quests'] == ["q1"]
+    assert type(char['active_quests']) is list
+
+    snap = snapshot(char)
+    ref.append("q2")
+    snap.restore()
+    # restored in place, so ref still sees the list
+    assert char['active_quests'] is ref and ref == ["q1"]
+
+def test_every_undo_step_restores():
+    """Test insert, pop, set, slice and sort changes all undo"""
+    char = make_character()
+    char['inventory'].extend(["a", "b", "c"])
+    char['active_quests'] = IdList(QUEST_IDS, ["q1", "q2", "q3"])
+    inventory = list(char['inventory'])
+    snap = snapshot(char)
+    for items in (char['inventory'], char['active_quests']):
+        items.insert(-1, "x")
+        items.pop(0)
+        items[-2] = "y"
+        del items[0]
+        items.remove("y")
+        items.insert(100, "z")
+        items[1:3] = ["s"]
+        items.extend(["e", "f"])
+    char['inventory'].sort()
+    char['inventory'] *= 2
+    snap.restore()
+    assert char['inventory'] == inventory
+    assert char['inventory'].item_counts() == Inventory(inventory).item_counts()
+    assert list(char['active_quests']) == ["q1", "q2", "q3"]
+
+def test_cleared_inventory_restored():
+    """Test clear_inventory swapping in a new list is undone"""
+    char = make_character()
+    snap = snapshot(char)
+    inventory_system.clear_inventory(char)
+    snap.restore()
+    assert char['inventory'] == ["health_potion", "iron_sword"]
+
+def test_nested_snapshots():
+    """Test an inner restore leaves the outer snapshot usable"""
+    char = make_character()
+    char['completed_quests'] = IdList(QUEST_IDS, ["q1"])
+    outer = snapshot(char)
+    char['inventory'].append("a")
+    char['active_quests'].append("a")
+    char['completed_quests'].remove("q1")
+    inner = snapshot(char)
+    char['inventory'].append("b")
+    char['active_quests'].append("b")
+    char['completed_quests'].append("q2")
+    inner.restore()
+    assert char['inventory'] == ["health_potion", "iron_sword", "a"]
+    assert char['active_quests'] == ["a"]
+    assert list(char['completed_quests']) == []
+    outer.restore()
+    assert char['inventory'] == ["health_potion", "iron_sword"]
+    assert char['active_quests'] == []
+    assert list(char['completed_quests']) == ["q1"]
+
+def test_restore_fires_mutation_events():
+    """Test caches/journals hear about the rollback"""
+    char = make_character()
+    seen = []
+    hook = character_events.register_mutation_hook(lambda c, op, key, value: seen.append(key))
+    try:
+        snap = snapshot(char)
+        char['gold'] = 5
+        char['inventory'].append("x")
+        seen.clear()
+        snap.restore()
+    finally:
+        character_events.unregister_mutation_hook(hook)
+    assert sorted(seen) == ["gold", "inventory"]
+
+def test_snapshot_other_character_shapes():
+    """Test Character objects and IdList fields"""
+    char = Character.from_dict(make_character("Slots"))
+    snap = snapshot(char)
+    char['inventory'].remove("health_potion")
+    char['level'] = 9
+    snap.restore()
+    assert char['inventory'] == ["health_potion", "iron_sword"] and char['level'] == 1
+
+    char = intern_character(make_character("Interned"))
+    snap = snapshot(char)
+    char['inventory'].append("iron_sword")
+    snap.restore()
+    assert list(char['inventory']) == ["health_potion", "iron_sword"]
+
+def test_snapshot_leaves_list_types_alone():
+    """Test snapshotted lists still copy, pickle and validate as before"""
+    char = make_character()
+    snapshot(char).release()
+    assert type(char['active_quests']) is list
+    assert type(char['inventory']) is Inventory
+    assert type(copy.deepcopy(char['inventory'])) is Inventory
+    assert pickle.loads(pickle.dumps(char['inventory'])).watchers is None
+    del char['game_data']
+    assert character_manager.validate_character_data(char)
+
+# ============================================================================
+# ROLLBACK CONTEXT MANAGER
+# ============================================================================
+
+def test_rollback_on_game_error():
+    """Test a failed multi-step change is undone"""
+    char = make_character()
+    before = copy.deepcopy(char)
+    with pytest.raises(InvalidItemTypeError):
+        with rollback_on_error(char):
+            inventory_system.purchase_item(char, "plate", PLATE)
+            inventory_system.equip_armor(char, "iron_sword", SWORD)
+    assert char == before
+
+def test_no_rollback_on_success_or_other_errors():
+    """Test changes stick when the block finishes or fails with a non-game error"""
+    char = make_character()
+    with rollback_on_error(char):
+        inventory_system.purchase_item(char, "plate", PLATE)
+    assert char['gold'] == 120
+
+    with pytest.raises(KeyError):
+        with rollback_on_error(char):
+            char['gold'] = 0
+            char['missing']
+    assert char['gold'] == 0
+    assert not char['inventory'].watchers
+
+def test_rollback_several_characters():
+    """Test rollback covers every character passed in"""
+    buyer = make_character("Buyer")
+    seller = make_character("Seller")
+    with pytest.raises(InsufficientResourcesError):
+        with rollback_on_error(buyer, seller):
+            inventory_system.sell_item(seller, "iron_sword", SWORD)
+            buyer['gold'] = 0
+            inventory_system.purchase_item(buyer, "iron_sword", SWORD)
+    assert seller['inventory'] == ["health_potion", "iron_sword"]
+    assert seller['gold'] == 200 and buyer['gold'] == 200
+
+def test_equip_armor_rolls_back_halfway_failure():
+    """Test equip_armor puts the old armor back when the new one is bad"""
+    char = make_character()
+    char['game_data']['items']['cursed'] = dict(PLATE, item_id="cursed", effect="max_health:lots")
+    char['inventory'] = Inventory(["plate", "cursed"])
+    inventory_system.equip_armor(char, "plate", PLATE)
+    before = copy.deepcopy(char)
+
+    with pytest.raises(InvalidDataFormatError):
+        inventory_system.equip_armor(char, "cursed", char['game_data']['items']['cursed'])
+    assert char == before
+    assert char['equipped_armor'] == "plate"
+
+def test_battle_rolls_back_on_game_error(monkeypatch):
+    """Test a battle that fails partway leaves the character as it was"""
+    char = make_character()
+    before = copy.deepcopy(char)
+    enemy = combat_system.create_enemy("goblin")
+    enemy['health'] = 1
+    monkeypatch.setattr("builtins.input", lambda prompt="": "1")
+
+    def broke(character, amount):
+        raise InsufficientResourcesError("no gold today")
+    monkeypatch.setattr(character_manager, "add_gold", broke)
+    with pytest.raises(InsufficientResourcesError):
+        combat_system.SimpleBattle(char, enemy).start_battle()
+    # the xp from gain_experience went back too
+    assert char == before
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
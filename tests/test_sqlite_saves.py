@@ -0,0 +1,161 @@
+"""
+Test SQLite Saves
+Tests for the sqlite3 save backend through character_manager
+"""
+
+import pytest
+import sys
+import os
+import threading
+import sqlite3
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import character_manager
+import save_journal
+import sqlite_saves
+from sqlite_saves import SqliteSaveBackend
+from inventory import Inventory
+from custom_exceptions import CharacterNotFoundError
+
+def make_character(name, completed=()):
+    char = character_manager.create_character(name, "Rogue")
+    char['inventory'] = ["health_potion", "iron_sword", "health_potion"]
+    char['active_quests'] = ["orc_menace"]
+    char['completed_quests'] = list(completed)
+    char['equipped_weapon'] = "dagger"
+    return char
+
+@pytest.fixture
+def backend(tmp_path):
+    with SqliteSaveBackend(str(tmp_path / "saves.db")) as backend:
+        yield backend
+
+# ============================================================================
+# BACKEND TESTS
+# ============================================================================
+
+def test_backend_round_trip_through_character_manager(backend):
+    """Test save/load/list/delete with a backend in place of a directory"""
+    char = make_character("Sly", ["q1", "q2"])
+    assert character_manager.save_character(char, backend)
+    assert character_manager.load_character("Sly", backend) == char
+    assert character_manager.list_saved_characters(backend) == ["Sly"]
+
+    char['gold'] = 5
+    char['inventory'] = []
+    character_manager.save_character(char, backend)
+    assert character_manager.load_character("Sly", backend) == char
+
+    character_manager.delete_character("Sly", backend)
+    assert character_manager.list_saved_characters(backend) == []
+    with pytest.raises(CharacterNotFoundError):
+        character_manager.load_character("Sly", backend)
+    with pytest.raises(CharacterNotFoundError):
+        character_manager.delete_character("Sly", backend)
+
+def test_backend_keeps_inventory_capacity(backend):
+    """Test a bank-sized inventory comes back with its capacity and order"""
+    char = make_character("Banker")
+    char['inventory'] = Inventory(["gem", "coin", "gem"], capacity=10000)
+    character_manager.save_character(char, backend)
+    loaded = character_manager.load_character("Banker", backend)
+    assert loaded['inventory'].capacity == 10000
+    assert list(loaded['inventory']) == ["gem", "coin", "gem"]
+
+def test_backend_adds_capacity_column_to_old_databases(tmp_path):
+    """Test a database made before inventory_capacity still opens and saves"""
+    path = str(tmp_path / "old.db")
+    connection = sqlite3.connect(path)
+    connection.executescript(sqlite_saves.SCHEMA.replace(",\n    inventory_capacity INTEGER", ""))
+    connection.close()
+    with SqliteSaveBackend(path) as old:
+        character_manager.save_character(make_character("Sly"), old)
+        assert character_manager.load_character("Sly", old)['inventory'].capacity is None
+
+def test_backend_uses_wal(backend):
+    """Test the database is in WAL mode"""
+    with backend.connection() as connection:
+        assert connection.execute("PRAGMA journal_mode").fetchone()[0] == "wal"
+
+def test_completed_quest_query(backend):
+    """Test finding everyone who finished a quest"""
+    backend.save_characters([make_character("A", ["q1", "q1"]), make_character("B", ["q2"]),
+                             make_character("C", ["q1", "q2"])])
+    assert backend.characters_who_completed("q1") == ["A", "C"]
+    assert backend.characters_on_quest("orc_menace") == ["A", "B", "C"]
+    assert backend.characters_holding("iron_sword") == ["A", "B", "C"]
+
+    with backend.connection() as connection:
+        plan = " ".join(row[-1] for row in connection.execute(
+            "EXPLAIN QUERY PLAN SELECT name FROM character_quests WHERE quest_id = ? AND status = ?",
+            ("q1", "completed")))
+    assert "quests_by_id" in plan
+
+def test_batch_save_is_all_or_nothing(backend):
+    """Test a failing batch leaves nothing behind"""
+    bad = make_character("Bad")
+    del bad['gold']
+    with pytest.raises(KeyError):
+        backend.save_characters([make_character("Good"), bad])
+    assert backend.list_saved_characters() == []
+
+def test_bulk_save_with_backend_is_one_batch(backend):
+    """Test that save_characters hands the whole batch to the backend"""
+    batches = []
+    save_characters = backend.save_characters
+    backend.save_characters = lambda characters: batches.append(len(characters)) or save_characters(characters)
+
+    characters = [make_character(f"Bulk{n}") for n in range(5)]
+    assert character_manager.save_characters(characters, backend) == [True] * 5
+    assert batches == [5]
+
+    bad = make_character("Bad")
+    del bad['gold']
+    with pytest.raises(KeyError):
+        character_manager.save_characters([make_character("Good"), bad], backend)
+    assert "Good" not in backend.list_saved_characters()
+
+def test_file_only_helpers_refuse_backends(backend):
+    """Test that save-file helpers raise instead of treating a backend as a path"""
+    character_manager.save_character(make_character("Sly"), backend)
+    with pytest.raises(TypeError):
+        character_manager.load_character("Sly", backend, until=0)
+    for helper in (character_manager.list_saved_character_info, character_manager.rebuild_save_manifest,
+                   character_manager.enable_save_sharding, character_manager.convert_save_directory,
+                   character_manager.WriteBehindSaver, save_journal.CharacterJournal):
+        with pytest.raises(TypeError):
+            helper(backend)
+    with pytest.raises(TypeError):
+        character_manager.convert_save("Sly", backend)
+
+def test_backend_threads(backend):
+    """Test several threads saving and loading through the pool"""
+    errors = []
+
+    def worker(n):
+        try:
+            for i in range(20):
+                char = make_character(f"T{n}_{i}")
+                character_manager.save_character(char, backend)
+                assert character_manager.load_character(char['name'], backend) == char
+        except Exception as e:
+            errors.append(e)
+
+    threads = [threading.Thread(target=worker, args=(n,)) for n in range(6)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert errors == []
+    assert len(backend.list_saved_characters()) == 120
+
+def test_bulk_load_with_backend(backend):
+    """Test load_characters works against a backend too"""
+    backend.save_characters([make_character(f"B{n}") for n in range(5)])
+    results = character_manager.load_characters(["B0", "B4", "Nope"], backend)
+    assert results[1]['name'] == "B4"
+    assert isinstance(results[2], CharacterNotFoundError)
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])